@@ -0,0 +1,85 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+# Asynchronous MIB compiler driver, requires Python 3.5+ with asyncio.
+#
+import asyncio
+import functools
+from pysmi.compiler import MibCompiler
+from pysmi.reader.aio import AsyncReader, PrefetchedReader, fetchMibs
+from pysmi import debug
+
+
+class AsyncMibCompiler(MibCompiler):
+    """Transform ASN.1 MIBs fetched concurrently from within asyncio event loop.
+
+    *AsyncMibCompiler* first fetches requested MIBs along with all MIBs
+    they import through asynchronous sources, requesting each imported
+    MIB as soon as IMPORTS of the importing one are known. Fetched MIBs
+    are then transformed just like *MibCompiler* does. That way fetching
+    MIBs from remote repositories is bounded by bandwidth rather than by
+    round trip time per MIB.
+
+    Examples: ::
+
+        from pysmi.reader.aio import getAsyncReadersFromUrls
+        from pysmi.aiocompiler import AsyncMibCompiler
+
+        mibCompiler = AsyncMibCompiler(parser, codegen, writer)
+
+        mibCompiler.addSources(*getAsyncReadersFromUrls('http://mibs.snmplabs.com/asn1/@mib@'))
+
+        results = await mibCompiler.compileAsync('IF-MIB', 'IP-MIB')
+
+    """
+
+    def __init__(self, parser, codegen, writer):
+        MibCompiler.__init__(self, parser, codegen, writer)
+        self._asyncSources = []
+
+    def addSources(self, *sources):
+        """Add more ASN.1 MIB source repositories.
+
+        Asynchronous sources (*AsyncReader* objects) are used by
+        *compileAsync* for fetching MIBs in advance, MIBs fetched
+        that way take precedence over other sources.
+
+        Args:
+            sources: reader object(s)
+
+        Returns:
+            reference to itself (can be used for call chaining)
+
+        """
+        for source in sources:
+            if isinstance(source, AsyncReader):
+                self._asyncSources.append(source)
+            else:
+                MibCompiler.addSources(self, source)
+        return self
+
+    async def compileAsync(self, *mibnames, **options):
+        """Fetch and transform requested and possibly referred MIBs.
+
+        Takes the same arguments and returns the same as *compile*.
+        MIB transformation runs in event loop's default executor.
+        """
+        fetched = await fetchMibs(self._asyncSources, *mibnames)
+
+        debug.logger & debug.flagCompiler and debug.logger(
+            'MIBs fetched in advance: %s' % ', '.join(sorted(fetched)))
+
+        prefetchedReader = PrefetchedReader(fetched, *[x.reader for x in self._asyncSources])
+
+        sources = self._sources
+        self._sources = [prefetchedReader] + sources
+
+        try:
+            return await asyncio.get_event_loop().run_in_executor(
+                None, functools.partial(self.compile, *mibnames, **options))
+
+        finally:
+            self._sources = sources
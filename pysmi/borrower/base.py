@@ -27,6 +27,10 @@ class AbstractBorrower(object):
     def __str__(self):
         return '%s{%s, genTexts=%s, exts=%s}' % (self.__class__.__name__, self._reader, self.genTexts, self.exts)
 
+    @property
+    def remote(self):
+        return getattr(self._reader, 'remote', False)
+
     def setOptions(self, **kwargs):
         self._reader.setOptions(**kwargs)
         for k in kwargs:
@@ -1,4 +1,5 @@
 from pysmi.codegen.pysnmp import PySnmpCodeGen
 from pysmi.codegen.jsondoc import JsonCodeGen
 from pysmi.codegen.null import NullCodeGen
+from pysmi.codegen.binary import BinaryCodeGen
 
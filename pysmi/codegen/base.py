@@ -4,6 +4,7 @@
 # Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
 # License: http://pysmi.sf.net/license.html
 #
+from pysmi.mibinfo import MibInfo
 
 
 def updateDict(d1, d2):
@@ -257,6 +258,74 @@ class AbstractCodeGen(object):
         'RFC-1215': {'TRAP-TYPE': [('SNMPv2-SMI', 'TRAP-TYPE')]}
     }
 
+    def setOptions(self, **kwargs):
+        for k in kwargs:
+            setattr(self, k, kwargs[k])
+        return self
+
+    @staticmethod
+    def getIndexEntries(mibsMap):
+        """Return OID index entries of compiled MIBs.
+
+           Args:
+               mibsMap (dict): MIB module names (keys) and *MibStatus*
+                   objects carrying *oid* and *oids* attributes (values)
+
+           Returns:
+               A tuple of two lists sorted by numeric OID: *(OID, MIB name)*
+               tuples of MODULE-IDENTITY OIDs and *(OID, MIB name, symbol name)*
+               tuples of all MIB symbols
+        """
+        identities = []
+        objects = []
+        for mibname in mibsMap:
+            status = mibsMap[mibname]
+            if status.oid:
+                identities.append((status.oid, mibname))
+            objects.extend([(oid, mibname, symbol) for oid, symbol in status.oids])
+        identities.sort()
+        objects.sort()
+        return identities, objects
+
+    @staticmethod
+    def getIndexMap(identities, objects):
+        """Return compiled MIBs OID index entries refer to.
+
+           Does the opposite of *getIndexEntries*.
+
+           Args:
+               identities: *(OID, MIB name)* tuples of MODULE-IDENTITY OIDs
+               objects: *(OID, MIB name, symbol name)* tuples of MIB symbols
+
+           Returns:
+               A dictionary of MIB module names (keys) and *MibInfo*
+               objects carrying *oid* and *oids* attributes (values)
+        """
+        mibsMap = {}
+        for oid, mibname, symbol in objects:
+            if mibname not in mibsMap:
+                mibsMap[mibname] = MibInfo(oid=None, oids=[])
+            mibsMap[mibname].oids.append((tuple(oid), symbol))
+        for oid, mibname in identities:
+            if mibname not in mibsMap:
+                mibsMap[mibname] = MibInfo(oid=None, oids=[])
+            mibsMap[mibname].oid = tuple(oid)
+        for mibname in mibsMap:
+            mibsMap[mibname].oids = tuple(sorted(mibsMap[mibname].oids))
+        return mibsMap
+
+    def parseIndex(self, data):
+        """Return compiled MIBs OID index built by *genIndex* refers to.
+
+           Args:
+               data: OID index contents as a byte string
+
+           Returns:
+               A dictionary of MIB module names (keys) and objects carrying
+               *oid* and *oids* attributes (values), empty if index format
+               is not known
+        """
+        return {}
 
     def genCode(self, ast, symbolTable, **kwargs):
         raise NotImplementedError()
@@ -0,0 +1,353 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+import sys
+import re
+import mmap
+import struct
+try:
+    import json
+except ImportError:
+    import simplejson as json
+try:
+    from collections import OrderedDict
+except ImportError:
+    from ordereddict import OrderedDict
+from pysmi.codegen.jsondoc import JsonCodeGen
+from pysmi.compat import decode
+from pysmi import error
+from pysmi import debug
+
+if sys.version_info[0] > 2:
+    # noinspection PyShadowingBuiltins
+    unicode = str
+    # noinspection PyShadowingBuiltins
+    long = int
+
+#
+# Binary MIB file layout (all integers are little-endian):
+#
+#   header        magic, format version, number of items, number of
+#                 strings and string table offset
+#   item index    (name string ID, value offset, value length) per item,
+#                 sorted by item name
+#   values        encoded item values in document order
+#   string table  (number of strings + 1) string offsets relative to
+#                 the first string followed by UTF-8 encoded strings
+#
+# Each value is a tag byte followed by tag-specific payload. All
+# strings, including dictionary keys, are interned in the string table,
+# dotted-decimal OIDs are stored as packed arrays of sub-identifiers.
+#
+
+magic = 'PSMB'.encode()
+formatVersion = 1
+
+headerStruct = struct.Struct('<4sHHIII')
+indexStruct = struct.Struct('<III')
+countStruct = struct.Struct('<I')
+intStruct = struct.Struct('<q')
+floatStruct = struct.Struct('<d')
+
+tagNone, tagTrue, tagFalse, tagInt, tagLong, tagFloat, tagString, tagOid, tagList, tagDict = [
+    x.encode() for x in 'NTFiLfsold'
+]
+
+oidPattern = re.compile(r'^(?:0|[1-9][0-9]{0,9})(?:\.(?:0|[1-9][0-9]{0,9}))+$')
+
+
+def encodeUtf8(s):
+    return decode(s).encode('utf-8')
+
+
+class BinaryCodeGen(JsonCodeGen):
+    """Builds compact binary document representing MIB module supplied
+       in form of an Abstract Syntax Tree on input.
+
+       The document carries the same items as *JsonCodeGen* would
+       produce, it is meant to be read with *BinaryMib*.
+
+       Instance of this class is supposed to be passed to *MibCompiler*,
+       the rest is internal to *MibCompiler*.
+    """
+
+    def genDocument(self, outDict):
+        """Serialize document into binary form.
+
+           Args:
+               outDict (OrderedDict): top-level document object
+
+           Returns:
+               A list of byte string chunks
+        """
+        strings = {}  # k, v = string, string ID
+
+        def intern(s):
+            if not isinstance(s, (str, unicode)):
+                s = json.dumps(s)  # as JSON object keys
+            s = decode(s)
+            if s not in strings:
+                strings[s] = len(strings)
+            return strings[s]
+
+        def encodeValue(value, out):
+            if value is None:
+                out.append(tagNone)
+            elif value is True:
+                out.append(tagTrue)
+            elif value is False:
+                out.append(tagFalse)
+            elif isinstance(value, (int, long)):
+                if -0x8000000000000000 <= value <= 0x7fffffffffffffff:
+                    out.append(tagInt + intStruct.pack(value))
+                else:
+                    out.append(tagLong + countStruct.pack(intern(str(value))))
+            elif isinstance(value, float):
+                out.append(tagFloat + floatStruct.pack(value))
+            elif isinstance(value, (str, unicode)):
+                arcs = oidPattern.match(value) and [int(x) for x in value.split('.')]
+                if arcs and max(arcs) <= 0xffffffff:
+                    out.append(tagOid + struct.pack('<%dI' % (len(arcs) + 1), len(arcs), *arcs))
+                else:
+                    out.append(tagString + countStruct.pack(intern(value)))
+            elif isinstance(value, (list, tuple)):
+                out.append(tagList + countStruct.pack(len(value)))
+                for x in value:
+                    encodeValue(x, out)
+            elif isinstance(value, dict):
+                out.append(tagDict + countStruct.pack(len(value)))
+                for k in value:
+                    out.append(countStruct.pack(intern(k)))
+                    encodeValue(value[k], out)
+            else:
+                raise error.PySmiCodegenError('can\'t serialize %r into binary document' % (value,))
+
+        values = []
+        index = []
+        offset = headerStruct.size + indexStruct.size * len(outDict)
+
+        for key in outDict:
+            value = []
+            encodeValue(outDict[key], value)
+            value = ''.encode().join(value)
+            index.append((encodeUtf8(key), intern(key), offset, len(value)))
+            values.append(value)
+            offset += len(value)
+
+        index.sort()
+
+        stringsList = [None] * len(strings)
+        for s in strings:
+            stringsList[strings[s]] = s.encode('utf-8')
+
+        stringOffsets = [0]
+        for s in stringsList:
+            stringOffsets.append(stringOffsets[-1] + len(s))
+
+        out = [headerStruct.pack(magic, formatVersion, 0, len(index), len(stringsList), offset),
+               ''.encode().join([indexStruct.pack(*x[1:]) for x in index])]
+        out.extend(values)
+        out.append(struct.pack('<%dI' % len(stringOffsets), *stringOffsets))
+        out.extend(stringsList)
+
+        debug.logger & debug.flagCodegen and debug.logger(
+            'binary document of %s items, %s strings, %s bytes' % (
+                len(index), len(stringsList), sum([len(x) for x in out])))
+
+        return out
+
+    def genIndex(self, mibsMap, **kwargs):
+        identities, objects = self.getIndexEntries(mibsMap)
+        # dotted OIDs (keys) and lists of MIB and symbol names (values)
+        outDict = OrderedDict()
+        for oid, name, symbol in objects:
+            oid = '.'.join([str(x) for x in oid])
+            if oid in outDict:
+                outDict[oid].append([name, symbol])
+            else:
+                outDict[oid] = [[name, symbol]]
+        out = self.genDocument(outDict)
+        debug.logger & debug.flagCodegen and debug.logger(
+            'OID->MIB index built, %s MIBs, %s symbols, %s bytes' % (
+                len(identities), len(objects), sum([len(x) for x in out])))
+        return kwargs.get('chunked') and out or out[0][:0].join(out)
+
+    def parseIndex(self, data):
+        mib = BinaryMib('<index>', data=data)
+        objects = []
+        for oid in mib:
+            objects.extend([([int(x) for x in oid.split('.')], name, symbol) for name, symbol in mib[oid]])
+        # MODULE-IDENTITY OIDs are not kept in binary index
+        return self.getIndexMap([], objects)
+
+
+class BinaryMib(object):
+    """Read-only access to binary MIB document produced by *BinaryCodeGen*.
+
+    The file is memory-mapped and its items are decoded on first access,
+    so opening even large documents is cheap. Items are looked up by
+    means of binary search over item index.
+
+    OID index built by *BinaryCodeGen* is a document of the same kind
+    with dotted-decimal OIDs as item names and lists of *[MIB name,
+    symbol name]* pairs as item values.
+
+    Examples: ::
+
+        from pysmi.codegen.binary import BinaryMib
+
+        mib = BinaryMib('IF-MIB.bin')
+
+        print(mib['ifIndex']['oid'])
+
+        mib.close()
+
+    """
+
+    def __init__(self, path, data=None):
+        """Open binary MIB document.
+
+           Args:
+               path (str): path to binary MIB file
+
+           Keyword Args:
+               data (bytes): document contents to use instead of
+                   mapping the file
+        """
+        self._path = path
+        self._items = {}  # k, v = item name, decoded value
+        self._strings = {}  # k, v = string ID, decoded string
+
+        if data is None:
+            try:
+                fp = open(path, 'rb')
+                try:
+                    data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+                finally:
+                    fp.close()
+
+            except (EnvironmentError, ValueError):
+                raise error.PySmiError('can\'t map binary MIB file %s: %s' % (path, sys.exc_info()[1]))
+
+        self._mm = data
+
+        try:
+            fileMagic, version, flags, self._count, stringCount, self._stringsOffset = \
+                headerStruct.unpack_from(self._mm, 0)
+
+        except struct.error:
+            fileMagic = version = None
+
+        if fileMagic != magic or version != formatVersion:
+            self.close()
+            raise error.PySmiError('unsupported binary MIB file %s' % path)
+
+        self._blobOffset = self._stringsOffset + countStruct.size * (stringCount + 1)
+
+        debug.logger & debug.flagCodegen and debug.logger('mapped %s' % self)
+
+    def __str__(self):
+        return '%s{"%s", %s items}' % (self.__class__.__name__, self._path, self._count)
+
+    def close(self):
+        """Unmap binary MIB document."""
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __contains__(self, name):
+        return self._lookup(name) is not None
+
+    def __getitem__(self, name):
+        if name not in self._items:
+            entry = self._lookup(name)
+            if entry is None:
+                raise KeyError(name)
+            self._items[name] = self._decodeValue(entry[1])[0]
+        return self._items[name]
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def keys(self):
+        """Return item names in document order."""
+        entries = [indexStruct.unpack_from(self._mm, headerStruct.size + indexStruct.size * idx)
+                   for idx in range(self._count)]
+        entries.sort(key=lambda x: x[1])
+        return [self._getString(x[0]) for x in entries]
+
+    def _getBytes(self, stringId):
+        start, end = struct.unpack_from('<II', self._mm, self._stringsOffset + countStruct.size * stringId)
+        return self._mm[self._blobOffset + start:self._blobOffset + end]
+
+    def _getString(self, stringId):
+        if stringId not in self._strings:
+            self._strings[stringId] = self._getBytes(stringId).decode('utf-8')
+        return self._strings[stringId]
+
+    def _lookup(self, name):
+        name = encodeUtf8(name)
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = indexStruct.unpack_from(self._mm, headerStruct.size + indexStruct.size * mid)
+            key = self._getBytes(entry[0])
+            if key < name:
+                lo = mid + 1
+            elif key > name:
+                hi = mid
+            else:
+                return entry
+
+    def _decodeValue(self, offset):
+        mm = self._mm
+        tag = mm[offset:offset + 1]
+        offset += 1
+        if tag == tagString:
+            return self._getString(countStruct.unpack_from(mm, offset)[0]), offset + countStruct.size
+        elif tag == tagDict:
+            count, = countStruct.unpack_from(mm, offset)
+            offset += countStruct.size
+            value = {}
+            for idx in range(count):
+                key = self._getString(countStruct.unpack_from(mm, offset)[0])
+                value[key], offset = self._decodeValue(offset + countStruct.size)
+            return value, offset
+        elif tag == tagList:
+            count, = countStruct.unpack_from(mm, offset)
+            offset += countStruct.size
+            value = []
+            for idx in range(count):
+                item, offset = self._decodeValue(offset)
+                value.append(item)
+            return value, offset
+        elif tag == tagOid:
+            count, = countStruct.unpack_from(mm, offset)
+            offset += countStruct.size
+            arcs = struct.unpack_from('<%dI' % count, mm, offset)
+            return unicode('.').join([unicode(x) for x in arcs]), offset + countStruct.size * count
+        elif tag == tagInt:
+            return intStruct.unpack_from(mm, offset)[0], offset + intStruct.size
+        elif tag == tagLong:
+            return long(self._getString(countStruct.unpack_from(mm, offset)[0])), offset + countStruct.size
+        elif tag == tagFloat:
+            return floatStruct.unpack_from(mm, offset)[0], offset + floatStruct.size
+        elif tag == tagNone:
+            return None, offset
+        elif tag == tagTrue:
+            return True, offset
+        elif tag == tagFalse:
+            return False, offset
+        else:
+            raise error.PySmiError('corrupted binary MIB file %s at offset %s' % (self._path, offset - 1))
@@ -17,6 +17,8 @@ except ImportError:
     from ordereddict import OrderedDict
 from pysmi.mibinfo import MibInfo
 from pysmi.codegen.base import AbstractCodeGen
+from pysmi.codegen.resolver import OidResolver, TypeResolver
+from pysmi.compat import decode
 from pysmi import error
 from pysmi import debug
 
@@ -65,6 +67,8 @@ class JsonCodeGen(AbstractCodeGen):
     indent = ' ' * 4
     fakeidx = 1000  # starting index for fake symbols
 
+    jsonIndent = 2  # None for compact JSON
+
     def __init__(self):
         self._rows = set()
         self._cols = {}  # k, v = name, datatype
@@ -74,6 +78,8 @@ class JsonCodeGen(AbstractCodeGen):
         self.moduleName = ['DUMMY']
         self.genRules = {'text': 1}
         self.symbolTable = {}
+        self._oidResolver = OidResolver(self.symbolTable)
+        self._typeResolver = TypeResolver(self.symbolTable)
 
     @staticmethod
     def transOpers(symbol):
@@ -169,41 +175,10 @@ class JsonCodeGen(AbstractCodeGen):
         self._out[symbol] = outDict
 
     def genNumericOid(self, oid):
-        numericOid = ()
-        for part in oid:
-            if isinstance(part, tuple):
-                parent, module = part
-                if parent == 'iso':
-                    numericOid += (1,)
-                    continue
-                if module not in self.symbolTable:
-                    # XXX do getname for possible future borrowed mibs
-                    raise error.PySmiSemanticError('no module "%s" in symbolTable' % module)
-                if parent not in self.symbolTable[module]:
-                    raise error.PySmiSemanticError('no symbol "%s" in module "%s"' % (parent, module))
-                numericOid += self.genNumericOid(self.symbolTable[module][parent]['oid'])
-            else:
-                numericOid += (part,)
-        return numericOid
+        return self._oidResolver.resolve(oid)
 
     def getBaseType(self, symName, module):
-        if module not in self.symbolTable:
-            raise error.PySmiSemanticError('no module "%s" in symbolTable' % module)
-        if symName not in self.symbolTable[module]:
-            raise error.PySmiSemanticError('no symbol "%s" in module "%s"' % (symName, module))
-        symType, symSubtype = self.symbolTable[module][symName].get('syntax', (('', ''), ''))
-        if not symType[0]:
-            raise error.PySmiSemanticError('unknown type for symbol "%s"' % symName)
-        if symType[0] in self.baseTypes:
-            return symType, symSubtype
-        else:
-            baseSymType, baseSymSubtype = self.getBaseType(*symType)
-            if isinstance(baseSymSubtype, list):
-                if isinstance(symSubtype, list):
-                    symSubtype += baseSymSubtype
-                else:
-                    symSubtype = baseSymSubtype
-            return baseSymType, symSubtype
+        return self._typeResolver.getBaseType(symName, module)
 
     # Clause generation functions
 
@@ -483,14 +458,14 @@ class JsonCodeGen(AbstractCodeGen):
                     (defval in self.symbolTable[self.moduleName[0]] or defval in self._importMap):  # oid
                 module = self._importMap.get(defval, self.moduleName[0])
                 try:
-                    val = str(self.genNumericOid(self.symbolTable[module][defval]['oid']))
+                    val = str(self._oidResolver.getOid(defval, module))
                     outDict.update(value=val, format='oid')
                 except:
                     # or no module if it will be borrowed later
                     raise error.PySmiSemanticError('no symbol "%s" in module "%s"' % (defval, module))
             # enumeration
             elif defvalType[0][0] in ('Integer32', 'Integer') and \
-                    isinstance(defvalType[1], list) and defval in dict(defvalType[1]):
+                    isinstance(defvalType[1], tuple) and defval in dict(defvalType[1]):
                 outDict.update(value=defval, format='enum')
             elif defvalType[0][0] == 'Bits':
                 defvalBits = []
@@ -718,9 +693,49 @@ class JsonCodeGen(AbstractCodeGen):
         # 'a': lambda x: genXXX(x, 'CONSTRAINT')
     }
 
+    def genDocument(self, outDict):
+        """Serialize JSON document item by item.
+
+           This avoids one large *json.dumps* call, but memory use is not
+           bounded: *outDict* and all the chunks are held in memory till
+           the document is written. MibCompiler keeps generated code of
+           all MIBs till all of them are built, and may pass it between
+           processes, so chunks can't be generated lazily as they are
+           written.
+
+           Args:
+               outDict (OrderedDict): top-level JSON object
+
+           Returns:
+               A list of JSON text chunks, one per top-level item, as
+               *json.dumps* would produce with *jsonIndent* or in compact
+               form if *jsonIndent* is *None*
+        """
+        if self.jsonIndent is None:
+            separators = ',', ':'
+            newline = ''
+        else:
+            separators = ',', ': '
+            newline = '\n' + ' ' * self.jsonIndent
+
+        out = []
+
+        for key in outDict:
+            value = json.dumps(outDict[key], indent=self.jsonIndent, separators=separators)
+            if newline:
+                # JSON strings never span lines
+                value = value.replace('\n', newline)
+            out.append((out and separators[0] or '{') + newline + json.dumps(key) + separators[1] + value)
+
+        out.append(out and newline[:1] + '}' or '{}')
+
+        return out
+
     def genCode(self, ast, symbolTable, **kwargs):
         self.genRules['text'] = kwargs.get('genTexts', False)
         self.symbolTable = symbolTable
+        self._oidResolver = kwargs.get('oidResolver') or OidResolver(symbolTable)
+        self._typeResolver = kwargs.get('typeResolver') or TypeResolver(symbolTable)
         self._rows.clear()
         self._cols.clear()
         self._seenSyms.clear()
@@ -742,19 +757,32 @@ class JsonCodeGen(AbstractCodeGen):
         debug.logger & debug.flagCodegen and debug.logger(
             'canonical MIB name %s (%s), imported MIB(s) %s, Python code size %s bytes' % (
                 self.moduleName[0], moduleOid, ','.join(importedModules) or '<none>', len(outDict)))
+        out = self.genDocument(outDict)
         return MibInfo(oid=None, name=self.moduleName[0],
-                       imported=tuple([x for x in importedModules if x not in self.fakeMibs])), json.dumps(outDict, indent=2)
+                       imported=tuple([x for x in importedModules if x not in self.fakeMibs])), \
+            kwargs.get('chunked') and out or out[0][:0].join(out)
 
     def genIndex(self, mibsMap, **kwargs):
-        out = '\nfrom pysnmp.proto.rfc1902 import ObjectName\n\noidToMibMap = {\n'
-        count = 0
-        for name, oid in mibsMap:
-            out += 'ObjectName("%s"): "%s",\n' % (oid, name)
-            count += 1
-        out += '}\n'
+        identities, objects = self.getIndexEntries(mibsMap)
+        outDict = OrderedDict()
+        # MODULE-IDENTITY OIDs and MIB names sorted by OID
+        outDict['identities'] = [['.'.join([str(x) for x in oid]), name] for oid, name in identities]
+        # OIDs, MIB names and symbol names sorted by OID
+        outDict['oids'] = [['.'.join([str(x) for x in oid]), name, symbol] for oid, name, symbol in objects]
         if 'comments' in kwargs:
-            out = ''.join(['# %s\n' % x for x in kwargs['comments']]) + '#\n' + out
-            out = '#\n# PySNMP MIB indices (http://pysnmp.sf.net)\n' + out
+            outDict['meta'] = OrderedDict()
+            outDict['meta']['comments'] = kwargs['comments']
+        out = self.genDocument(outDict)
         debug.logger & debug.flagCodegen and debug.logger(
-            'OID->MIB index built, %s entries, %s bytes' % (count, len(out)))
-        return out
+            'OID->MIB index built, %s MIBs, %s symbols, %s bytes' % (
+                len(identities), len(objects), sum([len(x) for x in out])))
+        return kwargs.get('chunked') and out or out[0][:0].join(out)
+
+    def parseIndex(self, data):
+        try:
+            outDict = json.loads(decode(data))
+            identities = [([int(x) for x in oid.split('.')], name) for oid, name in outDict['identities']]
+            objects = [([int(x) for x in oid.split('.')], name, symbol) for oid, name, symbol in outDict['oids']]
+        except (ValueError, KeyError, TypeError):
+            raise error.PySmiCodegenError('malformed OID index: %s' % sys.exc_info()[1])
+        return self.getIndexMap(identities, objects)
@@ -5,10 +5,13 @@
 # License: http://pysmi.sf.net/license.html
 #
 import sys
+import re
 from time import strptime, strftime
 from keyword import iskeyword
 from pysmi.mibinfo import MibInfo
 from pysmi.codegen.base import AbstractCodeGen
+from pysmi.codegen.resolver import OidResolver, TypeResolver
+from pysmi.compat import decode
 from pysmi import error
 from pysmi import debug
 
@@ -119,6 +122,8 @@ class PySnmpCodeGen(AbstractCodeGen):
         self.moduleName = ['DUMMY']
         self.genRules = {'text': 1}
         self.symbolTable = {}
+        self._oidResolver = OidResolver(self.symbolTable)
+        self._typeResolver = TypeResolver(self.symbolTable)
 
     def symTrans(self, symbol):
         if symbol in self.symsTable:
@@ -169,7 +174,7 @@ class PySnmpCodeGen(AbstractCodeGen):
         return data
 
     def genImports(self, imports):
-        outStr = ''
+        outStr = []
         # convertion to SNMPv2
         toDel = []
         for module in list(imports):
@@ -199,19 +204,19 @@ class PySnmpCodeGen(AbstractCodeGen):
             if symbols:
                 self._seenSyms.update([self.transOpers(s) for s in symbols])
                 self._importMap.update([(self.transOpers(s), module) for s in symbols])
-                outStr += '( %s, ) = mibBuilder.importSymbols("%s")\n' % (
-                    ', '.join([self.transOpers(s) for s in symbols]), '", "'.join((module,) + symbols))
-        return outStr, tuple(sorted(imports))
+                outStr.append('( %s, ) = mibBuilder.importSymbols("%s")\n' % (
+                    ', '.join([self.transOpers(s) for s in symbols]), '", "'.join((module,) + symbols)))
+        return ''.join(outStr), tuple(sorted(imports))
 
     def genExports(self, ):
         exports = list(self._exports)
         exportsNum = len(exports)
         chunkNum = exportsNum / 254
-        outStr = ''
+        outStr = []
         for i in range(int(chunkNum + 1)):
-            outStr += 'mibBuilder.exportSymbols("' + self.moduleName[0] + '", '
-            outStr += ', '.join(exports[254 * i:254 * (i + 1)]) + ')\n'
-        return self._exports and outStr or ''
+            outStr.append('mibBuilder.exportSymbols("' + self.moduleName[0] + '", ' +
+                          ', '.join(exports[254 * i:254 * (i + 1)]) + ')\n')
+        return self._exports and ''.join(outStr) or ''
 
     # noinspection PyMethodMayBeStatic
     def genLabel(self, symbol, classmode=0):
@@ -234,41 +239,10 @@ class PySnmpCodeGen(AbstractCodeGen):
         self._out[symbol] = outStr
 
     def genNumericOid(self, oid):
-        numericOid = ()
-        for part in oid:
-            if isinstance(part, tuple):
-                parent, module = part
-                if parent == 'iso':
-                    numericOid += (1,)
-                    continue
-                if module not in self.symbolTable:
-                    # XXX do getname for possible future borrowed mibs
-                    raise error.PySmiSemanticError('no module "%s" in symbolTable' % module)
-                if parent not in self.symbolTable[module]:
-                    raise error.PySmiSemanticError('no symbol "%s" in module "%s"' % (parent, module))
-                numericOid += self.genNumericOid(self.symbolTable[module][parent]['oid'])
-            else:
-                numericOid += (part,)
-        return numericOid
+        return self._oidResolver.resolve(oid)
 
     def getBaseType(self, symName, module):
-        if module not in self.symbolTable:
-            raise error.PySmiSemanticError('no module "%s" in symbolTable' % module)
-        if symName not in self.symbolTable[module]:
-            raise error.PySmiSemanticError('no symbol "%s" in module "%s"' % (symName, module))
-        symType, symSubtype = self.symbolTable[module][symName].get('syntax', (('', ''), ''))
-        if not symType[0]:
-            raise error.PySmiSemanticError('unknown type for symbol "%s"' % symName)
-        if symType[0] in self.baseTypes:
-            return symType, symSubtype
-        else:
-            baseSymType, baseSymSubtype = self.getBaseType(*symType)
-            if isinstance(baseSymSubtype, list):
-                if isinstance(symSubtype, list):
-                    symSubtype += baseSymSubtype
-                else:
-                    symSubtype = baseSymSubtype
-            return baseSymType, symSubtype
+        return self._typeResolver.getBaseType(symName, module)
 
     # Clause generation functions
 
@@ -518,13 +492,13 @@ class PySnmpCodeGen(AbstractCodeGen):
                     (defval in self.symbolTable[self.moduleName[0]] or defval in self._importMap):  # oid
                 module = self._importMap.get(defval, self.moduleName[0])
                 try:
-                    val = str(self.genNumericOid(self.symbolTable[module][defval]['oid']))
+                    val = str(self._oidResolver.getOid(defval, module))
                 except:
                     # or no module if it will be borrowed later
                     raise error.PySmiSemanticError('no symbol "%s" in module "%s"' % (defval, module))
             # enumeration
             elif defvalType[0][0] in ('Integer32', 'Integer') and \
-                    isinstance(defvalType[1], list) and defval in dict(defvalType[1]):
+                    isinstance(defvalType[1], tuple) and defval in dict(defvalType[1]):
                 val = dorepr(defval)
             elif defvalType[0][0] == 'Bits':
                 defvalBits = []
@@ -764,6 +738,8 @@ class PySnmpCodeGen(AbstractCodeGen):
     def genCode(self, ast, symbolTable, **kwargs):
         self.genRules['text'] = kwargs.get('genTexts', False)
         self.symbolTable = symbolTable
+        self._oidResolver = kwargs.get('oidResolver') or OidResolver(symbolTable)
+        self._typeResolver = kwargs.get('typeResolver') or TypeResolver(symbolTable)
         self._rows.clear()
         self._cols.clear()
         self._exports.clear()
@@ -771,7 +747,12 @@ class PySnmpCodeGen(AbstractCodeGen):
         self._importMap.clear()
         self._out.clear()
         self.moduleName[0], moduleOid, imports, declarations = ast
-        out, importedModules = self.genImports(imports or {})
+        out = []
+        if 'comments' in kwargs:
+            out.append('#\n# PySNMP MIB module %s (http://pysnmp.sf.net)\n' % self.moduleName[0] +
+                       ''.join(['# %s\n' % x for x in kwargs['comments']]) + '#\n')
+        outStr, importedModules = self.genImports(imports or {})
+        out.append(outStr)
         for declr in declarations or []:
             if declr:
                 clausetype = declr[0]
@@ -780,30 +761,43 @@ class PySnmpCodeGen(AbstractCodeGen):
         for sym in self.symbolTable[self.moduleName[0]]['_symtable_order']:
             if sym not in self._out:
                 raise error.PySmiCodegenError('No generated code for symbol %s' % sym)
-            out += self._out[sym]
-        out += self.genExports()
-        if 'comments' in kwargs:
-            out = ''.join(['# %s\n' % x for x in kwargs['comments']]) + '#\n' + out
-            out = '#\n# PySNMP MIB module %s (http://pysnmp.sf.net)\n' % self.moduleName[0] + out
+            out.append(self._out[sym])
+        out.append(self.genExports())
         debug.logger & debug.flagCodegen and debug.logger(
             'canonical MIB name %s (%s), imported MIB(s) %s, Python code size %s bytes' % (
-                self.moduleName[0], moduleOid, ','.join(importedModules) or '<none>', len(out)))
+                self.moduleName[0], moduleOid, ','.join(importedModules) or '<none>', sum([len(x) for x in out])))
         return MibInfo(oid=None, name=self.moduleName[0],
-                       imported=tuple([x for x in importedModules if x not in self.fakeMibs])), out
+                       imported=tuple([x for x in importedModules if x not in self.fakeMibs])), \
+            kwargs.get('chunked') and out or ''.join(out)
 
     def genIndex(self, mibsMap, **kwargs):
-        out = '\nfrom pysnmp.proto.rfc1902 import ObjectName\n\noidToMibMap = {\n'
-        count = 0
-        for name, oid in mibsMap:
-            out += 'ObjectName("%s"): "%s",\n' % (oid, name)
-            count += 1
-        out += '}\n'
+        out = []
         if 'comments' in kwargs:
-            out = ''.join(['# %s\n' % x for x in kwargs['comments']]) + '#\n' + out
-            out = '#\n# PySNMP MIB indices (http://pysnmp.sf.net)\n' + out
+            out.append('#\n# PySNMP MIB indices (http://pysnmp.sf.net)\n' +
+                       ''.join(['# %s\n' % x for x in kwargs['comments']]) + '#\n')
+        identities, objects = self.getIndexEntries(mibsMap)
+        out.append('\nfrom pysnmp.proto.rfc1902 import ObjectName\n\noidToMibMap = {\n')
+        for oid, name in identities:
+            out.append('ObjectName("%s"): "%s",\n' % ('.'.join([str(x) for x in oid]), name))
+        out.append('}\n\n# (OID, MIB name, symbol name) sorted by OID\noidToSymbolIndex = (\n')
+        for oid, name, symbol in objects:
+            out.append('(%r, "%s", "%s"),\n' % (oid, name, symbol))
+        out.append(')\n')
         debug.logger & debug.flagCodegen and debug.logger(
-            'OID->MIB index built, %s entries, %s bytes' % (count, len(out)))
-        return out
+            'OID->MIB index built, %s MIBs, %s symbols, %s bytes' % (
+                len(identities), len(objects), sum([len(x) for x in out])))
+        return kwargs.get('chunked') and out or ''.join(out)
+
+    indexIdentityPattern = re.compile(r'^ObjectName\("([0-9.]+)"\): "([^"]+)",$', re.M)
+    indexObjectPattern = re.compile(r'^\(\(([0-9L, ]*)\), "([^"]+)", "([^"]+)"\),$', re.M)
+
+    def parseIndex(self, data):
+        data = decode(data)
+        identities = [([int(x) for x in oid.split('.')], name)
+                      for oid, name in self.indexIdentityPattern.findall(data)]
+        objects = [([int(x.strip().rstrip('L')) for x in oid.split(',') if x.strip()], name, symbol)
+                   for oid, name, symbol in self.indexObjectPattern.findall(data)]
+        return self.getIndexMap(identities, objects)
 
 # backward compatibility
 baseMibs = PySnmpCodeGen.baseMibs
@@ -0,0 +1,193 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+from pysmi import error
+
+
+class OidResolver(object):
+    """Resolve symbolic OIDs found in MIB symbol tables into numeric ones.
+
+    Absolute OID of each symbol is computed once and remembered, so
+    a single *OidResolver* object should serve all code generation
+    performed against the same map of symbol tables.
+
+    Symbolic OIDs are sequences of *(symbol, module)* tuples, each
+    referring to a parent OID, and integer sub-identifiers.
+    """
+
+    def __init__(self, symbolTableMap):
+        """Create an instance of *OidResolver*.
+
+           Args:
+               symbolTableMap (dict): MIB module names (keys) and their
+                   symbol tables (values)
+        """
+        self._symbolTableMap = symbolTableMap
+        self._oids = {}  # k, v = (symbol, module), numeric OID
+
+    def __str__(self):
+        return '%s{%s symbols resolved}' % (self.__class__.__name__, len(self._oids))
+
+    def getOid(self, symbol, module):
+        """Return numeric OID of a symbol defined in a MIB module.
+
+           Args:
+               symbol (str): name of symbol with OID
+               module (str): name of MIB module defining the symbol
+
+           Returns:
+               A tuple of integers
+        """
+        if symbol == 'iso':
+            return (1,)
+
+        key = symbol, module
+
+        if key in self._oids:
+            return self._oids[key]
+
+        # resolve parent symbols iteratively starting from the
+        # innermost unresolved one
+        stack = [key]
+
+        while stack:
+            symbol, module = stack[-1]
+
+            if module not in self._symbolTableMap:
+                # XXX do getname for possible future borrowed mibs
+                raise error.PySmiSemanticError('no module "%s" in symbolTable' % module)
+
+            if symbol not in self._symbolTableMap[module]:
+                raise error.PySmiSemanticError('no symbol "%s" in module "%s"' % (symbol, module))
+
+            oid = self._symbolTableMap[module][symbol].get('oid')
+            if oid is None:
+                raise error.PySmiSemanticError('no OID for symbol "%s" in module "%s"' % (symbol, module))
+
+            numericOid = ()
+
+            for part in oid:
+                if isinstance(part, tuple):
+                    if part[0] == 'iso':
+                        numericOid += (1,)
+                    elif part in self._oids:
+                        numericOid += self._oids[part]
+                    elif part in stack:
+                        raise error.PySmiSemanticError(
+                            'circular OID definition of symbol "%s" in module "%s"' % part)
+                    else:
+                        stack.append(part)
+                        break
+                else:
+                    numericOid += (part,)
+            else:
+                self._oids[stack.pop()] = numericOid
+
+        return self._oids[key]
+
+    def resolve(self, oid):
+        """Return numeric OID out of symbolic one.
+
+           Args:
+               oid: a sequence of *(symbol, module)* tuples and integers
+
+           Returns:
+               A tuple of integers
+        """
+        numericOid = ()
+        for part in oid:
+            if isinstance(part, tuple):
+                numericOid += self.getOid(*part)
+            else:
+                numericOid += (part,)
+        return numericOid
+
+
+def _freeze(subtype):
+    if isinstance(subtype, list):
+        return tuple(subtype)
+    return subtype
+
+
+class TypeResolver(object):
+    """Resolve MIB types into base types they are derived from.
+
+    Type definitions are followed down to one of *baseTypes* while
+    list-like subtypes (e.g. enumerations) found along the way are
+    merged. Resolved types are remembered in immutable form, so
+    a single *TypeResolver* object should serve all code generation
+    performed against the same map of symbol tables.
+    """
+    baseTypes = ['Integer', 'Integer32', 'Bits', 'ObjectIdentifier', 'OctetString']
+
+    def __init__(self, symbolTableMap):
+        """Create an instance of *TypeResolver*.
+
+           Args:
+               symbolTableMap (dict): MIB module names (keys) and their
+                   symbol tables (values)
+        """
+        self._symbolTableMap = symbolTableMap
+        self._types = {}  # k, v = (symbol, module), (base type, merged subtype)
+
+    def __str__(self):
+        return '%s{%s types resolved}' % (self.__class__.__name__, len(self._types))
+
+    def getBaseType(self, symbol, module):
+        """Return base type of a symbol defined in a MIB module.
+
+           Args:
+               symbol (str): name of type or object
+               module (str): name of MIB module defining the symbol
+
+           Returns:
+               A tuple of base *(type, module)* tuple and subtype where
+               list-like subtypes are turned into tuples
+        """
+        key = symbol, module
+
+        chain = []
+        seen = set()
+
+        while key not in self._types:
+            symbol, module = key
+
+            if module not in self._symbolTableMap:
+                raise error.PySmiSemanticError('no module "%s" in symbolTable' % module)
+
+            if symbol not in self._symbolTableMap[module]:
+                raise error.PySmiSemanticError('no symbol "%s" in module "%s"' % (symbol, module))
+
+            symType, symSubtype = self._symbolTableMap[module][symbol].get('syntax', (('', ''), ''))
+            if not symType[0]:
+                raise error.PySmiSemanticError('unknown type for symbol "%s"' % symbol)
+
+            if symType[0] in self.baseTypes:
+                self._types[key] = tuple(symType), _freeze(symSubtype)
+                break
+
+            if key in seen:
+                raise error.PySmiSemanticError('circular type definition of symbol "%s" in module "%s"' % key)
+
+            seen.add(key)
+            chain.append((key, symSubtype))
+
+            key = tuple(symType)
+
+        baseType, baseSubtype = self._types[key]
+
+        while chain:
+            key, symSubtype = chain.pop()
+
+            if isinstance(baseSubtype, tuple):
+                if isinstance(symSubtype, list):
+                    baseSubtype = tuple(symSubtype) + baseSubtype
+            else:
+                baseSubtype = _freeze(symSubtype)
+
+            self._types[key] = baseType, baseSubtype
+
+        return self._types[key]
@@ -6,10 +6,17 @@
 #
 # Build an internally used symbol table for each passed MIB.
 #
+import os
 import sys
+import marshal
+import hashlib
+import heapq
+import tempfile
 from keyword import iskeyword
 from pysmi.mibinfo import MibInfo
 from pysmi.codegen.base import AbstractCodeGen
+from pysmi.compat import encode
+from pysmi import __version__ as packageVersion
 from pysmi import error
 from pysmi import debug
 
@@ -89,7 +96,9 @@ class SymtableCodeGen(AbstractCodeGen):
         self._rows = set()
         self._cols = {}  # k, v = name, datatype
         self._exports = set()
-        self._postponedSyms = {}  # k, v = symbol, (parents, properties)
+        self._postponedSyms = {}  # k, v = symbol, (postponement index, parents, properties)
+        self._waitingSyms = {}  # k, v = missing parent, postponed symbols
+        self._readySyms = []  # heap of (postponement index, symbol)
         self._parentOids = set()
         self._importMap = {}  # k, v = symbol, MIB
         self._symsOrder = []
@@ -146,6 +155,26 @@ class SymtableCodeGen(AbstractCodeGen):
                     )
         return data
 
+    @classmethod
+    def getImportedModules(cls, imports):
+        """Return names of MIB modules *genImports* would import from.
+
+           Args:
+               imports: a dictionary of MIB module names (keys) and
+                   sequences of symbols imported from there (values)
+
+           Returns:
+               A sorted tuple of MIB module names
+        """
+        modules = set(cls.constImports)
+        for module in imports:
+            modules.add(module)
+            if module in cls.convertImportv2:
+                for symbol in imports[module]:
+                    for newModule, newSymbol in cls.convertImportv2[module].get(symbol, ()):
+                        modules.add(newModule)
+        return tuple(sorted(modules))
+
     def genImports(self, imports):
         # convertion to SNMPv2
         toDel = []
@@ -178,17 +207,18 @@ class SymtableCodeGen(AbstractCodeGen):
                 self._importMap.update([(self.transOpers(s), module) for s in symbols])
         return {}, tuple(sorted(imports))
 
+    def isParentExists(self, parent):
+        return (parent in self._out or
+                parent in self._importMap or
+                parent in self.baseTypes or
+                parent in ('MibTable', 'MibTableRow', 'MibTableColumn') or
+                parent in self._rows)
+
     def allParentsExists(self, parents):
-        parentsExists = True
         for parent in parents:
-            if not (parent in self._out or
-                    parent in self._importMap or
-                    parent in self.baseTypes or
-                    parent in ('MibTable', 'MibTableRow', 'MibTableColumn') or
-                    parent in self._rows):
-                parentsExists = False
-                break
-        return parentsExists
+            if not self.isParentExists(parent):
+                return False
+        return True
 
     def regSym(self, symbol, symProps, parents=()):
         if symbol in self._out or symbol in self._postponedSyms:  # add to strict mode - or symbol in self._importMap:
@@ -196,20 +226,45 @@ class SymtableCodeGen(AbstractCodeGen):
         if self.allParentsExists(parents):
             self._out[symbol] = symProps
             self._symsOrder.append(symbol)
-            self.regPostponedSyms()
+            self.regPostponedSyms(symbol)
         else:
-            self._postponedSyms[symbol] = (parents, symProps)
-
-    def regPostponedSyms(self):
-        regedSyms = []
-        for sym, val in self._postponedSyms.items():
-            parents, symProps = val
-            if self.allParentsExists(parents):
-                self._out[sym] = symProps
-                self._symsOrder.append(sym)
-                regedSyms.append(sym)
-        for sym in regedSyms:
-            self._postponedSyms.pop(sym)
+            # index is the number of symbols seen so far
+            self._postponedSyms[symbol] = (len(self._postponedSyms) + len(self._symsOrder), parents, symProps)
+            self.waitForParents(symbol)
+
+    def waitForParents(self, symbol):
+        idx, parents, symProps = self._postponedSyms[symbol]
+        for parent in parents:
+            if not self.isParentExists(parent):
+                if parent in self._waitingSyms:
+                    self._waitingSyms[parent].append(symbol)
+                else:
+                    self._waitingSyms[parent] = [symbol]
+                return
+        heapq.heappush(self._readySyms, (idx, symbol))
+
+    def regPostponedSyms(self, symbol):
+        # symbols waiting for just registered one may become ready
+        for sym in self._waitingSyms.pop(symbol, ()):
+            self.waitForParents(sym)
+
+        # register ready symbols in order of postponement, symbols
+        # made ready by a symbol postponed later than themselves
+        # stay behind till next registration
+        behind = []
+        lastIdx = -1
+        while self._readySyms:
+            idx, sym = heapq.heappop(self._readySyms)
+            if idx < lastIdx:
+                behind.append((idx, sym))
+                continue
+            lastIdx = idx
+            self._out[sym] = self._postponedSyms.pop(sym)[2]
+            self._symsOrder.append(sym)
+            for waitingSym in self._waitingSyms.pop(sym, ()):
+                self.waitForParents(waitingSym)
+        for x in behind:
+            heapq.heappush(self._readySyms, x)
 
         # Clause handlers
 
@@ -358,7 +413,12 @@ class SymtableCodeGen(AbstractCodeGen):
     def genConceptualTable(self, data, classmode=0):
         row = data[0]
         if row[0] and row[0][0]:
-            self._rows.add(self.transOpers(row[0][0]))
+            pysmiName = self.transOpers(row[0][0])
+            self._rows.add(pysmiName)
+            # symbols waiting for this row may become ready, they get
+            # registered right after the table symbol itself
+            for sym in self._waitingSyms.pop(pysmiName, ()):
+                self.waitForParents(sym)
         return ('MibTable', ''), ''
         # done
 
@@ -546,6 +606,8 @@ class SymtableCodeGen(AbstractCodeGen):
         self._parentOids.clear()
         self._symsOrder = []
         self._postponedSyms.clear()
+        self._waitingSyms.clear()
+        self._readySyms = []
         self._importMap.clear()
         self._out = {}  # should be new object, do not use `clear` method
         self.moduleName[0], moduleOid, imports, declarations = ast
@@ -555,6 +617,8 @@ class SymtableCodeGen(AbstractCodeGen):
                 clausetype = declr[0]
                 classmode = clausetype == 'typeDeclaration'
                 self.handlersTable[declr[0]](self, self.prepData(declr[1:], classmode), classmode)
+        while self._readySyms:
+            self.regPostponedSyms(None)
         if self._postponedSyms:
             raise error.PySmiSemanticError('Unknown parents for symbols: %s' % ', '.join(self._postponedSyms))
         for sym in self._parentOids:
@@ -567,3 +631,100 @@ class SymtableCodeGen(AbstractCodeGen):
             'canonical MIB name %s (%s), imported MIB(s) %s, Symbol table size %s symbols' % (
                 self.moduleName[0], moduleOid, ','.join(importedModules) or '<none>', len(self._out)))
         return MibInfo(oid=None, name=self.moduleName[0], imported=tuple([x for x in importedModules])), self._out
+
+
+class SymtableCache(object):
+    """Keep symbol tables of parsed ASN.1 MIBs in a local directory.
+
+    Symbol tables are looked up by MIB text and the grammar it has been
+    parsed with. Cached symbol tables let *MibCompiler* skip parsing
+    of MIBs which are only needed for their symbols.
+    """
+    suffix = os.path.extsep + 'sym'
+
+    def __init__(self, path):
+        """Create an instance of *SymtableCache*.
+
+           Args:
+               path (str): directory to store cached symbol tables at
+        """
+        self._path = os.path.normpath(path)
+
+    def __str__(self):
+        return '%s{"%s"}' % (self.__class__.__name__, self._path)
+
+    def getKey(self, data, parser):
+        """Return cache key for MIB text parsed by given parser."""
+        return hashlib.sha1(
+            encode(repr((packageVersion, sys.version_info[:2], parser.getSignature()))) + encode(data)
+        ).hexdigest()
+
+    def getData(self, data, parser):
+        """Fetch cached symbol tables for MIB text.
+
+           Args:
+               data (str): ASN.1 MIB text
+               parser: ASN.1 MIB parser object
+
+           Returns:
+               A list of *(MibInfo, symbol table)* tuples for each MIB
+               module defined in MIB text or *None* if not cached
+        """
+        symFile = os.path.join(self._path, self.getKey(data, parser) + self.suffix)
+
+        try:
+            fp = open(symFile, 'rb')
+            try:
+                symtables = marshal.load(fp)
+            finally:
+                fp.close()
+
+        except (IOError, OSError):
+            return
+
+        except (EOFError, ValueError, TypeError):
+            debug.logger & debug.flagCodegen and debug.logger(
+                'ignoring broken symbol table cache file %s: %s' % (symFile, sys.exc_info()[1]))
+            return
+
+        debug.logger & debug.flagCodegen and debug.logger('symbol tables loaded from %s' % symFile)
+
+        return [(MibInfo(oid=oid, name=name, imported=tuple(imported)), symbolTable)
+                for name, oid, imported, symbolTable in symtables]
+
+    def putData(self, data, parser, symtables):
+        """Store symbol tables of MIB modules defined in MIB text.
+
+           Args:
+               data (str): ASN.1 MIB text
+               parser: ASN.1 MIB parser object
+               symtables: a sequence of *(MibInfo, symbol table)* tuples
+        """
+        symFile = os.path.join(self._path, self.getKey(data, parser) + self.suffix)
+
+        tfile = None
+
+        try:
+            if not os.path.isdir(self._path):
+                os.makedirs(self._path)
+
+            fd, tfile = tempfile.mkstemp(dir=self._path)
+            try:
+                os.write(fd, marshal.dumps([(mibInfo.name, mibInfo.oid, tuple(mibInfo.imported), symbolTable)
+                                            for mibInfo, symbolTable in symtables]))
+            finally:
+                os.close(fd)
+
+            os.rename(tfile, symFile)
+
+        except (OSError, IOError, ValueError):
+            debug.logger & debug.flagCodegen and debug.logger(
+                'failure writing symbol table cache file %s: %s' % (symFile, sys.exc_info()[1]))
+            if tfile:
+                try:
+                    os.unlink(tfile)
+                except OSError:
+                    pass
+
+        else:
+            debug.logger & debug.flagCodegen and debug.logger('symbol tables stored at %s' % symFile)
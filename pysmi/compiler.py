@@ -7,6 +7,8 @@
 import sys
 import os
 import time
+import itertools
+import functools
 
 try:
     from pwd import getpwuid
@@ -17,6 +19,10 @@ from pysmi import __name__ as packageName
 from pysmi import __version__ as packageVersion
 from pysmi.mibinfo import MibInfo
 from pysmi.codegen.symtable import SymtableCodeGen
+from pysmi.codegen.resolver import OidResolver, TypeResolver
+from pysmi.parser.scanner import HeaderScanner
+from pysmi.depgraph import DependencyGraph
+from pysmi.searcher.manifest import Manifest
 from pysmi import error
 from pysmi import debug
 
@@ -35,6 +41,10 @@ class MibStatus(str):
     * *unprocessed* - MIB transformation required but waived for some reason
     * *missing* - ASN.1 MIB source can't be found
     * *borrowed* - MIB transformation failed but pre-transformed version was used
+
+    Statuses of *compiled* MIBs also carry numeric OID of MODULE-IDENTITY
+    (*None* if missing) in *oid* attribute and a sorted tuple of numeric OIDs
+    and names of MIB symbols in *oids* attribute.
     """
 
     def setOptions(self, **kwargs):
@@ -52,6 +62,80 @@ statusMissing = MibStatus('missing')
 statusBorrowed = MibStatus('borrowed')
 
 
+def _parseMib(parser, symbolgen, symtableCache, fileData):
+    if symtableCache:
+        symtables = symtableCache.getData(fileData, parser)
+        if symtables is not None:
+            # MIB tree is not needed unless code is generated for it
+            return [(mibInfo, None, symbolTable) for mibInfo, symbolTable in symtables], None
+    mibs = []
+    try:
+        for mibTree in parser.parse(fileData):
+            mibInfo, symbolTable = symbolgen.genCode(mibTree, {})
+            mibs.append((mibInfo, mibTree, symbolTable))
+    except error.PySmiError:
+        return mibs, sys.exc_info()[1]
+    if symtableCache:
+        symtableCache.putData(fileData, parser, [(mibInfo, symbolTable) for mibInfo, mibTree, symbolTable in mibs])
+    return mibs, None
+
+
+def _genCode(parser, codegen, symbolTableMap, resolvers, mibname, mibTree, fileData, comments, genTexts,
+             chunked):
+    if mibTree is None:
+        for mibTree in parser.parse(fileData):
+            if mibTree[0] == mibname:
+                break
+        else:
+            raise error.PySmiError('MIB %s not found in its source' % mibname)
+    oidResolver, typeResolver = resolvers
+    return codegen.genCode(mibTree, symbolTableMap, comments=comments, genTexts=genTexts,
+                           oidResolver=oidResolver, typeResolver=typeResolver, chunked=chunked)
+
+
+def _genIndexEntries(symbolTableMap, oidResolver, mibname):
+    oid = None
+    oids = []
+    symbolTable = symbolTableMap[mibname]
+    for symbol in symbolTable['_symtable_order']:
+        symProps = symbolTable[symbol]
+        if 'oid' not in symProps or symProps['type'] == 'fakeColumn':
+            continue
+        try:
+            numericOid = oidResolver.getOid(symbol, mibname)
+        except error.PySmiError:
+            debug.logger & debug.flagCompiler and debug.logger(
+                'no OID for symbol %s at MIB %s: %s' % (symbol, mibname, sys.exc_info()[1]))
+            continue
+        if symProps['type'] == 'ModuleIdentity':
+            oid = numericOid
+        oids.append((numericOid, symProps['origName']))
+    oids.sort()
+    return oid, tuple(oids)
+
+
+# Worker process side of parallel compilation
+
+_workerContext = {}
+
+
+def _initWorker(context):
+    _workerContext.update(context)
+
+
+def _parseMibTask(fileData):
+    return _parseMib(_workerContext['parser'], _workerContext['symbolgen'],
+                     _workerContext['symtableCache'], fileData)
+
+
+def _genCodeTask(mibname, mibTree, fileData, comments, genTexts, chunked):
+    try:
+        return _genCode(_workerContext['parser'], _workerContext['codegen'], _workerContext['symbolTableMap'],
+                        _workerContext['resolvers'], mibname, mibTree, fileData, comments, genTexts, chunked), None
+    except error.PySmiError:
+        return None, sys.exc_info()[1]
+
+
 class MibCompiler(object):
     """Top-level, user-facing, composite MIB compiler object.
 
@@ -110,10 +194,15 @@ class MibCompiler(object):
         self._parser = parser
         self._codegen = codegen
         self._symbolgen = SymtableCodeGen()
+        self._scanner = HeaderScanner()
         self._writer = writer
         self._sources = []
         self._searchers = []
         self._borrowers = []
+        self._symtableCache = None
+        self._manifest = None
+        self._negativeCache = None
+        self._legacySearchers = set()  # searchers not taking digest
 
     def addSources(self, *sources):
         """Add more ASN.1 MIB source repositories.
@@ -174,6 +263,202 @@ class MibCompiler(object):
             'current MIB borrower(s): %s' % ', '.join([str(x) for x in self._borrowers]))
         return self
 
+    def setSymtableCache(self, symtableCache):
+        """Keep symbol tables of parsed MIBs in a cache.
+
+        Once symbol tables of a MIB are cached, MibCompiler.compile will
+        not parse that MIB again unless its text changes or code needs to
+        be generated for it.
+
+        Args:
+            symtableCache: symbol table cache object or *None*
+
+        Returns:
+            reference to itself (can be used for call chaining)
+
+        """
+        self._symtableCache = symtableCache
+        debug.logger & debug.flagCompiler and debug.logger('current symbol table cache: %s' % symtableCache)
+        return self
+
+    def setManifest(self, manifest):
+        """Record what transformed MIBs are built from in a manifest.
+
+        Once *writer* stores transformed MIB, digest of ASN.1 MIB text
+        it has been built from is recorded in the manifest. Searchers
+        reading the same manifest would then consider transformed MIB
+        up to date for as long as its source MIB text stays the same.
+
+        Args:
+            manifest: *Manifest* object or *None*
+
+        Returns:
+            reference to itself (can be used for call chaining)
+
+        """
+        self._manifest = manifest
+        debug.logger & debug.flagCompiler and debug.logger('current manifest: %s' % manifest)
+        return self
+
+    def setNegativeCache(self, negativeCache):
+        """Remember MIBs sources and borrowers could not find.
+
+        Once a remote source or borrower reports a MIB missing,
+        MibCompiler.compile will not ask it for that MIB again for as
+        long as the negative cache keeps the record. Misses of local
+        readers are not recorded.
+
+        Args:
+            negativeCache: *NegativeCache* object or *None*
+
+        Returns:
+            reference to itself (can be used for call chaining)
+
+        """
+        self._negativeCache = negativeCache
+        debug.logger & debug.flagCompiler and debug.logger('current negative cache: %s' % negativeCache)
+        return self
+
+    @staticmethod
+    def _createPool(jobs, **context):
+        import multiprocessing
+
+        debug.logger & debug.flagCompiler and debug.logger('starting %s worker processes' % jobs)
+
+        return multiprocessing.Pool(jobs, _initWorker, (context,))
+
+    def _fileExists(self, searcher, mibname, mtime, rebuild=False, digest=None):
+        # searchers predating manifest support do not take digest
+        if id(searcher) not in self._legacySearchers:
+            try:
+                return searcher.fileExists(mibname, mtime, rebuild=rebuild, digest=digest)
+            except TypeError:
+                # fault inside the searcher rather than signature mismatch
+                if sys.exc_info()[2].tb_next is not None:
+                    raise
+                debug.logger & debug.flagCompiler and debug.logger(
+                    'searcher %s does not take source digest: %s' % (searcher, sys.exc_info()[1]))
+                self._legacySearchers.add(id(searcher))
+        return searcher.fileExists(mibname, mtime, rebuild=rebuild)
+
+    def _getData(self, reader, mibname, **kwargs):
+        # local readers' misses are not worth remembering
+        negativeCache = getattr(reader, 'remote', False) and self._negativeCache
+        if negativeCache and negativeCache.isMissing(reader, mibname):
+            debug.logger & debug.flagCompiler and debug.logger('MIB %s known to be missing at %s' % (mibname, reader))
+            raise error.PySmiReaderFileNotFoundError('source MIB %s not found (cached)' % mibname, reader=reader)
+        try:
+            fileInfo, fileData = reader.getData(mibname, **kwargs)
+        except error.PySmiReaderFileNotFoundError:
+            if negativeCache:
+                negativeCache.setMissing(reader, mibname)
+            raise
+        if negativeCache:
+            negativeCache.setMissing(reader, mibname, missing=False)
+        fileInfo.digest = Manifest.getDigest(fileData)
+        return fileInfo, fileData
+
+    def _fetchMib(self, mibname, parse, fetched):
+        sources = self._sources
+        if mibname in fetched:
+            # fetched already while scanning MIB headers
+            if fetched[mibname] is None:  # found missing
+                del fetched[mibname]
+                return
+            source, fileInfo, fileData = fetched.pop(mibname)
+            yield source, fileInfo, fileData, parse(fileData), None
+            sources = sources[sources.index(source) + 1:]
+        for source in sources:
+            debug.logger & debug.flagCompiler and debug.logger('trying source %s' % source)
+            try:
+                fileInfo, fileData = self._getData(source, mibname)
+            except error.PySmiError:
+                yield source, None, None, None, sys.exc_info()[1]
+                continue
+            yield source, fileInfo, fileData, parse(fileData), None
+
+    def _prefetchMib(self, mibname, parse, fetched):
+        fetcher = self._fetchMib(mibname, parse, fetched)
+        attempts = []
+        for attempt in fetcher:
+            attempts.append(attempt)
+            if attempt[4] is None:  # parsing is under way
+                break
+        return itertools.chain(attempts, fetcher)
+
+    def _scanMibs(self, mibnames, processed, fetched, **options):
+        debug.logger & debug.flagCompiler and debug.logger('scanning MIB headers with %s' % self._scanner)
+
+        depGraph = DependencyGraph(*mibnames)
+        outdatedMibs = []
+
+        while depGraph:
+            mibname = depGraph.pop()
+
+            for source in self._sources:
+                try:
+                    fileInfo, fileData = self._getData(source, mibname)
+                    break
+                except error.PySmiReaderFileNotFoundError:
+                    continue
+                except error.PySmiError:
+                    debug.logger & debug.flagCompiler and debug.logger(
+                        'error from %s: %s' % (source, sys.exc_info()[1]))
+                    fileData = None
+                    break
+            else:
+                fileData = None
+                fetched[mibname] = None
+
+            if fileData is not None:
+                # to be reused should MIB be parsed
+                fetched[mibname] = source, fileInfo, fileData
+
+            mibInfos = fileData is not None and self._scanner.scan(fileData) or ()
+
+            if not mibInfos:
+                # let full parser deal with it, if needed at all
+                if mibname in mibnames:
+                    outdatedMibs.append(mibname)
+                continue
+
+            for mibInfo in mibInfos:
+                depGraph.addImports(mibInfo.name, self._symbolgen.getImportedModules(mibInfo.imports))
+
+                for searcher in self._searchers:
+                    try:
+                        self._fileExists(searcher, mibInfo.name, fileInfo.mtime, rebuild=options.get('rebuild'),
+                                         digest=fileInfo.digest)
+                    except error.PySmiFileNotModifiedError:
+                        debug.logger & debug.flagCompiler and debug.logger(
+                            'compiled MIB %s found by %s is up to date' % (mibInfo.name, searcher))
+                        processed[mibInfo.name] = statusUntouched
+                        break
+                    except error.PySmiError:
+                        continue
+                else:
+                    if options.get('noDeps') and mibInfo.name not in mibnames:
+                        processed[mibInfo.name] = statusUntouched
+                    elif mibname not in outdatedMibs:
+                        outdatedMibs.append(mibname)
+
+        debug.logger & debug.flagCompiler and debug.logger(
+            'MIBs scanned %s, MIBs to parse %s' % (len(depGraph.getOrder()), ', '.join(outdatedMibs) or '<none>'))
+
+        return outdatedMibs
+
+    @staticmethod
+    def _genComments(fileInfo):
+        return [
+            'ASN.1 source %s' % fileInfo.path,
+            'Produced by %s-%s at %s' % (packageName, packageVersion, time.asctime()),
+            'On host %s platform %s version %s by user %s' % (
+                hasattr(os, 'uname') and os.uname()[1] or '?', hasattr(os, 'uname') and os.uname()[0] or '?',
+                hasattr(os, 'uname') and os.uname()[2] or '?',
+                hasattr(os, 'getuid') and getpwuid(os.getuid())[0] or '?'),
+            'Using Python version %s' % sys.version.split('\n')[0]
+        ]
+
     def compile(self, *mibnames, **options):
         """Transform requested and possibly referred MIBs.
 
@@ -193,6 +478,15 @@ class MibCompiler(object):
         *mibnames* and may be performed for all MIBs referred to from
         MIBs being processed.
 
+        With *jobs* option set to a number greater than one, parsing and
+        code generation is spread over that many worker processes. The
+        outcome is the same as of serial compilation.
+
+        With *scanHeaders* option set, MIB headers are first scanned for
+        module names and imports to see which MIBs are out of date. Only
+        those MIBs and the MIBs they import are then parsed, other MIBs
+        found are reported *untouched*.
+
         Args:
             mibnames: list of ASN.1 MIBs names
             options: options that affect the way PySMI components work
@@ -208,63 +502,111 @@ class MibCompiler(object):
         borrowedMibs = {}
         builtMibs = {}
         symbolTableMap = {}
-        mibsToParse = [x for x in mibnames]
-        while mibsToParse:
-            mibname = mibsToParse.pop(0)
-            if mibname in parsedMibs:
-                debug.logger & debug.flagCompiler and debug.logger('MIB %s already parsed' % mibname)
-                continue
-            if mibname in failedMibs:
-                debug.logger & debug.flagCompiler and debug.logger('MIB %s already failed' % mibname)
-                continue
+        mibTexts = {}  # k, v = MIB name, MIB text yet to be parsed
+        fetchedMibs = {}  # k, v = MIB name, (source, fileInfo, MIB text) fetched while scanning
+        depGraph = DependencyGraph()
 
-            for source in self._sources:
-                debug.logger & debug.flagCompiler and debug.logger('trying source %s' % source)
-                try:
-                    fileInfo, fileData = source.getData(mibname)
-                    for mibTree in self._parser.parse(fileData):
-                        mibInfo, symbolTable = self._symbolgen.genCode(
-                            mibTree, symbolTableMap
-                        )
+        if options.get('scanHeaders'):
+            mibnamesToParse = self._scanMibs(mibnames, processed, fetchedMibs, **options)
+        else:
+            mibnamesToParse = mibnames
 
-                        symbolTableMap[mibInfo.name] = symbolTable
+        jobs = options.get('jobs') or 1
+        pool = None
+        prefetched = {}  # k, v = MIB name, source attempts under way
 
-                        parsedMibs[mibInfo.name] = fileInfo, mibInfo, mibTree
-                        if mibname in failedMibs:
-                            del failedMibs[mibname]
+        if jobs > 1:
+            pool = self._createPool(jobs, parser=self._parser, symbolgen=self._symbolgen,
+                                    symtableCache=self._symtableCache)
 
-                        mibsToParse.extend(mibInfo.imported)
+            def parse(fileData):
+                return pool.apply_async(_parseMibTask, (fileData,)).get
 
-                        debug.logger & debug.flagCompiler and debug.logger(
-                            '%s (%s) read from %s, immediate dependencies: %s' % (
-                                mibInfo.name, mibname, fileInfo.path, ', '.join(mibInfo.imported) or '<none>'))
+            def prefetch(mibnames):
+                for mibname in mibnames:
+                    if mibname not in parsedMibs and mibname not in failedMibs:
+                        prefetched[mibname] = self._prefetchMib(mibname, parse, fetchedMibs)
 
-                    break
+        else:
+            def parse(fileData):
+                return functools.partial(_parseMib, self._parser, self._symbolgen, self._symtableCache, fileData)
 
-                except error.PySmiReaderFileNotFoundError:
-                    debug.logger & debug.flagCompiler and debug.logger('no %s found at %s' % (mibname, source))
+            def prefetch(mibnames):
+                pass
+
+        try:
+            prefetch(depGraph.add(*mibnamesToParse))
+
+            while depGraph:
+                mibname = depGraph.pop()
+                if mibname in parsedMibs:
+                    debug.logger & debug.flagCompiler and debug.logger('MIB %s already parsed' % mibname)
                     continue
-                except error.PySmiError:
-                    exc_class, exc, tb = sys.exc_info()
-                    exc.source = source
+                if mibname in failedMibs:
+                    debug.logger & debug.flagCompiler and debug.logger('MIB %s already failed' % mibname)
+                    continue
+
+                for source, fileInfo, fileData, result, exc in (prefetched.pop(mibname, None) or
+                                                                self._fetchMib(mibname, parse, fetchedMibs)):
+                    try:
+                        if exc is not None:
+                            raise exc
+
+                        mibs, exc = result()
+
+                        for mibInfo, mibTree, symbolTable in mibs:
+                            symbolTableMap[mibInfo.name] = symbolTable
+
+                            parsedMibs[mibInfo.name] = fileInfo, mibInfo, mibTree
+                            if mibTree is None:
+                                mibTexts[mibInfo.name] = fileData
+                            if mibname in failedMibs:
+                                del failedMibs[mibname]
+
+                            prefetch(depGraph.addImports(mibInfo.name, mibInfo.imported))
+
+                            debug.logger & debug.flagCompiler and debug.logger(
+                                '%s (%s) read from %s, immediate dependencies: %s' % (
+                                    mibInfo.name, mibname, fileInfo.path, ', '.join(mibInfo.imported) or '<none>'))
+
+                        if exc is not None:
+                            raise exc
+
+                        break
+
+                    except error.PySmiReaderFileNotFoundError:
+                        debug.logger & debug.flagCompiler and debug.logger('no %s found at %s' % (mibname, source))
+                        continue
+                    except error.PySmiError:
+                        exc_class, exc, tb = sys.exc_info()
+                        exc.source = source
+                        exc.mibname = mibname
+                        exc.msg += ' at MIB %s' % mibname
+                        debug.logger & debug.flagCompiler and debug.logger('%serror %s from %s' % (
+                            options.get('ignoreErrors') and 'ignoring ' or 'failing on ', exc, source))
+                        failedMibs[mibname] = exc
+                        processed[mibname] = statusFailed.setOptions(error=exc)
+                else:
+                    exc = error.PySmiError('MIB source %s not found' % mibname)
                     exc.mibname = mibname
-                    exc.msg += ' at MIB %s' % mibname
-                    debug.logger & debug.flagCompiler and debug.logger('%serror %s from %s' % (
-                        options.get('ignoreErrors') and 'ignoring ' or 'failing on ', exc, source))
-                    failedMibs[mibname] = exc
-                    processed[mibname] = statusFailed.setOptions(error=exc)
-            else:
-                exc = error.PySmiError('MIB source %s not found' % mibname)
-                exc.mibname = mibname
-                debug.logger & debug.flagCompiler and debug.logger('no %s found everywhare' % mibname)
-                if mibname not in failedMibs:
-                    failedMibs[mibname] = exc
-                if mibname not in processed:
-                    processed[mibname] = statusMissing
+                    debug.logger & debug.flagCompiler and debug.logger('no %s found everywhare' % mibname)
+                    if mibname not in failedMibs:
+                        failedMibs[mibname] = exc
+                    if mibname not in processed:
+                        processed[mibname] = statusMissing
+
+        finally:
+            if pool:
+                pool.terminate()
+                pool.join()
 
         debug.logger & debug.flagCompiler and debug.logger(
             'MIBs analized %s, MIBs failed %s' % (len(parsedMibs), len(failedMibs)))
 
+        if debug.logger & debug.flagCompiler:
+            for cycle in depGraph.getCycles(parsedMibs):
+                debug.logger('circular MIB imports: %s' % ' -> '.join(cycle + cycle[:1]))
+
         #
         # See what MIBs need generating
         #
@@ -274,7 +616,8 @@ class MibCompiler(object):
             debug.logger & debug.flagCompiler and debug.logger('checking if %s requires updating' % mibname)
             for searcher in self._searchers:
                 try:
-                    searcher.fileExists(mibname, fileInfo.mtime, rebuild=options.get('rebuild'))
+                    self._fileExists(searcher, mibname, fileInfo.mtime, rebuild=options.get('rebuild'),
+                                     digest=fileInfo.digest)
                 except error.PySmiFileNotFoundError:
                     debug.logger & debug.flagCompiler and debug.logger(
                         'no compiled MIB %s available through %s' % (mibname, searcher))
@@ -312,42 +655,67 @@ class MibCompiler(object):
         # Generate code for parsed MIBs
         #
 
-        for mibname in parsedMibs.copy():
-            fileInfo, mibInfo, mibTree = parsedMibs[mibname]
+        pool = None
+        codegenJobs = {}  # k, v = MIB name, pending code generation result
 
-            comments = [
-                'ASN.1 source %s' % fileInfo.path,
-                'Produced by %s-%s at %s' % (packageName, packageVersion, time.asctime()),
-                'On host %s platform %s version %s by user %s' % (
-                    hasattr(os, 'uname') and os.uname()[1] or '?', hasattr(os, 'uname') and os.uname()[0] or '?',
-                    hasattr(os, 'uname') and os.uname()[2] or '?',
-                    hasattr(os, 'getuid') and getpwuid(os.getuid())[0] or '?'),
-                'Using Python version %s' % sys.version.split('\n')[0]
-            ]
+        # shared by all MIBs so that each OID and type is resolved just once
+        resolvers = OidResolver(symbolTableMap), TypeResolver(symbolTableMap)
 
-            try:
-                mibInfo, mibData = self._codegen.genCode(
-                    mibTree,
-                    symbolTableMap,
-                    comments=comments,
-                    genTexts=options.get('genTexts')
+        # only writers declaring so take generated code in chunks
+        chunked = getattr(self._writer, 'supportsChunks', False)
+
+        if jobs > 1 and len(parsedMibs) > 1:
+            # code generator only reads symbol tables, so MIBs can be
+            # handled independently, imported MIBs go first
+            pool = self._createPool(jobs, parser=self._parser, codegen=self._codegen,
+                                    symbolTableMap=symbolTableMap, resolvers=resolvers)
+
+            for mibname in depGraph.getOrder(parsedMibs):
+                fileInfo, mibInfo, mibTree = parsedMibs[mibname]
+                codegenJobs[mibname] = pool.apply_async(
+                    _genCodeTask, (mibname, mibTree, mibTexts.get(mibname),
+                                   self._genComments(fileInfo), options.get('genTexts'), chunked)
                 )
 
-                builtMibs[mibname] = fileInfo, mibInfo, mibData
-                del parsedMibs[mibname]
+        try:
+            for mibname in parsedMibs.copy():
+                fileInfo, mibInfo, mibTree = parsedMibs[mibname]
 
-                debug.logger & debug.flagCompiler and debug.logger(
-                    '%s read from %s and compiled by %s' % (mibname, fileInfo.path, self._writer))
+                try:
+                    if mibname in codegenJobs:
+                        result, exc = codegenJobs.pop(mibname).get()
+                        if exc is not None:
+                            raise exc
+
+                        mibInfo, mibData = result
+
+                    else:
+                        mibInfo, mibData = _genCode(
+                            self._parser, self._codegen, symbolTableMap, resolvers,
+                            mibname, mibTree, mibTexts.get(mibname),
+                            self._genComments(fileInfo), options.get('genTexts'), chunked
+                        )
 
-            except error.PySmiError:
-                exc_class, exc, tb = sys.exc_info()
-                exc.handler = self._codegen
-                exc.mibname = mibname
-                exc.msg += ' at MIB %s' % mibname
-                debug.logger & debug.flagCompiler and debug.logger('error from %s: %s' % (self._codegen, exc))
-                processed[mibname] = statusFailed.setOptions(error=exc)
-                failedMibs[mibname] = exc
-                del parsedMibs[mibname]
+                    builtMibs[mibname] = fileInfo, mibInfo, mibData
+                    del parsedMibs[mibname]
+
+                    debug.logger & debug.flagCompiler and debug.logger(
+                        '%s read from %s and compiled by %s' % (mibname, fileInfo.path, self._writer))
+
+                except error.PySmiError:
+                    exc_class, exc, tb = sys.exc_info()
+                    exc.handler = self._codegen
+                    exc.mibname = mibname
+                    exc.msg += ' at MIB %s' % mibname
+                    debug.logger & debug.flagCompiler and debug.logger('error from %s: %s' % (self._codegen, exc))
+                    processed[mibname] = statusFailed.setOptions(error=exc)
+                    failedMibs[mibname] = exc
+                    del parsedMibs[mibname]
+
+        finally:
+            if pool:
+                pool.terminate()
+                pool.join()
 
         debug.logger & debug.flagCompiler and debug.logger(
             'MIBs built %s, MIBs failed %s' % (len(parsedMibs), len(failedMibs)))
@@ -364,7 +732,8 @@ class MibCompiler(object):
             for borrower in self._borrowers:
                 debug.logger & debug.flagCompiler and debug.logger('trying to borrow %s from %s' % (mibname, borrower))
                 try:
-                    fileInfo, fileData = borrower.getData(
+                    fileInfo, fileData = self._getData(
+                        borrower,
                         mibname,
                         genTexts=options.get('genTexts')
                     )
@@ -379,6 +748,9 @@ class MibCompiler(object):
                 except error.PySmiError:
                     debug.logger & debug.flagCompiler and debug.logger('error from %s: %s' % (borrower, sys.exc_info()[1]))
 
+        if self._negativeCache:
+            self._negativeCache.flush()
+
         debug.logger & debug.flagCompiler and debug.logger(
             'MIBs available for borrowing %s, MIBs failed %s' % (len(borrowedMibs), len(failedMibs)))
 
@@ -391,7 +763,8 @@ class MibCompiler(object):
             fileInfo, mibInfo, mibData = borrowedMibs[mibname]
             for searcher in self._searchers:
                 try:
-                    searcher.fileExists(mibname, fileInfo.mtime, rebuild=options.get('rebuild'))
+                    self._fileExists(searcher, mibname, fileInfo.mtime, rebuild=options.get('rebuild'),
+                                     digest=fileInfo.digest)
                 except error.PySmiFileNotFoundError:
                     debug.logger & debug.flagCompiler and debug.logger(
                         'no compiled MIB %s available through %s' % (mibname, searcher))
@@ -450,32 +823,42 @@ class MibCompiler(object):
         # Store compiled MIBs
         #
 
-        for mibname in builtMibs.copy():
-            fileInfo, mibInfo, mibData = builtMibs[mibname]
-            try:
-                self._writer.putData(
-                    mibname, mibData, dryRun=options.get('dryRun')
-                )
+        try:
+            for mibname in builtMibs.copy():
+                fileInfo, mibInfo, mibData = builtMibs[mibname]
+                try:
+                    self._writer.putData(
+                        mibname, mibData, dryRun=options.get('dryRun')
+                    )
 
-                debug.logger & debug.flagCompiler and debug.logger('%s stored by %s' % (mibname, self._writer))
+                    if self._manifest and not options.get('dryRun'):
+                        self._manifest.update(mibname, fileInfo.digest)
 
-                del builtMibs[mibname]
+                    debug.logger & debug.flagCompiler and debug.logger('%s stored by %s' % (mibname, self._writer))
 
-                if mibname not in processed:
-                    processed[mibname] = statusCompiled.setOptions(
-                        path=fileInfo.path, file=fileInfo.file,
-                        alias=fileInfo.name
-                    )
+                    del builtMibs[mibname]
 
-            except error.PySmiError:
-                exc_class, exc, tb = sys.exc_info()
-                exc.handler = self._codegen
-                exc.mibname = mibname
-                exc.msg += ' at MIB %s' % mibname
-                debug.logger & debug.flagCompiler and debug.logger('error %s from %s' % (exc, self._writer))
-                processed[mibname] = statusFailed.setOptions(error=exc)
-                failedMibs[mibname] = exc
-                del builtMibs[mibname]
+                    if mibname not in processed:
+                        oid, oids = _genIndexEntries(symbolTableMap, resolvers[0], mibname)
+                        processed[mibname] = statusCompiled.setOptions(
+                            path=fileInfo.path, file=fileInfo.file,
+                            alias=fileInfo.name, oid=oid, oids=oids
+                        )
+
+                except error.PySmiError:
+                    exc_class, exc, tb = sys.exc_info()
+                    exc.handler = self._codegen
+                    exc.mibname = mibname
+                    exc.msg += ' at MIB %s' % mibname
+                    debug.logger & debug.flagCompiler and debug.logger('error %s from %s' % (exc, self._writer))
+                    processed[mibname] = statusFailed.setOptions(error=exc)
+                    failedMibs[mibname] = exc
+                    del builtMibs[mibname]
+
+        finally:
+            # keep records of MIBs written so far whatever happens
+            if self._manifest:
+                self._manifest.flush()
 
         debug.logger & debug.flagCompiler and debug.logger(
             'MIBs modifed: %s' % ', '.join([x for x in processed if processed[x] in ('compiled', 'borrowed')]))
@@ -483,6 +866,22 @@ class MibCompiler(object):
         return processed
 
     def buildIndex(self, processedMibs, **options):
+        """Build OID index of MIBs transformed by *compile*.
+
+        The index refers numeric OIDs of all symbols defined in *compiled*
+        MIBs to their MIB and symbol names. Its contents is sorted by OID
+        and formatted by *code generator*, it is stored through *writer*
+        under *indexFile* name.
+
+        Index built earlier is read back through *writer* and updated,
+        so MIBs compiled in previous runs stay in the index while entries
+        of MIBs compiled in this run get replaced as a whole.
+
+        Args:
+            processedMibs: a dictionary of MIB module names (keys) and
+                *MibStatus* class instances (values) as returned by *compile*
+            options: options that affect the way PySMI components work
+        """
         comments = [
             'Produced by %s-%s at %s' % (packageName, packageVersion, time.asctime()),
             'On host %s platform %s version %s by user %s' % (
@@ -491,12 +890,23 @@ class MibCompiler(object):
             'Using Python version %s' % sys.version.split('\n')[0]
         ]
         try:
+            try:
+                mibsMap = self._codegen.parseIndex(self._writer.getData(self.indexFile))
+
+            except error.PySmiFileNotFoundError:
+                mibsMap = {}
+
+            debug.logger & debug.flagCompiler and debug.logger(
+                'updating index %s of %s MIBs' % (self.indexFile, len(mibsMap)))
+
+            for mibname in processedMibs:
+                if hasattr(processedMibs[mibname], 'oids'):
+                    mibsMap[mibname] = processedMibs[mibname]
+
             self._writer.putData(
                 self.indexFile,
-                self._codegen.genIndex(
-                    dict([(x, x.oid) for x in processedMibs if hasattr(x, 'oid')]),
-                    comments=comments
-                ),
+                self._codegen.genIndex(mibsMap, comments=comments,
+                                       chunked=getattr(self._writer, 'supportsChunks', False)),
                 dryRun=options.get('dryRun')
             )
         except error.PySmiError:
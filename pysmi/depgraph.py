@@ -0,0 +1,137 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+from collections import deque
+
+
+class DependencyGraph(object):
+    """Graph of MIB modules linked by their IMPORTS.
+
+    *DependencyGraph* serves as a processing queue of MIB names where
+    each name is queued just once, no matter how many times it has been
+    added. As MIB modules get parsed, their imports are recorded to
+    form a graph which could then be walked in dependency order.
+    """
+
+    def __init__(self, *mibnames):
+        """Create an instance of *DependencyGraph*.
+
+           Args:
+               mibnames (str): MIB names to queue initially
+        """
+        self._queue = deque()
+        self._queued = set()
+        self._imports = {}  # k, v = MIB name, tuple of imported MIB names
+        self._importers = {}  # k, v = MIB name, set of importing MIB names
+        self.add(*mibnames)
+
+    def __len__(self):
+        return len(self._queue)
+
+    def add(self, *mibnames):
+        """Queue MIB names not seen before.
+
+           Args:
+               mibnames (str): MIB names
+
+           Returns:
+               A list of newly queued MIB names
+        """
+        added = []
+        for mibname in mibnames:
+            if mibname not in self._queued:
+                self._queued.add(mibname)
+                self._queue.append(mibname)
+                added.append(mibname)
+        return added
+
+    def addImports(self, mibname, imported):
+        """Record MIB imports and queue imported MIBs not seen before.
+
+           Args:
+               mibname (str): importing MIB name
+               imported: a sequence of imported MIB names
+
+           Returns:
+               A list of newly queued MIB names
+        """
+        self._imports[mibname] = tuple(imported)
+        for x in imported:
+            self._importers.setdefault(x, set()).add(mibname)
+        return self.add(*imported)
+
+    def pop(self):
+        """Return next queued MIB name in order of addition."""
+        return self._queue.popleft()
+
+    def getImports(self, mibname):
+        return self._imports.get(mibname, ())
+
+    def getImporters(self, mibname):
+        return sorted(self._importers.get(mibname, ()))
+
+    def _walk(self, mibnames):
+        if mibnames is None:
+            mibnames = self._imports
+        else:
+            mibnames = set(mibnames)
+        order = []
+        cycles = []
+        visited = set()
+        for root in sorted(mibnames):
+            if root in visited:
+                continue
+            visited.add(root)
+            path = [root]
+            stack = [iter(self.getImports(root))]
+            while stack:
+                for imported in stack[-1]:
+                    if imported not in mibnames:
+                        continue
+                    if imported in path:
+                        cycles.append(tuple(path[path.index(imported):]))
+                        continue
+                    if imported in visited:
+                        continue
+                    visited.add(imported)
+                    path.append(imported)
+                    stack.append(iter(self.getImports(imported)))
+                    break
+                else:
+                    stack.pop()
+                    order.append(path.pop())
+        return order, cycles
+
+    def getOrder(self, mibnames=None):
+        """Return MIB names ordered so that imported MIBs come first.
+
+           Import cycles, if any, are broken at arbitrary (but stable) point.
+
+           Keyword Args:
+               mibnames: a collection of MIB names to order, imports
+                   of other MIBs are ignored. Defaults to all MIBs
+                   with known imports.
+
+           Returns:
+               A list of MIB names
+        """
+        return self._walk(mibnames)[0]
+
+    def getCycles(self, mibnames=None):
+        """Return import cycles found among MIBs.
+
+           Each import closing a cycle while walking the graph in
+           dependency order is reported once.
+
+           Keyword Args:
+               mibnames: a collection of MIB names to look into. Defaults
+                   to all MIBs with known imports.
+
+           Returns:
+               A list of tuples of MIB names each importing the next one
+               and the last one importing the first one
+        """
+        return self._walk(mibnames)[1]
@@ -6,6 +6,8 @@
 #
 import sys
 import re
+import functools
+import threading
 import ply.lex as lex
 from pysmi.lexer.base import AbstractLexer
 from pysmi import error
@@ -251,6 +253,182 @@ class SmiV2Lexer(AbstractLexer):
         # t.lexer.skip(1)
 
 
+# PLY lexer rules precedence: function rules in order of definition
+# followed by string rules by decreasing regex length and then literals
+_fastRules = ('MACRO', 'EXPORTS', 'CHOICE', 'UPPERCASE_IDENTIFIER', 'LOWERCASE_IDENTIFIER',
+              'NUMBER', 'BIN_STRING', 'HEX_STRING', 'QUOTED_STRING')
+
+_fastSkip = r'(?:[ \t]+|\r\n|\n|\r|--[^\r\n]*)*'
+
+# token regex groups are named after token types, literals go last
+_fastTokens = ['(?P<%s>%s)' % (x, getattr(SmiV2Lexer, 't_' + x).__doc__) for x in _fastRules]
+_fastTokens.append('(?P<DOT_DOT>%s)' % SmiV2Lexer.t_DOT_DOT)
+_fastTokens.append('(?P<COLON_COLON_EQUAL>%s)' % SmiV2Lexer.t_COLON_COLON_EQUAL)
+_fastTokens.append('(?P<literal>[%s])' % re.escape(SmiV2Lexer.literals))
+
+
+def _countLines(text):
+    lines = text.count('\n')
+    if '\r' in text:
+        lines += text.count('\r') - text.count('\r\n')
+    return lines
+
+
+# noinspection PyAttributeOutsideInit
+class FastSmiV2Lexer(SmiV2Lexer):
+    """Drop-in replacement for PLY-based *SmiV2Lexer*.
+
+    Produces exactly the same stream of tokens as *SmiV2Lexer* does,
+    but scans MIB text with a single compiled regular expression which
+    skips whitespace and comments in bulk. The lexer object serves as
+    its own PLY-compatible lexer.
+    """
+    # skipped text is matched in a lookahead to make it atomic
+    tokenRe = re.compile('(?=(?P<skip>%s))(?P=skip)(?:%s)' % (_fastSkip, '|'.join(_fastTokens)), re.DOTALL)
+    skipRe = re.compile(_fastSkip)
+
+    # tokens switching to exclusive lexer states
+    stateStarts = ('MACRO', 'EXPORTS', 'CHOICE')
+
+    # k, v = exclusive lexer state, character returning to INITIAL state
+    stateEnds = {
+        'exports': ';',
+        'choice': '}'
+    }
+
+    def reset(self):
+        self.lexer = self
+        self.lexdata = None
+        self.lexpos = 0
+        self.lineno = 1
+        self.lexstate = 'INITIAL'
+        self.token = functools.partial(next, iter(()), None)
+
+    def input(self, data):
+        self.lexdata = data
+        self.lexpos = 0
+        # saves a method call on a per-token basis
+        self.token = functools.partial(next, self._scan(data), None)
+
+    def begin(self, state):
+        self.lexstate = state
+
+    def _scan(self, data):
+        tokenRe = self.tokenRe
+        reserved = self.reserved
+        forbiddenWords = self.forbidden_words
+        LexToken = lex.LexToken
+        lexlen = len(data)
+        lineno = self.lineno
+        pos = 0
+
+        while True:
+            if self.lexstate == 'INITIAL':
+                m = tokenRe.match(data, pos)
+                if m is None:
+                    break
+
+                skipped = m.group('skip')
+                if '\n' in skipped or '\r' in skipped:
+                    self.lineno = lineno = lineno + _countLines(skipped)
+
+                name = m.lastgroup
+                t = LexToken()
+                t.value = value = m.group(name)
+                t.lineno = lineno
+                t.lexpos = m.start(name)
+
+                pos = m.end()
+
+                if name == 'UPPERCASE_IDENTIFIER':
+                    if value in forbiddenWords:
+                        raise error.PySmiLexerError("%s is forbidden" % value, lineno=lineno)
+                    if value[-1] == '-':
+                        raise error.PySmiLexerError("Identifier should not end with '-': %s" % value,
+                                                    lineno=lineno)
+                    t.type = reserved.get(value, name)
+                elif name == 'literal':
+                    t.type = value
+                elif name == 'LOWERCASE_IDENTIFIER':
+                    if value[-1] == '-':
+                        raise error.PySmiLexerError("Identifier should not end with '-': %s" % value,
+                                                    lineno=lineno)
+                    t.type = name
+                elif name == 'QUOTED_STRING':
+                    t.type = name
+                    self.lineno = lineno = lineno + _countLines(value)
+                elif name == 'NUMBER':
+                    t.type = name
+                    self.t_NUMBER(t)
+                else:
+                    t.type = name
+                    if name in self.stateStarts:
+                        self.lexstate = value.lower()
+
+                self.lexpos = pos
+
+                yield t
+
+                continue
+
+            if pos >= lexlen:
+                return
+
+            c = data[pos]
+
+            if c in '\r\n':
+                pos = data.startswith('\r\n', pos) and pos + 2 or pos + 1
+                self.lineno = lineno = lineno + 1
+
+            elif self.lexstate == 'macro':
+                if data.startswith('END', pos):
+                    t = LexToken()
+                    t.type = t.value = 'END'
+                    t.lineno = lineno
+                    t.lexpos = pos
+                    self.lexpos = pos = pos + 3
+                    self.lexstate = 'INITIAL'
+                    yield t
+
+                elif data.find('END', pos) == -1:
+                    self.lexpos = pos
+                    # same as PLY for unterminated MACRO
+                    if c not in self.literals:
+                        raise lex.LexError("Illegal character '%s' at index %d" % (c, pos), data[pos:])
+
+                    t = LexToken()
+                    t.type = t.value = c
+                    t.lineno = lineno
+                    t.lexpos = pos
+                    self.lexpos = pos = pos + 1
+                    yield t
+
+                else:
+                    pos = data.find('END', pos)
+
+            elif c == self.stateEnds[self.lexstate]:
+                pos += 1
+                self.lexstate = 'INITIAL'
+
+            else:
+                pos = data.find(self.stateEnds[self.lexstate], pos)
+                if pos == -1:
+                    pos = lexlen
+
+        # no token in INITIAL state
+        end = self.skipRe.match(data, pos).end()
+        self.lineno = lineno + _countLines(data[pos:end])
+        self.lexpos = end
+
+        if end < lexlen:
+            t = LexToken()
+            t.value = data[end:]
+            t.lineno = self.lineno
+            t.type = 'error'
+            t.lexpos = end
+            self.t_error(t)
+
+
 class SupportSmiV1Keywords(object):
     @staticmethod
     def reserved():
@@ -332,7 +510,34 @@ relaxedGrammar = {
 }
 
 
-def lexerFactory(**grammarOptions):
+lexerEngines = {
+    'ply': SmiV2Lexer,
+    'fast': FastSmiV2Lexer
+}
+
+_lexerClasses = {}  # k, v = lexer engine and enabled grammar options, lexer class
+_lexerClassesLock = threading.Lock()
+
+
+def lexerFactory(lexerEngine='ply', **grammarOptions):
+    if lexerEngine not in lexerEngines:
+        raise error.PySmiError('Unknown lexer engine: %s' % lexerEngine)
+
+    key = lexerEngine, frozenset([x for x in grammarOptions if grammarOptions[x]])
+
+    _lexerClassesLock.acquire()
+
+    try:
+        if key not in _lexerClasses:
+            _lexerClasses[key] = _makeLexerClass(grammarOptions, lexerEngine)
+
+        return _lexerClasses[key]
+
+    finally:
+        _lexerClassesLock.release()
+
+
+def _makeLexerClass(grammarOptions, lexerEngine='ply'):
     classAttr = {}
     for option in grammarOptions:
         if grammarOptions[option]:
@@ -345,4 +550,4 @@ def lexerFactory(**grammarOptions):
                 else:
                     classAttr[func.func_name] = func()
 
-    return type('SmiLexer', (SmiV2Lexer,), classAttr)
+    return type('SmiLexer', (lexerEngines[lexerEngine],), classAttr)
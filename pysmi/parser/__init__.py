@@ -1,4 +1,6 @@
 from pysmi.parser.smiv1 import SmiV1Parser
 from pysmi.parser.smiv1compat import SmiV1CompatParser, SmiStarParser
 from pysmi.parser.smiv2 import SmiV2Parser
-from pysmi.parser.null import NullParser
\ No newline at end of file
+from pysmi.parser.null import NullParser
+from pysmi.parser.cache import CachingParser
+from pysmi.parser.pool import ParserPool
@@ -7,6 +7,10 @@
 
 
 class AbstractParser(object):
+    def getSignature(self):
+        """Return a string identifying the kind of ASTs this parser produces."""
+        return self.__class__.__name__
+
     def reset(self):
         raise NotImplementedError()
 
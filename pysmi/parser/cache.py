@@ -0,0 +1,100 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+import os
+import sys
+import marshal
+import hashlib
+import tempfile
+from pysmi.parser.base import AbstractParser
+from pysmi.compat import encode
+from pysmi import __version__ as packageVersion
+from pysmi import debug
+
+
+class CachingParser(AbstractParser):
+    """Keep parsed ASN.1 MIBs in a local directory.
+
+    *CachingParser* wraps another parser object. Whenever the same
+    MIB text is parsed again with the same grammar, the AST is loaded
+    from cache file rather than produced by the wrapped parser.
+    """
+    suffix = os.path.extsep + 'ast'
+
+    def __init__(self, parser, path):
+        """Create an instance of *CachingParser*.
+
+           Args:
+               parser: ASN.1 MIB parser object to cache ASTs of
+               path (str): directory to store cached ASTs at
+        """
+        self._parser = parser
+        self._path = os.path.normpath(path)
+        self._salt = encode(repr((packageVersion, sys.version_info[:2], parser.getSignature())))
+
+    def __str__(self):
+        return '%s{"%s", %s}' % (self.__class__.__name__, self._path, self._parser)
+
+    def getSignature(self):
+        return self._parser.getSignature()
+
+    def getKey(self, data):
+        """Return cache key for MIB text parsed by wrapped parser."""
+        return hashlib.sha1(self._salt + encode(data)).hexdigest()
+
+    def reset(self):
+        self._parser.reset()
+
+    def parse(self, data, **kwargs):
+        astFile = os.path.join(self._path, self.getKey(data) + self.suffix)
+
+        try:
+            fp = open(astFile, 'rb')
+            try:
+                ast = marshal.load(fp)
+            finally:
+                fp.close()
+
+            debug.logger & debug.flagParser and debug.logger('AST loaded from %s' % astFile)
+
+            return ast
+
+        except (IOError, OSError):
+            pass
+
+        except (EOFError, ValueError, TypeError):
+            debug.logger & debug.flagParser and debug.logger(
+                'ignoring broken AST cache file %s: %s' % (astFile, sys.exc_info()[1]))
+
+        ast = self._parser.parse(data, **kwargs)
+
+        tfile = None
+
+        try:
+            if not os.path.isdir(self._path):
+                os.makedirs(self._path)
+
+            fd, tfile = tempfile.mkstemp(dir=self._path)
+            try:
+                os.write(fd, marshal.dumps(ast))
+            finally:
+                os.close(fd)
+
+            os.rename(tfile, astFile)
+
+        except (OSError, IOError, ValueError):
+            debug.logger & debug.flagParser and debug.logger(
+                'failure writing AST cache file %s: %s' % (astFile, sys.exc_info()[1]))
+            if tfile:
+                try:
+                    os.unlink(tfile)
+                except OSError:
+                    pass
+
+        else:
+            debug.logger & debug.flagParser and debug.logger('AST stored at %s' % astFile)
+
+        return ast
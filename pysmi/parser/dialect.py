@@ -27,3 +27,10 @@ smiV1Relaxed.update(
     curlyBracesAroundEnterpriseInTrap=True,
     noCells=True
 )
+
+# Dialects with parser tables pre-built into pysmi.parser.tables package
+tableModules = {
+    'smiv2': smiV2,
+    'smiv1': smiV1,
+    'smiv1relaxed': smiV1Relaxed
+}
@@ -0,0 +1,81 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+import threading
+from pysmi import debug
+
+
+class ParserPool(object):
+    """Keep ready-to-use parser objects for reuse.
+
+    Parser objects are costly to create and can't be used by more than
+    one thread at a time. *ParserPool* lets threads borrow idle parser
+    objects, creating new ones only when none is available.
+
+    Examples: ::
+
+        from pysmi.parser import SmiV1CompatParser, ParserPool
+
+        parserPool = ParserPool(SmiV1CompatParser)
+
+        parser = parserPool.acquire()
+        try:
+            mibCompiler = MibCompiler(parser, codegen, writer)
+            ...
+        finally:
+            parserPool.release(parser)
+
+    """
+
+    def __init__(self, parserClass, maxIdle=None, **options):
+        """Create an instance of *ParserPool*.
+
+           Args:
+               parserClass: parser class to instantiate
+           Keyword Args:
+               maxIdle (int): max number of idle parser objects to keep,
+                   no limit by default
+               options: parameters passed to parser class on instantiation
+        """
+        self._parserClass = parserClass
+        self._maxIdle = maxIdle
+        self._options = options
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return '%s{%s, %s idle}' % (self.__class__.__name__, self._parserClass.__name__, len(self._idle))
+
+    def acquire(self):
+        """Return parser object for exclusive use by caller.
+
+           Returns:
+               Parser object, should be given back by *release*
+        """
+        self._lock.acquire()
+        try:
+            if self._idle:
+                return self._idle.pop()
+        finally:
+            self._lock.release()
+
+        debug.logger & debug.flagParser and debug.logger('creating new parser object at %s' % self)
+
+        return self._parserClass(**self._options)
+
+    def release(self, parser):
+        """Give parser object back to the pool.
+
+           Args:
+               parser: parser object previously obtained from *acquire*
+        """
+        parser.reset()
+        self._lock.acquire()
+        try:
+            if self._maxIdle is None or len(self._idle) < self._maxIdle:
+                self._idle.append(parser)
+        finally:
+            self._lock.release()
@@ -0,0 +1,97 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+import re
+from pysmi.mibinfo import MibInfo
+from pysmi import debug
+
+
+class HeaderScanner(object):
+    """Extract MIB module headers from ASN.1 MIB text.
+
+    *HeaderScanner* looks up module names, IMPORTS clauses and
+    MODULE-IDENTITY OIDs by means of a few regular expressions rather
+    than parsing MIB text in full. That makes it suitable for quickly
+    learning dependencies among great many MIBs, though malformed MIBs
+    may slip through unnoticed.
+
+    Examples: ::
+
+        from pysmi.parser.scanner import HeaderScanner
+
+        for mibInfo in HeaderScanner().scan(mibText):
+            print(mibInfo.name, mibInfo.oid, mibInfo.imported)
+
+    """
+    # comments and quoted strings may contain just anything
+    noisePattern = re.compile(r'"[^"]*"|--[^\r\n]*')
+    # module name is looked up backwards from rare DEFINITIONS keyword
+    headerPattern = re.compile(r'DEFINITIONS\s*::=\s*BEGIN\b')
+    namePattern = re.compile(r'\b([A-Z][-A-Za-z0-9_]*)(?:\s*\{[^}]*\}\s*|\s+)$')
+    importsPattern = re.compile(r'\s*(?:EXPORTS\b[^;]*;\s*)?IMPORTS\b([^;]*);')
+    importPattern = re.compile(r'([^;]*?)\bFROM\s+([A-Z][-A-Za-z0-9_]*)')
+    identityPattern = re.compile(r'MODULE-IDENTITY\b[^{]*?::=\s*\{([^}]*)\}')
+    identityNamePattern = re.compile(r'\b([a-z][-A-Za-z0-9_]*)\s+$')
+    oidPattern = re.compile(r'[A-Za-z][-A-Za-z0-9_]*\s*\(\s*(\d+)\s*\)|([A-Za-z][-A-Za-z0-9_]*)|(\d+)')
+    identifierPattern = re.compile(r'[A-Za-z][-A-Za-z0-9_]*')
+    bracesPattern = re.compile(r'\{[^}]*\}')
+
+    def __str__(self):
+        return self.__class__.__name__
+
+    def scan(self, data):
+        """Return headers of MIB modules defined in ASN.1 MIB text.
+
+           Args:
+               data (str): ASN.1 MIB text
+
+           Returns:
+               A list of *MibInfo* objects, one per MIB module in order of
+               appearance, each carrying *name*, *identity* and *oid* of
+               MODULE-IDENTITY (*None* if missing) where *oid* is a tuple
+               of parent symbol names and numbers, *imports* as a dictionary
+               of module names (keys) and tuples of imported symbols (values)
+               and sorted *imported* module names.
+        """
+        data = self.noisePattern.sub('""', data)
+
+        headers = []
+
+        for m in self.headerPattern.finditer(data):
+            name = self.namePattern.search(data, max(0, m.start() - 512), m.start())
+            if name:
+                headers.append((name.start(), m.end(), name.group(1)))
+
+        mibInfos = []
+
+        for idx, (begin, start, name) in enumerate(headers):
+            end = idx + 1 < len(headers) and headers[idx + 1][0] or len(data)
+
+            imports = {}
+
+            m = self.importsPattern.match(data, start, end)
+            if m:
+                start = m.end()
+                for chunk, module in self.importPattern.findall(self.bracesPattern.sub('', m.group(1))):
+                    imports[module] = imports.get(module, ()) + tuple(self.identifierPattern.findall(chunk))
+
+            identity = oid = None
+
+            for m in self.identityPattern.finditer(data, start, end):
+                identity = self.identityNamePattern.search(data, max(start, m.start() - 256), m.start())
+                if identity:
+                    identity = identity.group(1)
+                    oid = tuple([name or int(number or plainNumber)
+                                 for number, name, plainNumber in self.oidPattern.findall(m.group(1))])
+                    break
+
+            mibInfos.append(MibInfo(name=name, identity=identity, oid=oid,
+                                    imports=imports, imported=tuple(sorted(imports))))
+
+        debug.logger & debug.flagParser and debug.logger(
+            'scanned MIB module(s) %s' % (', '.join([x.name for x in mibInfos]) or '<none>'))
+
+        return mibInfos
@@ -6,9 +6,13 @@
 #
 import os
 import sys
+import hashlib
+import threading
 import ply.yacc as yacc
 from pysmi.lexer.smi import lexerFactory
 from pysmi.parser.base import AbstractParser
+from pysmi.compat import encode
+from pysmi.parser import dialect
 from pysmi import error
 from pysmi import debug
 
@@ -16,8 +20,13 @@ from pysmi import debug
 # noinspection PyMethodMayBeStatic,PyIncorrectDocstring
 class SmiV2Parser(AbstractParser):
     defaultLexer = lexerFactory()
+    lexerEngine = 'ply'
+    grammarOptions = {}  # grammar relaxations this class is specialized for
+    tableModule = 'pysmi.parser.tables.smiv2'  # pre-built parser tables, if any
 
     def __init__(self, startSym='mibFile', tempdir=''):
+        self._initArgs = startSym, tempdir
+
         if tempdir:
             tempdir = os.path.join(tempdir, startSym)
             try:
@@ -41,14 +50,41 @@ class SmiV2Parser(AbstractParser):
         else:
             debuglogger = None
 
+        tabmodule = picklefile = None
+
+        if startSym == 'mibFile' and self.tableModule:
+            try:
+                __import__(self.tableModule)
+            except ImportError:
+                debug.logger & debug.flagParser and debug.logger(
+                    'pre-built parser tables %s not available' % self.tableModule)
+            else:
+                tabmodule = self.tableModule
+
+        if not tabmodule and tempdir:
+            picklefile = os.path.join(
+                tempdir, 'parsetab-%s.pickle' % hashlib.sha1(encode(self.getSignature())).hexdigest()[:16]
+            )
+
         self.parser = yacc.yacc(module=self,
                                 start=startSym,
-                                write_tables=bool(tempdir),
+                                tabmodule=tabmodule or 'parsetab',
+                                picklefile=picklefile,
+                                write_tables=False,
                                 debug=False,
                                 outputdir=tempdir,
                                 debuglog=debuglogger,
                                 errorlog=logger)
 
+    def __reduce__(self):
+        # specialized parser classes are produced at run time by
+        # parserFactory and can't be pickled by reference
+        return rebuildParser, (self.grammarOptions,) + self._initArgs + (self.lexerEngine,)
+
+    def getSignature(self):
+        return repr((self.__class__.__name__, self._initArgs[0],
+                     sorted([x for x in self.grammarOptions if self.grammarOptions[x]])))
+
     def reset(self):
         # Ply requires lexer reinitialization for (at least) resetting lineno
         self.lexer.reset()
@@ -1407,11 +1443,21 @@ relaxedGrammar = {
 }
 
 
-def parserFactory(**grammarOptions):
+_parserClasses = {}  # k, v = lexer engine and enabled grammar options, parser class
+_parserClassesLock = threading.Lock()
+
+
+def parserFactory(lexerEngine='ply', **grammarOptions):
     """Factory function producing custom specializations of base *SmiV2Parser*
        class.
 
+       Specialized classes are cached so that calls with the same set of
+       enabled grammar relaxations return the same class.
+
        Keyword Args:
+           lexerEngine (str): lexer implementation to use, either PLY-based
+                              'ply' (default) or 'fast' producing identical
+                              token stream
            grammarOptions: a list of (bool) typed optional keyword parameters
                            enabling particular set of SMIv2 grammar relaxations.
 
@@ -1437,6 +1483,21 @@ def parserFactory(**grammarOptions):
        >>> SmiV1Parser = smi.parserFactory(supportSmiV1Keywords=True, supportIndex=True)
 
     """
+    key = lexerEngine, frozenset([x for x in grammarOptions if grammarOptions[x]])
+
+    _parserClassesLock.acquire()
+
+    try:
+        if key not in _parserClasses:
+            _parserClasses[key] = _makeParserClass(grammarOptions, lexerEngine)
+
+        return _parserClasses[key]
+
+    finally:
+        _parserClassesLock.release()
+
+
+def _makeParserClass(grammarOptions, lexerEngine='ply'):
     classAttr = {}
     for option in grammarOptions:
         if grammarOptions[option]:
@@ -1449,6 +1510,52 @@ def parserFactory(**grammarOptions):
                 else:
                     classAttr[func.func_name] = func
 
-    classAttr['defaultLexer'] = lexerFactory(**grammarOptions)
+    classAttr['defaultLexer'] = lexerFactory(lexerEngine, **grammarOptions)
+    classAttr['lexerEngine'] = lexerEngine
+    classAttr['grammarOptions'] = dict(grammarOptions)
+    classAttr['tableModule'] = None
+
+    enabledOptions = set([x for x in grammarOptions if grammarOptions[x]])
+
+    for name in dialect.tableModules:
+        dialectOptions = dialect.tableModules[name]
+        if set([x for x in dialectOptions if dialectOptions[x]]) == enabledOptions:
+            classAttr['tableModule'] = 'pysmi.parser.tables.' + name
 
     return type('SmiParser', (SmiV2Parser,), classAttr)
+
+
+def buildTables(outputdir):
+    """Write parser tables of standard grammar dialects as Python modules.
+
+       Parser objects look up their tables at *pysmi.parser.tables*
+       package, what spares LALR tables generation on each start.
+
+       Args:
+           outputdir (str): directory to write table modules into
+
+       Returns:
+           A list of table module names written
+    """
+    names = []
+    for name in sorted(dialect.tableModules):
+        # make sure tables are not loaded but generated, only the last
+        # component of tabmodule is used for output file name
+        yacc.yacc(module=parserFactory(**dialect.tableModules[name])(),
+                  start='mibFile',
+                  tabmodule='pysmi_tables_not_importable.' + name,
+                  write_tables=True,
+                  debug=False,
+                  outputdir=outputdir,
+                  errorlog=yacc.NullLogger())
+        names.append(name)
+    return names
+
+
+def rebuildParser(grammarOptions, startSym='mibFile', tempdir='', lexerEngine='ply'):
+    """Re-create parser object specialized for given grammar.
+
+       Used for unpickling parser objects, e.g. when passing them over
+       to worker processes.
+    """
+    return parserFactory(lexerEngine, **grammarOptions)(startSym=startSym, tempdir=tempdir)
@@ -0,0 +1,9 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+# Pre-built parser tables for standard grammar dialects get written
+# into this package at build time (see pysmi.parser.smi.buildTables).
+#
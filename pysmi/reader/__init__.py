@@ -2,4 +2,6 @@ from pysmi.reader.callback import CallbackReader
 from pysmi.reader.ftpclient import FtpReader
 from pysmi.reader.httpclient import HttpReader
 from pysmi.reader.localfile import FileReader
-from pysmi.reader.url import getReadersFromUrls
\ No newline at end of file
+from pysmi.reader.archive import ZipReader, TarReader
+from pysmi.reader.cache import CachingReader, NegativeCache
+from pysmi.reader.url import getReadersFromUrls
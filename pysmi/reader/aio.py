@@ -0,0 +1,225 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+# Asynchronous readers, requires Python 3.5+ with asyncio.
+#
+import sys
+import asyncio
+import functools
+from pysmi.reader.base import AbstractReader
+from pysmi.reader.localfile import FileReader
+from pysmi.reader.httpclient import HttpReader
+from pysmi.reader.ftpclient import FtpReader
+from pysmi.reader.url import getReadersFromUrls
+from pysmi.codegen.symtable import SymtableCodeGen
+from pysmi.parser.scanner import HeaderScanner
+from pysmi.compat import decode
+from pysmi import error
+from pysmi import debug
+
+
+class AsyncReader(object):
+    """Fetch ASN.1 MIB text by name from within asyncio event loop.
+
+    *AsyncReader* is an asynchronous front end to a regular (blocking)
+    reader object. Its *getData* coroutine runs reader's *getData* in
+    event loop's executor, so that as many as *maxWorkers* MIBs can be
+    fetched from the same source concurrently.
+
+    Examples: ::
+
+        from pysmi.reader.aio import AsyncReader
+        from pysmi.reader.httpclient import HttpReader
+
+        reader = AsyncReader(HttpReader('mibs.snmplabs.com', 80, '/asn1/@mib@'))
+
+        mibInfo, mibData = await reader.getData('IF-MIB')
+
+    """
+    maxWorkers = 8
+
+    def __init__(self, reader, executor=None):
+        """Create an instance of *AsyncReader*.
+
+           Args:
+               reader: blocking reader object to run
+
+           Keyword Args:
+               executor: *concurrent.futures.Executor* to run reader
+                   in, event loop's default executor if *None*
+        """
+        self.reader = reader
+        self._executor = executor
+        self._semaphore = None
+
+    def __str__(self):
+        return '%s{%s}' % (self.__class__.__name__, self.reader)
+
+    def setOptions(self, **kwargs):
+        self.reader.setOptions(**kwargs)
+        return self
+
+    async def getData(self, mibname):
+        """Fetch ASN.1 MIB text by name.
+
+           Args:
+               mibname (str): MIB name
+
+           Returns:
+               A tuple of *MibInfo* object and ASN.1 MIB text
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.maxWorkers)
+
+        async with self._semaphore:
+            return await asyncio.get_event_loop().run_in_executor(
+                self._executor, functools.partial(self.reader.getData, mibname))
+
+
+class AsyncFileReader(AsyncReader):
+    """Asynchronous variant of *FileReader*."""
+
+    def __init__(self, path, recursive=True, ignoreErrors=True, executor=None):
+        AsyncReader.__init__(self, FileReader(path, recursive, ignoreErrors), executor)
+
+
+class AsyncHttpReader(AsyncReader):
+    """Asynchronous variant of *HttpReader*.
+
+    Concurrent requests share *HttpReader* pool of persistent
+    connections.
+    """
+
+    def __init__(self, host, port, locationTemplate, timeout=5, ssl=False, executor=None):
+        AsyncReader.__init__(self, HttpReader(host, port, locationTemplate, timeout, ssl), executor)
+
+
+class AsyncFtpReader(AsyncReader):
+    """Asynchronous variant of *FtpReader*.
+
+    Requests are served one at a time over *FtpReader* FTP session.
+    """
+
+    def __init__(self, host, locationTemplate, timeout=5, ssl=False, port=21,
+                 user='anonymous', password='anonymous@', executor=None):
+        AsyncReader.__init__(self, FtpReader(host, locationTemplate, timeout, ssl, port, user, password), executor)
+
+
+def getAsyncReadersFromUrls(*sourceUrls, **options):
+    """Return asynchronous readers for MIB source URLs.
+
+       Takes the same arguments as *getReadersFromUrls*.
+    """
+    return [AsyncReader(reader) for reader in getReadersFromUrls(*sourceUrls, **options)]
+
+
+class PrefetchedReader(AbstractReader):
+    """Serve ASN.1 MIB texts fetched in advance by *fetchMibs*.
+
+    MIBs known to be missing are reported missing right away, MIBs
+    not fetched in advance are looked up through given readers.
+    """
+
+    def __init__(self, fetched, *readers):
+        """Create an instance of *PrefetchedReader*.
+
+           Args:
+               fetched (dict): MIB names (keys) and *(MibInfo, MIB text)*
+                   tuples, *None* or *PySmiError* exceptions (values) as
+                   returned by *fetchMibs*
+               readers: blocking reader objects for MIBs not fetched
+        """
+        self._fetched = fetched
+        self._readers = readers
+
+    def __str__(self):
+        return '%s{%s MIBs}' % (self.__class__.__name__, len(self._fetched))
+
+    def getData(self, mibname):
+        mibname = decode(mibname)
+
+        if mibname not in self._fetched:
+            debug.logger & debug.flagReader and debug.logger('MIB %s was not prefetched' % mibname)
+
+            for reader in self._readers:
+                try:
+                    return reader.getData(mibname)
+
+                except error.PySmiReaderFileNotFoundError:
+                    continue
+
+            raise error.PySmiReaderFileNotFoundError('source MIB %s not found' % mibname, reader=self)
+
+        result = self._fetched[mibname]
+
+        if result is None:
+            raise error.PySmiReaderFileNotFoundError('source MIB %s not found' % mibname, reader=self)
+
+        if isinstance(result, error.PySmiError):
+            raise result
+
+        return result
+
+
+async def fetchMibs(sources, *mibnames):
+    """Fetch ASN.1 MIBs along with all MIBs they import.
+
+       MIBs are fetched concurrently: as soon as ASN.1 MIB text arrives,
+       its module headers are scanned and the MIBs it imports are
+       requested right away, without waiting for MIB text to be parsed.
+
+       Args:
+           sources: *AsyncReader* objects to try in order
+           mibnames: names of MIBs to fetch
+
+       Returns:
+           A dictionary of MIB names (keys) and *(MibInfo, MIB text)*
+           tuples, *None* if MIB is missing or *PySmiError* exception
+           if source failed (values)
+    """
+    scanner = HeaderScanner()
+
+    async def fetch(mibname):
+        for source in sources:
+            try:
+                return await source.getData(mibname)
+
+            except error.PySmiReaderFileNotFoundError:
+                continue
+
+            except error.PySmiError:
+                debug.logger & debug.flagReader and debug.logger(
+                    'error from %s: %s' % (source, sys.exc_info()[1]))
+                return sys.exc_info()[1]
+
+    fetched = {}
+    tasks = {}  # k, v = future, MIB name
+
+    def schedule(mibnames):
+        for mibname in mibnames:
+            if mibname not in fetched and mibname not in tasks.values():
+                tasks[asyncio.ensure_future(fetch(mibname))] = mibname
+
+    schedule(mibnames)
+
+    while tasks:
+        done, pending = await asyncio.wait(list(tasks), return_when=asyncio.FIRST_COMPLETED)
+
+        for task in done:
+            mibname = tasks.pop(task)
+
+            fetched[mibname] = result = task.result()
+
+            if result is None or isinstance(result, error.PySmiError):
+                continue
+
+            for mibInfo in scanner.scan(result[1]):
+                schedule(SymtableCodeGen.getImportedModules(mibInfo.imports))
+
+    debug.logger & debug.flagReader and debug.logger(
+        'fetched %s MIBs, %s missing' % (len(fetched), len([x for x in fetched if fetched[x] is None])))
+
+    return fetched
@@ -0,0 +1,257 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+import os
+import sys
+import time
+import tarfile
+import zipfile
+import posixpath
+import threading
+from pysmi.reader.base import AbstractReader
+from pysmi.mibinfo import MibInfo
+from pysmi.compat import decode
+from pysmi import error
+from pysmi import debug
+
+
+class ArchiveReader(AbstractReader):
+    """Fetch ASN.1 MIB text by name from archive file.
+
+    *ArchiveReader* subclass instance looks up ASN.1 MIB files by name
+    among archive members and returns their contents to caller. Archive
+    members are indexed by file name once (and once again whenever archive
+    file changes), then read on demand without extracting them to disk.
+
+    Members in top-level archive directories are preferred over the ones
+    in subdirectories.
+    """
+    scheme = None
+
+    def __init__(self, path, ignoreErrors=True):
+        """Create an instance of *ArchiveReader* serving an archive file.
+
+           Args:
+               path (str): archive file to search MIB files in
+           Keyword Args:
+               ignoreErrors (bool): ignore archive access errors
+        """
+        self._path = os.path.normpath(path)
+        self._ignoreErrors = ignoreErrors
+        self._archive = None
+        self._mtime = None
+        self._fileIndex = None  # k, v = lowercased file name, [(depth, member name, member, mtime), ...]
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return '%s{"%s"}' % (self.__class__.__name__, self._path)
+
+    def _openArchive(self):
+        raise NotImplementedError()
+
+    def _getMembers(self, archive):
+        """Return *(member name, member, mtime)* tuples of archived files."""
+        raise NotImplementedError()
+
+    def _readMember(self, archive, member):
+        raise NotImplementedError()
+
+    def close(self):
+        """Close archive file."""
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+            self._fileIndex = None
+
+    def getFileIndex(self):
+        """Return case-insensitive index of files in served archive.
+
+           The index is built once by listing archive members and rebuilt
+           whenever modification time of archive file changes.
+
+           Returns:
+               A dictionary of lowercased file names (keys) and lists of
+               *(directory depth, member name, member, mtime)* tuples
+               (values) sorted in search order.
+        """
+        try:
+            mtime = os.stat(self._path).st_mtime
+        except OSError:
+            mtime = None
+
+        if self._fileIndex is not None and mtime == self._mtime:
+            return self._fileIndex
+
+        self.close()
+
+        fileIndex = {}
+
+        archive = None
+
+        try:
+            archive = self._openArchive()
+            members = self._getMembers(archive)
+
+        except (OSError, IOError, zipfile.BadZipfile, tarfile.TarError):
+            debug.logger & debug.flagReader and debug.logger(
+                'archive %s open failure: %s' % (self._path, sys.exc_info()[1]))
+            if archive is not None:
+                archive.close()
+            if not self._ignoreErrors:
+                raise error.PySmiError('archive %s access error: %s' % (self._path, sys.exc_info()[1]))
+
+        else:
+            for name, member, memberMtime in members:
+                name = decode(name)
+                filename = posixpath.basename(name)
+                if not filename:
+                    continue
+                fileIndex.setdefault(filename.lower(), []).append(
+                    (name.strip('/').count('/'), name, member, memberMtime))
+
+            for entries in fileIndex.values():
+                entries.sort(key=lambda x: x[:2])
+
+            self._archive = archive
+
+            debug.logger & debug.flagReader and debug.logger(
+                'indexed %s files in %s' % (len(fileIndex), self._path))
+
+        self._mtime = mtime
+        self._fileIndex = fileIndex
+
+        return fileIndex
+
+    def findFile(self, mibname):
+        fileIndex = self.getFileIndex()
+        found = None
+        for idx, (mibalias, mibfile) in enumerate(self.getMibVariants(mibname)):
+            mibfile = decode(mibfile)
+            for depth, name, member, mtime in fileIndex.get(mibfile.lower(), ()):
+                key = depth, idx, posixpath.basename(name) != mibfile
+                if found is None or key < found[0]:
+                    found = key, mibalias, name, member, mtime
+
+        if found:
+            return found[1:]
+
+    def getData(self, mibname):
+        mibname = decode(mibname)
+
+        debug.logger & debug.flagReader and debug.logger('looking for MIB %s in %s' % (mibname, self._path))
+
+        self._lock.acquire()
+
+        try:
+            found = self.findFile(mibname)
+            if found:
+                mibalias, name, member, mtime = found
+                debug.logger & debug.flagReader and debug.logger(
+                    'found MIB %s in %s member %s' % (mibname, self._path, name))
+                try:
+                    debug.logger & debug.flagReader and debug.logger(
+                        'source MIB %s mtime is %s, fetching data...' % (
+                            name, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(mtime))))
+                    mibData = self._readMember(self._archive, member)
+                    if len(mibData) == self.maxMibSize:
+                        raise IOError('MIB %s too large' % name)
+                    return MibInfo(path='%s://%s/%s' % (self.scheme, self._path, name.lstrip('/')),
+                                   file=posixpath.basename(name), name=mibalias, mtime=mtime), decode(mibData)
+                except (OSError, IOError, zipfile.BadZipfile, tarfile.TarError):
+                    debug.logger & debug.flagReader and debug.logger(
+                        'archive %s member %s read failure: %s' % (self._path, name, sys.exc_info()[1]))
+                    if not self._ignoreErrors:
+                        raise error.PySmiError('archive %s member %s access error: %s' % (
+                            self._path, name, sys.exc_info()[1]))
+
+                raise error.PySmiReaderFileNotModifiedError('source MIB %s is older than needed' % name, reader=self)
+
+        finally:
+            self._lock.release()
+
+        raise error.PySmiReaderFileNotFoundError('source MIB %s not found' % mibname, reader=self)
+
+
+class ZipReader(ArchiveReader):
+    """Fetch ASN.1 MIB text by name from ZIP archive.
+
+    Examples: ::
+
+        from pysmi.reader.archive import ZipReader
+
+        reader = ZipReader('/tmp/vendor-mibs.zip')
+
+        mibInfo, mibData = reader.getData('IF-MIB')
+
+    """
+    scheme = 'zip'
+
+    def _openArchive(self):
+        return zipfile.ZipFile(self._path)
+
+    def _getMembers(self, archive):
+        # ZIP times are local
+        return [(x.filename, x, time.mktime(x.date_time + (0, 0, -1)))
+                for x in archive.infolist() if not x.filename.endswith('/')]
+
+    def _readMember(self, archive, member):
+        fp = archive.open(member)
+        try:
+            return fp.read(self.maxMibSize)
+        finally:
+            fp.close()
+
+
+class TarReader(ArchiveReader):
+    """Fetch ASN.1 MIB text by name from tar archive.
+
+    Uncompressed as well as gzip, bzip2 (and xz, if supported by
+    Python) compressed tar archives are served. Reading members of
+    compressed archive out of order involves decompressing it from
+    the beginning, so compressed archives are decompressed once, in
+    a single pass, while being indexed and their members (up to
+    *maxMibSize* bytes each) are kept in memory.
+
+    Examples: ::
+
+        from pysmi.reader.archive import TarReader
+
+        reader = TarReader('/tmp/vendor-mibs.tar.gz')
+
+        mibInfo, mibData = reader.getData('IF-MIB')
+
+    """
+    scheme = 'tar'
+
+    compressed = False  # whether served archive is compressed
+
+    def _openArchive(self):
+        try:
+            archive = tarfile.open(self._path, 'r:')
+            self.compressed = False
+
+        except tarfile.ReadError:
+            archive = tarfile.open(self._path, 'r:*')
+            self.compressed = True
+
+        return archive
+
+    def _getMembers(self, archive):
+        if self.compressed:
+            # members' contents, read in archive order
+            return [(x.name, self._readMember(archive, x), x.mtime) for x in archive if x.isfile()]
+
+        return [(x.name, x, x.mtime) for x in archive.getmembers() if x.isfile()]
+
+    def _readMember(self, archive, member):
+        if isinstance(member, bytes):
+            return member
+
+        fp = archive.extractfile(member)
+        try:
+            return fp.read(self.maxMibSize)
+        finally:
+            fp.close()
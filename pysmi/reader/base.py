@@ -9,6 +9,7 @@ import os
 
 class AbstractReader(object):
     maxMibSize = 10000000  # MIBs can't be that large
+    remote = False  # MIBs are fetched over network
     fuzzyMatching = True  # try different file names while searching for MIB
     originalMatching = uppercaseMatching = lowcaseMatching = True
     exts = ['',
@@ -0,0 +1,395 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+import os
+import sys
+import time
+import marshal
+import hashlib
+import tempfile
+from pysmi.reader.base import AbstractReader
+from pysmi.mibinfo import MibInfo
+from pysmi.compat import decode, encode
+from pysmi import error
+from pysmi import debug
+
+
+def _loadFile(path):
+    try:
+        fp = open(path, 'rb')
+        try:
+            return marshal.load(fp)
+        finally:
+            fp.close()
+
+    except (IOError, OSError):
+        pass
+
+    except (EOFError, ValueError, TypeError):
+        debug.logger & debug.flagReader and debug.logger(
+            'ignoring broken cache file %s: %s' % (path, sys.exc_info()[1]))
+
+
+def _storeFile(path, value):
+    directory = os.path.dirname(path)
+
+    tfile = None
+
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        fd, tfile = tempfile.mkstemp(dir=directory)
+        try:
+            os.write(fd, marshal.dumps(value))
+        finally:
+            os.close(fd)
+
+        os.rename(tfile, path)
+
+    except (OSError, IOError, ValueError):
+        debug.logger & debug.flagReader and debug.logger(
+            'failure writing cache file %s: %s' % (path, sys.exc_info()[1]))
+        if tfile:
+            try:
+                os.unlink(tfile)
+            except OSError:
+                pass
+
+
+class ValidatorCache(object):
+    """Keep HTTP validators of fetched MIBs in a local directory.
+
+    Meant to replace in-memory *validatorCache* of *HttpReader* so that
+    conditional requests can be made across runs.
+    """
+    suffix = os.path.extsep + 'val'
+
+    def __init__(self, path, salt=''):
+        """Create an instance of *ValidatorCache*.
+
+           Args:
+               path (str): directory to store validators at
+
+           Keyword Args:
+               salt (str): distinguishes validators of different readers
+        """
+        self._path = os.path.normpath(path)
+        self._salt = encode(salt)
+
+    def _getFile(self, location):
+        return os.path.join(self._path, hashlib.sha1(self._salt + encode(location)).hexdigest() + self.suffix)
+
+    def get(self, location, default=None):
+        value = _loadFile(self._getFile(location))
+        if value is None:
+            return default
+        return tuple(value)
+
+    def __setitem__(self, location, value):
+        _storeFile(self._getFile(location), value)
+
+
+class CachingReader(AbstractReader):
+    """Keep ASN.1 MIB texts fetched by another reader in a local directory.
+
+    *CachingReader* wraps another (typically remote) reader object.
+    MIB texts it fetches are served from cache for *maxAge* seconds,
+    MIBs it could not find are reported missing for *maxMissingAge*
+    seconds without asking the wrapped reader. Stale MIB texts are
+    served should the wrapped reader fail otherwise than by not finding
+    the MIB, and are kept should it not find the MIB.
+
+    Validators of wrapped *HttpReader* are kept in the same directory,
+    so expired MIB texts are only downloaded again if changed.
+
+    Cache files not used for *maxCacheAge* seconds are removed, then
+    the least recently used ones are removed to keep cache files
+    under *maxCacheSize* bytes. Files not created by the cache are
+    never removed.
+    """
+    maxAge = 86400
+    maxMissingAge = 86400
+    maxCacheAge = 86400 * 30
+    maxCacheSize = 64 * 1024 * 1024
+
+    suffix = os.path.extsep + 'mib'
+
+    def __init__(self, reader, path):
+        """Create an instance of *CachingReader*.
+
+           Args:
+               reader: reader object to cache MIBs of
+               path (str): directory to store cached MIBs at
+        """
+        self._reader = reader
+        self._path = os.path.normpath(path)
+        self._evicted = False
+        if hasattr(reader, 'validatorCache'):
+            reader.validatorCache = ValidatorCache(self._path, str(reader))
+
+    def __str__(self):
+        return '%s{"%s", %s}' % (self.__class__.__name__, self._path, self._reader)
+
+    @property
+    def remote(self):
+        return self._reader.remote
+
+    def setOptions(self, **kwargs):
+        self._reader.setOptions(**kwargs)
+        for k in kwargs:
+            if hasattr(self.__class__, k):
+                setattr(self, k, kwargs[k])
+        return self
+
+    def getKey(self, mibname):
+        """Return cache key for MIB fetched by wrapped reader."""
+        return hashlib.sha1(
+            encode(repr((str(self._reader), tuple(getattr(self._reader, 'exts', ())), decode(mibname))))
+        ).hexdigest()
+
+    def evict(self):
+        """Remove cache files unused for too long or beyond size limit.
+
+           Only MIB and validator cache files are considered, other files
+           in cache directory are left alone.
+        """
+        now = time.time()
+
+        files = []
+
+        try:
+            for filename in os.listdir(self._path):
+                if not filename.endswith((self.suffix, ValidatorCache.suffix)):
+                    continue
+                f = os.path.join(self._path, filename)
+                try:
+                    stat = os.stat(f)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, f))
+
+        except OSError:
+            return
+
+        files.sort()
+
+        totalSize = sum([x[1] for x in files])
+
+        evicted = 0
+
+        for mtime, size, f in files:
+            if mtime > now - self.maxCacheAge and totalSize <= self.maxCacheSize:
+                break
+            try:
+                os.unlink(f)
+            except OSError:
+                continue
+            totalSize -= size
+            evicted += 1
+
+        debug.logger & debug.flagReader and debug.logger(
+            'evicted %s of %s files from %s, %s bytes left' % (evicted, len(files), self._path, totalSize))
+
+    def getData(self, mibname):
+        mibname = decode(mibname)
+
+        if not self._evicted:
+            self._evicted = True
+            self.evict()
+
+        cacheFile = os.path.join(self._path, self.getKey(mibname) + self.suffix)
+
+        entry = _loadFile(cacheFile)
+
+        now = time.time()
+
+        if entry:
+            if entry.get('missing'):
+                if entry['fetched'] > now - self.maxMissingAge:
+                    debug.logger & debug.flagReader and debug.logger(
+                        'MIB %s known to be missing at %s' % (mibname, self._reader))
+                    raise error.PySmiReaderFileNotFoundError(
+                        'source MIB %s not found (cached)' % mibname, reader=self)
+
+            elif entry['fetched'] > now - self.maxAge:
+                debug.logger & debug.flagReader and debug.logger('MIB %s served from %s' % (mibname, cacheFile))
+                try:
+                    os.utime(cacheFile, None)
+                except OSError:
+                    pass
+                return MibInfo(**entry['mibInfo']), entry['data']
+
+        try:
+            mibInfo, mibData = self._reader.getData(mibname)
+
+        except error.PySmiReaderFileNotFoundError:
+            # do not lose MIB text for a miss that might be transient
+            if not entry or entry.get('missing'):
+                _storeFile(cacheFile, {'fetched': now, 'missing': True})
+            raise
+
+        except error.PySmiError:
+            if not entry or entry.get('missing'):
+                raise
+            debug.logger & debug.flagReader and debug.logger(
+                'serving stale MIB %s from %s: %s' % (mibname, cacheFile, sys.exc_info()[1]))
+            return MibInfo(**entry['mibInfo']), entry['data']
+
+        _storeFile(cacheFile, {'fetched': now, 'mibInfo': dict(mibInfo.__dict__), 'data': mibData})
+
+        debug.logger & debug.flagReader and debug.logger('MIB %s cached at %s' % (mibname, cacheFile))
+
+        return mibInfo, mibData
+
+
+class NegativeCache(object):
+    """Remember which MIBs could not be found by which readers.
+
+    *MibCompiler* consults the cache before asking a remote source or
+    borrower for a MIB, so MIBs found missing by a remote reader are not
+    looked up by that reader again for *ttl* seconds. Local readers see
+    MIBs added to their directories right away, so their misses are
+    not recorded.
+
+    The cache is kept in *cacheFile* file in a local directory, each
+    line holding the time MIB was found missing, MIB name and reader.
+    """
+    ttl = 86400
+    cacheFile = 'missing'
+
+    def __init__(self, path):
+        """Create an instance of *NegativeCache*.
+
+           Args:
+               path (str): directory to keep the cache at
+        """
+        self._path = os.path.normpath(path)
+        self._file = os.path.join(self._path, self.cacheFile)
+        self._entries = None  # k, v = (reader, MIB name), time found missing
+        self._pending = {}  # k, v = (reader, MIB name), time found missing or None if found
+
+    def __str__(self):
+        return '%s{"%s"}' % (self.__class__.__name__, self._file)
+
+    def setOptions(self, **kwargs):
+        for k in kwargs:
+            setattr(self, k, kwargs[k])
+        return self
+
+    def _load(self):
+        entries = {}
+
+        try:
+            fp = open(self._file, 'rb')
+            try:
+                for line in decode(fp.read()).split('\n'):
+                    entry = line.split('\t')
+                    if len(entry) != 3:
+                        continue
+                    try:
+                        entries[(entry[2], entry[1])] = float(entry[0])
+                    except ValueError:
+                        continue
+            finally:
+                fp.close()
+
+        except (IOError, OSError):
+            pass
+
+        debug.logger & debug.flagReader and debug.logger('loaded %s, %s entries' % (self, len(entries)))
+
+        return entries
+
+    def isMissing(self, reader, mibname):
+        """Tell whether reader is known not to find a MIB.
+
+           Args:
+               reader: reader or borrower object
+               mibname (str): MIB name
+
+           Returns:
+               *True* if reader has not found the MIB within *ttl* seconds
+        """
+        if self._entries is None:
+            self._entries = self._load()
+
+        return self._entries.get((str(reader), decode(mibname)), 0) > time.time() - self.ttl
+
+    def setMissing(self, reader, mibname, missing=True):
+        """Record that reader has (not) found a MIB.
+
+           Updates are kept in memory until *flush* is called.
+
+           Args:
+               reader: reader or borrower object
+               mibname (str): MIB name
+
+           Keyword Args:
+               missing (bool): *False* if the MIB has been found
+        """
+        if self._entries is None:
+            self._entries = self._load()
+
+        key = str(reader), decode(mibname)
+
+        if missing:
+            self._pending[key] = self._entries[key] = time.time()
+
+        elif key in self._entries:
+            self._pending[key] = None
+            del self._entries[key]
+
+    def flush(self):
+        """Store recorded updates in the cache file.
+
+           Entries stored by others since the cache was loaded are
+           preserved unless updated here, expired entries are dropped.
+        """
+        if not self._pending:
+            return
+
+        entries = self._load()
+
+        for key in self._pending:
+            if self._pending[key] is None:
+                entries.pop(key, None)
+            else:
+                entries[key] = self._pending[key]
+
+        now = time.time()
+
+        lines = ['%r\t%s\t%s\n' % (entries[key], key[1], key[0])
+                 for key in sorted(entries) if entries[key] > now - self.ttl]
+
+        tfile = None
+
+        try:
+            if not os.path.isdir(self._path):
+                os.makedirs(self._path)
+
+            fd, tfile = tempfile.mkstemp(dir=self._path)
+            try:
+                os.write(fd, encode(''.join(lines)))
+            finally:
+                os.close(fd)
+
+            os.rename(tfile, self._file)
+
+        except (OSError, IOError):
+            debug.logger & debug.flagReader and debug.logger(
+                'failure writing %s: %s' % (self, sys.exc_info()[1]))
+            if tfile:
+                try:
+                    os.unlink(tfile)
+                except OSError:
+                    pass
+
+        else:
+            debug.logger & debug.flagReader and debug.logger('stored %s, %s entries' % (self, len(lines)))
+
+            self._entries = entries
+            self._pending.clear()
@@ -6,6 +6,9 @@
 #
 import sys
 import time
+import calendar
+import posixpath
+import threading
 import ftplib
 from pysmi.reader.base import AbstractReader
 from pysmi.mibinfo import MibInfo
@@ -18,7 +21,13 @@ class FtpReader(AbstractReader):
     """Fetch ASN.1 MIB text by name from FTP server.
        *FtpReader* class instance tries to download ASN.1 MIB files
        by name and return their contents to caller.
+
+       A single FTP session is kept open and reused for all MIBs. Each
+       directory listing is kept for *maxListingAge* seconds and only
+       files present in the listing are retrieved.
     """
+    maxListingAge = 60  # seconds before directory is listed again
+    remote = True
 
     def __init__(self, host, locationTemplate, timeout=5, ssl=False, port=21,
                  user='anonymous', password='anonymous@'):
@@ -42,13 +51,24 @@ class FtpReader(AbstractReader):
         self._port = port
         self._user = user
         self._password = password
+        self._conn = None
+        self._lock = threading.Lock()
+        self._listings = {}  # k, v = directory, (time listed, {file name: mtime or None} or None if can't list)
         if '@mib@' not in locationTemplate:
             raise error.PySmiError('@mib@ placeholder not specified in location at %s' % self)
 
     def __str__(self):
         return '%s{"ftp://%s%s"}' % (self.__class__.__name__, self._host, self._locationTemplate)
 
-    def getData(self, mibname):
+    @staticmethod
+    def _parseTime(timestamp):
+        # MDTM and MLSD times are UTC, fractions of second are optional
+        return calendar.timegm(time.strptime(timestamp[:14], "%Y%m%d%H%M%S"))
+
+    def _getConnection(self):
+        if self._conn is not None:
+            return self._conn
+
         if self._ssl:
             conn = ftplib.FTP_TLS()
         else:
@@ -57,53 +77,167 @@ class FtpReader(AbstractReader):
         try:
             conn.connect(self._host, self._port, self._timeout)
         except ftplib.all_errors:
-            raise error.PySmiReaderFileNotFoundError(
+            raise error.PySmiReaderError(
                 'failed to connect to FTP server %s:%s: %s' % (self._host, self._port, sys.exc_info()[1]), reader=self)
 
         try:
             conn.login(self._user, self._password)
         except ftplib.all_errors:
             conn.close()
-            raise error.PySmiReaderFileNotFoundError('failed to log in to FTP server %s:%s as %s/%s: %s' % (
-            self._host, self._port, self._user, self._password, sys.exc_info()[1]), reader=self)
+            raise error.PySmiReaderError('failed to log in to FTP server %s:%s as %s/%s: %s' % (
+                self._host, self._port, self._user, self._password, sys.exc_info()[1]), reader=self)
 
-        mibname = decode(mibname)
+        debug.logger & debug.flagReader and debug.logger(
+            'FTP session to %s:%s as %s established' % (self._host, self._port, self._user))
 
-        debug.logger & debug.flagReader and debug.logger('looking for MIB %s' % mibname)
+        self._conn = conn
 
-        for mibalias, mibfile in self.getMibVariants(mibname):
-            location = self._locationTemplate.replace('@mib@', mibfile)
-            mtime = time.time()
-            debug.logger & debug.flagReader and debug.logger(
-                'trying to fetch MIB %s from %s:%s' % (location, self._host, self._port))
-            data = []
+        return conn
+
+    def close(self):
+        """Close FTP session."""
+        if self._conn is not None:
             try:
-                try:
-                    response = conn.sendcmd('MDTM %s' % location)
-                except ftplib.all_errors:
-                    debug.logger & debug.flagReader and debug.logger(
-                        'server %s:%s does not support MDTM command, fetching file %s' % (
-                        self._host, self._port, location))
+                self._conn.quit()
+            except ftplib.all_errors:
+                self._conn.close()
+            self._conn = None
+
+    def _call(self, command, retrieve=False):
+        # idle session might have been dropped by server, retry once
+        for attempt in (0, 1):
+            conn = self._getConnection()
+            try:
+                if retrieve:
+                    lines = []
+                    conn.retrlines(command, lines.append)
+                    return lines
                 else:
-                    debug.logger & debug.flagReader and debug.logger(
-                        'server %s:%s MDTM response is %s' % (self._host, self._port, response))
-                    if response[:3] == 213:
-                        mtime = time.mktime(time.strptime(response[4:], "%Y%m%d%H%M%S"))
-                debug.logger & debug.flagReader and debug.logger('fetching source MIB %s, mtime %s' % (
-                location, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(mtime))))
-                conn.retrlines('RETR %s' % location, lambda x, y=data: y.append(x))
+                    return conn.sendcmd(command)
+
+            except ftplib.error_perm:
+                raise
+
             except ftplib.all_errors:
                 debug.logger & debug.flagReader and debug.logger(
-                    'failed to fetch MIB %s from %s:%s: %s' % (location, self._host, self._port, sys.exc_info()[1]))
-                continue
+                    'FTP session to %s:%s failed: %s' % (self._host, self._port, sys.exc_info()[1]))
+                conn.close()
+                self._conn = None
+                if attempt:
+                    raise
 
-            data = decode('\n'.join(data))
+    def _getListing(self, directory):
+        if directory in self._listings:
+            listed, listing = self._listings[directory]
+            if time.time() - listed < self.maxListingAge:
+                return listing
 
-            debug.logger & debug.flagReader and debug.logger('fetched %s bytes in %s' % (len(data), location))
+        listing = None
+        transient = False  # listing failed for reasons other than lack of support
 
-            conn.close()
-            return MibInfo(path='ftp://%s%s' % (self._host, location), file=mibfile, name=mibalias, mtime=mtime), data
+        try:
+            lines = self._call('MLSD %s' % directory, retrieve=True)
+
+        except ftplib.all_errors:
+            transient = not isinstance(sys.exc_info()[1], ftplib.error_perm)
+            debug.logger & debug.flagReader and debug.logger(
+                'server %s:%s can not MLSD %s: %s' % (self._host, self._port, directory, sys.exc_info()[1]))
+
+        else:
+            listing = {}
+            for line in lines:
+                facts, _, name = line.partition(' ')
+                facts = dict([x.split('=', 1) for x in facts.lower().split(';') if '=' in x])
+                if facts.get('type', 'file') != 'file':
+                    continue
+                try:
+                    listing[name] = self._parseTime(facts['modify'])
+                except (KeyError, ValueError):
+                    listing[name] = None
+
+        if listing is None:
+            try:
+                lines = self._call('NLST %s' % directory, retrieve=True)
+
+            except ftplib.all_errors:
+                transient = transient or not isinstance(sys.exc_info()[1], ftplib.error_perm)
+                debug.logger & debug.flagReader and debug.logger(
+                    'server %s:%s can not NLST %s: %s' % (self._host, self._port, directory, sys.exc_info()[1]))
+
+            else:
+                # some servers report full paths
+                listing = dict([(posixpath.basename(x), None) for x in lines])
+
+        debug.logger & debug.flagReader and debug.logger('directory %s at %s:%s has %s files' % (
+            directory, self._host, self._port, listing is None and 'unknown' or len(listing)))
+
+        if listing is not None or not transient:
+            self._listings[directory] = time.time(), listing
+        else:
+            self._listings.pop(directory, None)
+
+        return listing
+
+    def getData(self, mibname):
+        mibname = decode(mibname)
+
+        debug.logger & debug.flagReader and debug.logger('looking for MIB %s' % mibname)
+
+        self._lock.acquire()
+
+        try:
+            for mibalias, mibfile in self.getMibVariants(mibname):
+                location = self._locationTemplate.replace('@mib@', mibfile)
+
+                directory, filename = posixpath.split(location)
+
+                listing = self._getListing(directory or '.')
+
+                if listing is not None and filename not in listing:
+                    continue
+
+                mtime = listing is not None and listing[filename] or None
+
+                debug.logger & debug.flagReader and debug.logger(
+                    'trying to fetch MIB %s from %s:%s' % (location, self._host, self._port))
+                try:
+                    if mtime is None:
+                        try:
+                            response = self._call('MDTM %s' % location)
+                        except ftplib.all_errors:
+                            debug.logger & debug.flagReader and debug.logger(
+                                'server %s:%s does not support MDTM command, fetching file %s' % (
+                                    self._host, self._port, location))
+                        else:
+                            debug.logger & debug.flagReader and debug.logger(
+                                'server %s:%s MDTM response is %s' % (self._host, self._port, response))
+                            if response[:3] == '213':
+                                try:
+                                    mtime = self._parseTime(response[4:].strip())
+                                except ValueError:
+                                    pass
+                    if mtime is None:
+                        mtime = time.time()
+                    debug.logger & debug.flagReader and debug.logger('fetching source MIB %s, mtime %s' % (
+                        location, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(mtime))))
+                    data = self._call('RETR %s' % location, retrieve=True)
+                except ftplib.error_perm:
+                    debug.logger & debug.flagReader and debug.logger(
+                        'failed to fetch MIB %s from %s:%s: %s' % (location, self._host, self._port, sys.exc_info()[1]))
+                    continue
+                except ftplib.all_errors:
+                    # can't tell whether MIB is there
+                    raise error.PySmiReaderError('failed to fetch MIB %s from FTP server %s:%s: %s' % (
+                        location, self._host, self._port, sys.exc_info()[1]), reader=self)
+
+                data = decode('\n'.join(data))
+
+                debug.logger & debug.flagReader and debug.logger('fetched %s bytes in %s' % (len(data), location))
+
+                return MibInfo(path='ftp://%s%s' % (self._host, location), file=mibfile, name=mibalias,
+                               mtime=mtime), data
 
-        conn.close()
+        finally:
+            self._lock.release()
 
         raise error.PySmiReaderFileNotFoundError('source MIB %s not found' % mibname, reader=self)
@@ -6,6 +6,7 @@
 #
 import sys
 import time
+import threading
 
 try:
     # noinspection PyUnresolvedReferences
@@ -25,7 +26,15 @@ class HttpReader(AbstractReader):
 
         *HttpReader* class instance tries to download ASN.1 MIB files
         by name and return their contents to caller.
+
+        Up to *maxConnections* persistent connections to web server
+        are kept open and reused, MIB name variants are tried over
+        them concurrently. Validators of downloaded MIBs are kept in
+        *validatorCache* so that MIBs fetched again are only downloaded
+        if changed.
     """
+    maxConnections = 4  # also limits concurrent requests
+    remote = True
 
     def __init__(self, host, port, locationTemplate, timeout=5, ssl=False):
         """Create an instance of *HttpReader* bound to specific URL.
@@ -43,6 +52,10 @@ class HttpReader(AbstractReader):
         self._port = port
         self._locationTemplate = decode(locationTemplate)
         self._timeout = timeout
+        self._conns = []  # idle connections
+        self._lock = threading.Lock()
+        # k, v = location, (ETag, Last-Modified, mtime, MIB text)
+        self.validatorCache = {}
         if '@mib@' not in locationTemplate:
             raise error.PySmiError('@mib@ placeholder not specified in location at %s' % self)
 
@@ -50,44 +63,218 @@ class HttpReader(AbstractReader):
         return '%s{"%s://%s:%s%s"}' % (
             self.__class__.__name__, self._schema, self._host, self._port, self._locationTemplate)
 
-    def getData(self, mibname):
+    def _getConnection(self):
+        self._lock.acquire()
+        try:
+            if self._conns:
+                return self._conns.pop()
+        finally:
+            self._lock.release()
+
+        if self._schema == 'https':
+            connClass = httplib.HTTPSConnection
+        else:
+            connClass = httplib.HTTPConnection
+
+        if sys.version_info[:2] < (2, 6):
+            return connClass(self._host, self._port)
+        else:
+            return connClass(self._host, self._port, timeout=self._timeout)
+
+    def _putConnection(self, conn):
+        self._lock.acquire()
+        try:
+            if len(self._conns) < self.maxConnections:
+                self._conns.append(conn)
+                return
+        finally:
+            self._lock.release()
+
+        conn.close()
+
+    def close(self):
+        """Close idle connections to web server."""
+        self._lock.acquire()
+        try:
+            conns, self._conns = self._conns, []
+        finally:
+            self._lock.release()
+
+        for conn in conns:
+            conn.close()
+
+    def _fetchLocation(self, location):
+        """Fetch document at location over pooled connection.
+
+           Returns:
+               A tuple of *mtime* and document contents or *None* if
+               document can not be fetched
+
+           Raises:
+               PySmiReaderError: if web server can not be talked to
+        """
         headers = {
             'Accept': 'text/plain'
         }
-        if sys.version_info[:2] < (2, 6):
-            conn = httplib.HTTPConnection(self._host, self._port)
-        else:
-            conn = httplib.HTTPConnection(self._host, self._port, timeout=self._timeout)
 
-        mibname = decode(mibname)
+        cached = self.validatorCache.get(location)
+        if cached:
+            etag, lastModified, mtime, mibData = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if lastModified:
+                headers['If-Modified-Since'] = lastModified
 
-        debug.logger & debug.flagReader and debug.logger('looking for MIB %s' % mibname)
+        debug.logger & debug.flagReader and debug.logger(
+            'trying to fetch MIB from %s://%s:%s%s%s' % (
+                self._schema, self._host, self._port, location, cached and ' if modified' or ''))
+
+        # idle connection might have been dropped by server, retry once
+        for attempt in (0, 1):
+            conn = self._getConnection()
 
-        for mibalias, mibfile in self.getMibVariants(mibname):
-            location = self._locationTemplate.replace('@mib@', mibfile)
-            debug.logger & debug.flagReader and debug.logger(
-                'trying to fetch MIB from %s://%s:%s%s' % (self._schema, self._host, self._port, location))
             try:
                 conn.request('GET', location, '', headers)
                 response = conn.getresponse()
+                # response must be read in full before connection is reused
+                data = response.read(self.maxMibSize)
+                break
+
             except Exception:
                 debug.logger & debug.flagReader and debug.logger('failed to fetch MIB from %s://%s:%s%s: %s' % (
                     self._schema, self._host, self._port, location, sys.exc_info()[1]))
-                continue
+                conn.close()
+                if attempt:
+                    raise error.PySmiReaderError('failed to fetch MIB from %s://%s:%s%s: %s' % (
+                        self._schema, self._host, self._port, location, sys.exc_info()[1]), reader=self)
+
+        if response.isclosed():
+            self._putConnection(conn)
+        else:
+            # oversized response left unread
+            conn.close()
+
+        debug.logger & debug.flagReader and debug.logger('HTTP response %s' % response.status)
+
+        if response.status == 304 and cached:
+            debug.logger & debug.flagReader and debug.logger('source MIB %s not modified' % location)
+            return mtime, mibData
+
+        if response.status >= 500:
+            raise error.PySmiReaderError('failed to fetch MIB from %s://%s:%s%s: HTTP status %s' % (
+                self._schema, self._host, self._port, location, response.status), reader=self)
+
+        if response.status != 200:
+            return
+
+        if len(data) == self.maxMibSize:
+            debug.logger & debug.flagReader and debug.logger('source MIB %s too large' % location)
+            return
 
-            debug.logger & debug.flagReader and debug.logger('HTTP response %s' % response.status)
+        lastModified = response.getheader('Last-Modified')
 
-            if response.status == 200:
+        try:
+            mtime = time.mktime(time.strptime(lastModified, "%a, %d %b %Y %H:%M:%S %Z"))
+        except Exception:
+            debug.logger & debug.flagReader and debug.logger('malformed HTTP headers: %s' % sys.exc_info()[1])
+            mtime = time.time()
+
+        debug.logger & debug.flagReader and debug.logger(
+            'fetching source MIB %s, mtime %s' % (location, lastModified))
+
+        mibData = decode(data)
+
+        etag = response.getheader('ETag')
+        if etag or lastModified:
+            self.validatorCache[location] = etag, lastModified, mtime, mibData
+
+        return mtime, mibData
+
+    def getData(self, mibname):
+        mibname = decode(mibname)
+
+        debug.logger & debug.flagReader and debug.logger('looking for MIB %s' % mibname)
+
+        mibVariants = list(self.getMibVariants(mibname))
+
+        # fetch outcomes by variant: None - pending, False - failed
+        results = [None] * len(mibVariants)
+        # the last transport failure, if any
+        state = {'next': 0, 'done': False, 'error': None}
+        cond = threading.Condition()
+
+        def worker():
+            while True:
+                cond.acquire()
                 try:
-                    mtime = time.mktime(time.strptime(response.getheader('Last-Modified'), "%a, %d %b %Y %H:%M:%S %Z"))
-                except Exception:
-                    debug.logger & debug.flagReader and debug.logger('malformed HTTP headers: %s' % sys.exc_info()[1])
-                    mtime = time.time()
+                    idx = state['next']
+                    if state['done'] or idx >= len(mibVariants):
+                        return
+                    state['next'] += 1
+                finally:
+                    cond.release()
+
+                result = None
+
+                exc = None
+
+                try:
+                    result = self._fetchLocation(self._locationTemplate.replace('@mib@', mibVariants[idx][1]))
+
+                except error.PySmiReaderError:
+                    exc = sys.exc_info()[1]
+                    debug.logger & debug.flagReader and debug.logger(str(exc))
+
+                finally:
+                    cond.acquire()
+                    try:
+                        if exc:
+                            state['error'] = exc
+                        results[idx] = result or False
+                        if result and False not in [x is False for x in results[:idx]]:
+                            # no point in trying less preferred variants
+                            state['done'] = True
+                        cond.notify()
+                    finally:
+                        cond.release()
+
+        workers = min(self.maxConnections, len(mibVariants))
+
+        if workers > 1:
+            for x in range(workers):
+                t = threading.Thread(target=worker)
+                t.daemon = True
+                t.start()
+
+        else:
+            worker()
+
+        cond.acquire()
+        try:
+            for idx, (mibalias, mibfile) in enumerate(mibVariants):
+                # the first variant found wins regardless of completion order
+                while results[idx] is None:
+                    cond.wait()
+                if results[idx]:
+                    break
+
+            else:
+                idx = None
+
+            state['done'] = True
+
+        finally:
+            cond.release()
+
+        if idx is None:
+            if state['error']:
+                # MIB might be there
+                raise state['error']
+            raise error.PySmiReaderFileNotFoundError('source MIB %s not found' % mibname, reader=self)
 
-                debug.logger & debug.flagReader and debug.logger(
-                    'fetching source MIB %s, mtime %s' % (location, response.getheader('Last-Modified')))
+        mtime, mibData = results[idx]
 
-                return MibInfo(path='%s://%s:%s%s' % (self._schema, self._host, self._port, location), file=mibfile,
-                               name=mibalias, mtime=mtime), decode(response.read(self.maxMibSize))
+        location = self._locationTemplate.replace('@mib@', mibfile)
 
-        raise error.PySmiReaderFileNotFoundError('source MIB %s not found' % mibname, reader=self)
+        return MibInfo(path='%s://%s:%s%s' % (self._schema, self._host, self._port, location), file=mibfile,
+                       name=mibalias, mtime=mtime), mibData
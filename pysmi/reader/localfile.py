@@ -5,8 +5,10 @@
 # License: http://pysmi.sf.net/license.html
 #
 import os
+import re
 import sys
 import time
+import tempfile
 from pysmi.reader.base import AbstractReader
 from pysmi.mibinfo import MibInfo
 from pysmi.compat import decode
@@ -21,7 +23,14 @@ class FileReader(AbstractReader):
     by name, fetch and return their contents to caller.
     """
     useIndexFile = True  # optional .index file mapping MIB to file name
+    updateIndexFile = False  # rescan MIB files and refresh .index on first use
     indexFile = '.index'
+    checkInterval = 5  # seconds between checks for directory modifications
+
+    headerPattern = re.compile(
+        r'^\s*([A-Za-z][-A-Za-z0-9_]*)\s*(?:\{[^}]*\}\s*)?DEFINITIONS\s*::=\s*BEGIN', re.M
+    )
+    commentPattern = re.compile(r'--[^\r\n]*')
 
     def __init__(self, path, recursive=True, ignoreErrors=True):
         """Create an instance of *FileReader* serving a directory.
@@ -37,6 +46,11 @@ class FileReader(AbstractReader):
         self._ignoreErrors = ignoreErrors
         self._indexLoaded = False
         self._mibIndex = None
+        self._dirs = []  # directories in search order
+        self._dirMtimes = {}  # k, v = directory, mtime
+        self._fileIndex = None  # k, v = lowercased file name, [(directory number, file name), ...]
+        self._lastChecked = 0
+        self._indexUpdated = False
 
     def __str__(self):
         return '%s{"%s"}' % (self.__class__.__name__, self._path)
@@ -64,9 +78,11 @@ class FileReader(AbstractReader):
         if os.path.exists(indexFile):
             try:
                 f = open(indexFile)
-                mibIndex = dict(
-                    [x.split()[:2] for x in f.readlines()]
-                )
+                for line in f.readlines():
+                    entry = line.split()
+                    if len(entry) < 2 or entry[0].startswith('#'):
+                        continue
+                    mibIndex[entry[0]] = entry[1]
                 f.close()
                 debug.logger & debug.flagReader and debug.logger(
                     'loaded MIB index map from %s file, %s entries' % (indexFile, len(mibIndex)))
@@ -90,32 +106,272 @@ class FileReader(AbstractReader):
 
         return super(FileReader, self).getMibVariants(mibname)
 
-    def getData(self, mibname):
-        debug.logger & debug.flagReader and debug.logger(
-            '%slooking for MIB %s' % (self._recursive and 'recursively ' or '', mibname))
-        for path in self.getSubdirs(self._path, self._recursive,
-                                    self._ignoreErrors):
-            for mibalias, mibfile in self.getMibVariants(mibname):
-                f = os.path.join(decode(path), decode(mibfile))
-                debug.logger & debug.flagReader and debug.logger('trying MIB %s' % f)
-                if os.path.exists(f) and os.path.isfile(f):
+    def _indexDirs(self, path, dirs, dirMtimes, fileIndex):
+        try:
+            dirMtimes[path] = os.stat(path).st_mtime
+            entries = os.listdir(path)
+        except OSError:
+            if self._ignoreErrors:
+                return
+            else:
+                raise error.PySmiError('directory %s access error: %s' % (path, sys.exc_info()[1]))
+        dirNum = len(dirs)
+        dirs.append(path)
+        subdirs = []
+        for entry in entries:
+            entry = decode(entry)
+            f = os.path.join(path, entry)
+            if os.path.isdir(f):
+                subdirs.append(f)
+            else:
+                fileIndex.setdefault(entry.lower(), []).append((dirNum, entry))
+        if self._recursive:
+            for d in subdirs:
+                self._indexDirs(d, dirs, dirMtimes, fileIndex)
+
+    def _dirsModified(self, force=False):
+        now = time.time()
+        if not force and now - self._lastChecked < self.checkInterval:
+            return False
+        self._lastChecked = now
+        for path in self._dirMtimes:
+            try:
+                if os.stat(path).st_mtime != self._dirMtimes[path]:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def getFileIndex(self):
+        """Return case-insensitive index of files in served directories.
+
+           The index is built once by walking directory tree and rebuilt
+           whenever modification time of any indexed directory changes.
+           Directories are checked for modification at most once in
+           *checkInterval* seconds, *getData* checks them right away
+           should a MIB not be found in the index.
+
+           Returns:
+               A dictionary of lowercased file names (keys) and lists of
+               *(directory number, file name)* tuples (values). Directory
+               number refers to *dirs* list in search order.
+        """
+        if self._fileIndex is None or self._dirsModified():
+            dirs, dirMtimes, fileIndex = [], {}, {}
+            self._indexDirs(decode(self._path), dirs, dirMtimes, fileIndex)
+            self._dirs, self._dirMtimes, self._fileIndex = dirs, dirMtimes, fileIndex
+            self._lastChecked = time.time()
+            debug.logger & debug.flagReader and debug.logger(
+                'indexed %s files in %s directories at %s' % (len(fileIndex), len(dirs), self._path))
+        return self._fileIndex
+
+    def _reindexIfModified(self):
+        """Drop file index if served directories changed since indexed.
+
+           Returns:
+               *True* if the index is dropped
+        """
+        if self._fileIndex is not None and self._dirsModified(force=True):
+            self._fileIndex = None
+            return True
+        return False
+
+    def getModuleNames(self, mibData):
+        """Return names of MIB modules defined in ASN.1 MIB text.
+
+           Only *DEFINITIONS ::= BEGIN* module headers are looked at,
+           the rest of MIB text is not parsed.
+
+           Args:
+               mibData (str): ASN.1 MIB text
+
+           Returns:
+               A list of MIB module names in order of appearance
+        """
+        return [m.group(1) for m in self.headerPattern.finditer(self.commentPattern.sub('', mibData))]
+
+    def updateIndex(self):
+        """Scan served directories and write up-to-date .index file.
+
+           Each file found is looked up for MIB module headers to learn
+           the names of MIB modules it defines. Files recorded in existing
+           .index file whose modification time has not changed since
+           are not read again.
+
+           Returns:
+               A dictionary of MIB module names (keys) and file names
+               relative to served directory (values).
+        """
+        indexFile = os.path.join(self._path, self.indexFile)
+
+        known = {}  # k, v = relative file name, (mtime, [MIB module name, ...])
+        if os.path.exists(indexFile):
+            try:
+                fp = open(indexFile)
+                try:
+                    for line in fp.readlines():
+                        entry = line.split()
+                        if len(entry) < 3 or entry[0].startswith('#'):
+                            continue
+                        try:
+                            mtime = float(entry[2])
+                        except ValueError:
+                            continue
+                        known.setdefault(entry[1], (mtime, []))[1].append(entry[0])
+                finally:
+                    fp.close()
+            except IOError:
+                pass
+
+        fileIndex = self.getFileIndex()
+
+        files = []
+        for entries in fileIndex.values():
+            files.extend(entries)
+        files.sort()
+
+        mibIndex = {}
+        lines = []
+        scanned = 0
+
+        for dirNum, filename in files:
+            f = os.path.join(self._dirs[dirNum], filename)
+            relpath = os.path.relpath(f, self._path)
+            if relpath == self.indexFile:
+                continue
+            try:
+                mtime = os.stat(f).st_mtime
+            except OSError:
+                continue
+            if relpath in known and known[relpath][0] == mtime:
+                mibnames = known[relpath][1]
+            else:
+                try:
+                    fp = open(f, mode='rb')
                     try:
-                        mtime = os.stat(f)[8]
-                        debug.logger & debug.flagReader and debug.logger(
-                            'source MIB %s mtime is %s, fetching data...' % (
-                                f, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(mtime))))
-                        fp = open(f, mode='rb')
                         mibData = fp.read(self.maxMibSize)
+                    finally:
                         fp.close()
-                        if len(mibData) == self.maxMibSize:
-                            raise IOError('MIB %s too large' % f)
-                        return MibInfo(path='file://%s' % f, file=mibfile, name=mibalias, mtime=mtime), decode(mibData)
-                    except (OSError, IOError):
-                        debug.logger & debug.flagReader and debug.logger(
-                            'source file %s open failure: %s' % (f, sys.exc_info()[1]))
-                        if not self._ignoreErrors:
-                            raise error.PySmiError('file %s access error: %s' % (f, sys.exc_info()[1]))
-
-                    raise error.PySmiReaderFileNotModifiedError('source MIB %s is older than needed' % f, reader=self)
+                except (OSError, IOError):
+                    debug.logger & debug.flagReader and debug.logger(
+                        'source file %s open failure: %s' % (f, sys.exc_info()[1]))
+                    continue
+                mibnames = self.getModuleNames(decode(mibData))
+                scanned += 1
+            for mibname in mibnames:
+                if mibname in mibIndex:
+                    continue
+                mibIndex[mibname] = relpath
+                lines.append('%s %s %r\n' % (mibname, relpath, mtime))
+
+        tfile = None
+
+        try:
+            fd, tfile = tempfile.mkstemp(dir=self._path)
+            fp = os.fdopen(fd, 'wb')
+            try:
+                fp.write(''.join(lines).encode('utf-8'))
+            finally:
+                fp.close()
+            os.rename(tfile, indexFile)
+
+        except (OSError, IOError, UnicodeEncodeError):
+            exc = sys.exc_info()
+            if tfile:
+                try:
+                    os.unlink(tfile)
+                except OSError:
+                    pass
+            raise error.PySmiError('failure writing index file %s: %s' % (indexFile, exc[1]))
+
+        debug.logger & debug.flagReader and debug.logger(
+            'updated MIB index map at %s, %s entries, %s files scanned' % (indexFile, len(mibIndex), scanned))
+
+        self._mibIndex = dict(mibIndex)
+        self._indexLoaded = True
+        self._indexUpdated = True
+
+        return mibIndex
+
+    def findFile(self, mibname):
+        mibVariants = list(self.getMibVariants(mibname))
+
+        if self._mibIndex and mibname in self._mibIndex:
+            # index hit resolves without looking into directories
+            f = os.path.join(self._path, decode(self._mibIndex[mibname]))
+            if os.path.isfile(f):
+                return mibname, f
+
+            debug.logger & debug.flagReader and debug.logger(
+                'stale MIB index entry %s for %s, searching directories' % (self._mibIndex[mibname], mibname))
+
+            mibVariants.extend(super(FileReader, self).getMibVariants(mibname))
+
+        fileIndex = self.getFileIndex()
+        found = None
+        for idx, (mibalias, mibfile) in enumerate(mibVariants):
+            mibfile = decode(mibfile)
+            if os.path.dirname(mibfile):
+                # file name as given by MIB index may refer to a subdirectory
+                for dirNum, path in enumerate(self._dirs):
+                    f = os.path.join(path, mibfile)
+                    if os.path.isfile(f):
+                        if found is None or (dirNum, idx) < found[0][:2]:
+                            found = (dirNum, idx, False), mibalias, f
+                        break
+                continue
+            for dirNum, filename in fileIndex.get(mibfile.lower(), ()):
+                key = dirNum, idx, filename != mibfile
+                if found is None or key < found[0]:
+                    found = key, mibalias, os.path.join(self._dirs[dirNum], filename)
+
+        if found:
+            key, mibalias, f = found
+            return mibalias, f
+
+    def getData(self, mibname):
+        debug.logger & debug.flagReader and debug.logger(
+            '%slooking for MIB %s' % (self._recursive and 'recursively ' or '', mibname))
+        if self.updateIndexFile and not self._indexUpdated:
+            try:
+                self.updateIndex()
+            except error.PySmiError:
+                debug.logger & debug.flagReader and debug.logger(
+                    'MIB index update failed: %s' % sys.exc_info()[1])
+                if not self._ignoreErrors:
+                    raise
+                self._indexUpdated = True
+        # file index might be out of date, look again if directories changed
+        for attempt in (0, 1):
+            found = self.findFile(mibname)
+            if not found:
+                if attempt or not self._reindexIfModified():
+                    break
+                continue
+            mibalias, f = found
+            debug.logger & debug.flagReader and debug.logger('found MIB %s in %s' % (mibname, f))
+            try:
+                mtime = os.stat(f)[8]
+                debug.logger & debug.flagReader and debug.logger(
+                    'source MIB %s mtime is %s, fetching data...' % (
+                        f, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(mtime))))
+                fp = open(f, mode='rb')
+                try:
+                    mibData = fp.read(self.maxMibSize)
+                finally:
+                    fp.close()
+                if len(mibData) == self.maxMibSize:
+                    raise IOError('MIB %s too large' % f)
+                return MibInfo(path='file://%s' % f, file=os.path.basename(f), name=mibalias,
+                               mtime=mtime), decode(mibData)
+            except (OSError, IOError):
+                debug.logger & debug.flagReader and debug.logger(
+                    'source file %s open failure: %s' % (f, sys.exc_info()[1]))
+                if not attempt and self._reindexIfModified():
+                    continue
+                if not self._ignoreErrors:
+                    raise error.PySmiError('file %s access error: %s' % (f, sys.exc_info()[1]))
+
+            raise error.PySmiReaderFileNotModifiedError('source MIB %s is older than needed' % f, reader=self)
 
         raise error.PySmiReaderFileNotFoundError('source MIB %s not found' % mibname, reader=self)
@@ -15,6 +15,7 @@ except ImportError:
 from pysmi.reader.localfile import FileReader
 from pysmi.reader.httpclient import HttpReader
 from pysmi.reader.ftpclient import FtpReader
+from pysmi.reader.archive import ZipReader, TarReader
 from pysmi import error
 
 
@@ -41,6 +42,10 @@ def getReadersFromUrls(*sourceUrls, **options):
                 FtpReader(mibSource.hostname or mibSource.netloc, mibSource.path, ssl=mibSource.scheme == 'sftp',
                           port=mibSource.port or 21, user=mibSource.username or 'anonymous',
                           password=mibSource.password or 'anonymous@').setOptions(**options))
+        elif mibSource.scheme == 'zip':
+            readers.append(ZipReader(mibSource.path).setOptions(**options))
+        elif mibSource.scheme == 'tar':
+            readers.append(TarReader(mibSource.path).setOptions(**options))
         else:
             raise error.PySmiError('Unsupported URL scheme %s' % sourceUrl)
 
@@ -1,4 +1,5 @@
 from pysmi.searcher.pyfile import PyFileSearcher
 from pysmi.searcher.pypackage import PyPackageSearcher
 from pysmi.searcher.stub import StubSearcher
-from pysmi.searcher.anyfile import AnyFileSearcher
\ No newline at end of file
+from pysmi.searcher.anyfile import AnyFileSearcher
+from pysmi.searcher.manifest import Manifest
@@ -8,6 +8,7 @@ import os
 import sys
 import time
 from pysmi.searcher.base import AbstractSearcher
+from pysmi.searcher.manifest import Manifest
 from pysmi.compat import decode
 from pysmi import debug
 from pysmi import error
@@ -25,11 +26,12 @@ class AnyFileSearcher(AbstractSearcher):
              path (str): path to local directory
         """
         self._path = os.path.normpath(decode(path))
+        self.manifest = Manifest(self._path)
 
     def __str__(self):
         return '%s{"%s"}' % (self.__class__.__name__, self._path)
 
-    def fileExists(self, mibname, mtime, rebuild=False):
+    def fileExists(self, mibname, mtime, rebuild=False, digest=None):
         if rebuild:
             debug.logger & debug.flagSearcher and debug.logger('pretend %s is very old' % mibname)
             return
@@ -49,7 +51,7 @@ class AnyFileSearcher(AbstractSearcher):
             debug.logger & debug.flagSearcher and debug.logger(
                 'found %s, mtime %s' % (f, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(fileTime))))
 
-            if fileTime >= mtime:
+            if self.isUpToDate(mibname, mtime, fileTime, digest):
                 raise error.PySmiFileNotModifiedError()
 
         raise error.PySmiFileNotFoundError('no compiled file %s found' % mibname, searcher=self)
@@ -4,14 +4,43 @@
 # Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
 # License: http://pysmi.sf.net/license.html
 #
+from pysmi import debug
 
 
 class AbstractSearcher(object):
+    manifest = None  # Manifest of searched location, if any
 
     def setOptions(self, **kwargs):
         for k in kwargs:
             setattr(self, k, kwargs[k])
         return self
 
-    def fileExists(self, mibname, mtime, rebuild=False):
+    def isUpToDate(self, mibname, mtime, fileTime, digest=None):
+        """Tell whether transformed MIB is up to date with its source.
+
+           Source digest recorded in *manifest* takes precedence over
+           comparing modification times.
+
+           Args:
+               mibname (str): MIB name
+               mtime (float): source MIB modification time
+               fileTime (float): transformed MIB modification time
+
+           Keyword Args:
+               digest (str): digest of source MIB text
+
+           Returns:
+               *True* if transformed MIB is up to date, *False* otherwise
+        """
+        if digest is not None and self.manifest is not None:
+            upToDate = self.manifest.isUpToDate(mibname, digest)
+            if upToDate is not None:
+                debug.logger & debug.flagSearcher and debug.logger(
+                    '%s is %s its source according to %s' % (
+                        mibname, upToDate and 'built from' or 'not built from', self.manifest))
+                return upToDate
+
+        return fileTime >= mtime
+
+    def fileExists(self, mibname, mtime, rebuild=False, digest=None):
         raise NotImplementedError()
@@ -0,0 +1,153 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+import os
+import sys
+import hashlib
+import tempfile
+from pysmi.compat import decode, encode
+from pysmi import __version__ as packageVersion
+from pysmi import debug
+
+
+class Manifest(object):
+    """Keep track of what transformed MIBs in a local directory are built from.
+
+    For each transformed MIB the manifest records a digest of ASN.1 MIB
+    text it has been built from and pysmi version that built it. Searchers
+    consult the manifest to tell whether transformed MIB is up to date
+    instead of comparing modification times, which are not reliably
+    known for remote MIB sources.
+
+    The manifest is kept in *manifestFile* file in that same directory,
+    each line holding MIB name, source digest and pysmi version.
+    """
+    manifestFile = '.manifest'
+
+    def __init__(self, path):
+        """Create an instance of *Manifest*.
+
+           Args:
+               path (str): directory of transformed MIBs
+        """
+        self._path = os.path.normpath(decode(path))
+        self._file = os.path.join(self._path, self.manifestFile)
+        self._entries = {}  # k, v = MIB name, (source digest, pysmi version)
+        self._pending = {}  # k, v = MIB name, (source digest, pysmi version)
+        self._mtime = None
+        self._loaded = False
+
+    def __str__(self):
+        return '%s{"%s"}' % (self.__class__.__name__, self._file)
+
+    @staticmethod
+    def getDigest(data):
+        """Return digest of ASN.1 MIB text."""
+        return hashlib.sha1(encode(data)).hexdigest()
+
+    def _load(self):
+        try:
+            mtime = os.stat(self._file).st_mtime
+
+        except OSError:
+            mtime = None
+
+        if self._loaded and mtime == self._mtime:
+            return
+
+        entries = {}
+
+        if mtime is not None:
+            try:
+                fp = open(self._file)
+                try:
+                    for line in fp.readlines():
+                        entry = line.split()
+                        if len(entry) != 3 or entry[0].startswith('#'):
+                            continue
+                        entries[entry[0]] = entry[1], entry[2]
+                finally:
+                    fp.close()
+
+            except IOError:
+                debug.logger & debug.flagSearcher and debug.logger(
+                    'failure reading manifest file %s: %s' % (self._file, sys.exc_info()[1]))
+
+            debug.logger & debug.flagSearcher and debug.logger(
+                'loaded manifest %s, %s entries' % (self._file, len(entries)))
+
+        entries.update(self._pending)
+
+        self._entries, self._mtime, self._loaded = entries, mtime, True
+
+    def isUpToDate(self, mibname, digest):
+        """Tell whether transformed MIB is built from given ASN.1 MIB text.
+
+           Args:
+               mibname (str): MIB name
+               digest (str): digest of ASN.1 MIB text as returned by *getDigest*
+
+           Returns:
+               *True* if transformed MIB is built from the same MIB text
+               by this pysmi version, *False* if it is built otherwise or
+               *None* if the manifest knows nothing of this MIB
+        """
+        self._load()
+
+        if mibname not in self._entries:
+            return
+
+        return self._entries[mibname] == (digest, packageVersion)
+
+    def update(self, mibname, digest):
+        """Record that transformed MIB is built from given ASN.1 MIB text.
+
+           Updates are kept in memory until *flush* is called.
+
+           Args:
+               mibname (str): MIB name
+               digest (str): digest of ASN.1 MIB text as returned by *getDigest*
+        """
+        self._pending[mibname] = self._entries[mibname] = digest, packageVersion
+
+    def flush(self):
+        """Store recorded updates in the manifest file.
+
+           Entries stored by others since the manifest was loaded are
+           preserved unless updated here.
+        """
+        if not self._pending:
+            return
+
+        self._loaded = False
+        self._load()
+
+        tfile = None
+
+        try:
+            fd, tfile = tempfile.mkstemp(dir=self._path)
+            try:
+                os.write(fd, ''.join(['%s %s %s\n' % (mibname, digest, version)
+                                      for mibname, (digest, version) in sorted(self._entries.items())]).encode('utf-8'))
+            finally:
+                os.close(fd)
+
+            os.rename(tfile, self._file)
+
+        except (OSError, IOError, UnicodeEncodeError):
+            debug.logger & debug.flagSearcher and debug.logger(
+                'failure writing manifest file %s: %s' % (self._file, sys.exc_info()[1]))
+            if tfile:
+                try:
+                    os.unlink(tfile)
+                except OSError:
+                    pass
+
+        else:
+            debug.logger & debug.flagSearcher and debug.logger(
+                'stored manifest %s, %s entries' % (self._file, len(self._entries)))
+
+            self._pending.clear()
@@ -10,6 +10,7 @@ import time
 import imp
 import struct
 from pysmi.searcher.base import AbstractSearcher
+from pysmi.searcher.manifest import Manifest
 from pysmi.compat import decode
 from pysmi import debug
 from pysmi import error
@@ -32,11 +33,12 @@ class PyFileSearcher(AbstractSearcher):
              path (str): path to local directory
         """
         self._path = os.path.normpath(decode(path))
+        self.manifest = Manifest(self._path)
 
     def __str__(self):
         return '%s{"%s"}' % (self.__class__.__name__, self._path)
 
-    def fileExists(self, mibname, mtime, rebuild=False):
+    def fileExists(self, mibname, mtime, rebuild=False, digest=None):
         if rebuild:
             debug.logger & debug.flagSearcher and debug.logger('pretend %s is very old' % mibname)
             return
@@ -61,7 +63,7 @@ class PyFileSearcher(AbstractSearcher):
                         pyTime = struct.unpack('<L', pyData[:4])[0]
                         debug.logger & debug.flagSearcher and debug.logger(
                             'found %s, mtime %s' % (f, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(pyTime))))
-                        if pyTime >= mtime:
+                        if self.isUpToDate(mibname, mtime, pyTime, digest):
                             raise error.PySmiFileNotModifiedError()
                         else:
                             raise error.PySmiFileNotFoundError('older file %s exists' % mibname, searcher=self)
@@ -77,7 +79,7 @@ class PyFileSearcher(AbstractSearcher):
 
                     debug.logger & debug.flagSearcher and debug.logger(
                         'found %s, mtime %s' % (f, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(pyTime))))
-                    if pyTime >= mtime:
+                    if self.isUpToDate(mibname, mtime, pyTime, digest):
                         raise error.PySmiFileNotModifiedError()
 
         raise error.PySmiFileNotFoundError('no compiled file %s found' % mibname, searcher=self)
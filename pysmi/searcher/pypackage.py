@@ -54,7 +54,7 @@ class PyPackageSearcher(AbstractSearcher):
              -1)  # dst
         return time.mktime(t)
 
-    def fileExists(self, mibname, mtime, rebuild=False):
+    def fileExists(self, mibname, mtime, rebuild=False, digest=None):
         if rebuild:
             debug.logger & debug.flagSearcher and debug.logger('pretend %s is very old' % mibname)
             return
@@ -69,7 +69,8 @@ class PyPackageSearcher(AbstractSearcher):
             elif hasattr(p, '__file__'):
                 debug.logger & debug.flagSearcher and debug.logger(
                     '%s is not an egg, trying it as a package directory' % self._package)
-                return PyFileSearcher(os.path.split(p.__file__)[0]).fileExists(mibname, mtime, rebuild=rebuild)
+                return PyFileSearcher(os.path.split(p.__file__)[0]).fileExists(mibname, mtime, rebuild=rebuild,
+                                                                                digest=digest)
             else:
                 raise error.PySmiFileNotFoundError('%s is neither importable nor a file' % self._package, searcher=self)
 
@@ -89,7 +90,7 @@ class PyPackageSearcher(AbstractSearcher):
                         pyTime = struct.unpack('<L', pyData[:4])[0]
                         debug.logger & debug.flagSearcher and debug.logger(
                             'found %s, mtime %s' % (f, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(pyTime))))
-                        if pyTime >= mtime:
+                        if self.isUpToDate(mibname, mtime, pyTime, digest):
                             raise error.PySmiFileNotModifiedError()
                         else:
                             raise error.PySmiFileNotFoundError('older file %s exists' % mibname, searcher=self)
@@ -104,7 +105,7 @@ class PyPackageSearcher(AbstractSearcher):
 
                     debug.logger & debug.flagSearcher and debug.logger(
                         'found %s, mtime %s' % (f, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(pyTime))))
-                    if pyTime >= mtime:
+                    if self.isUpToDate(mibname, mtime, pyTime, digest):
                         raise error.PySmiFileNotModifiedError()
                     else:
                         raise error.PySmiFileNotFoundError('older file %s exists' % mibname, searcher=self)
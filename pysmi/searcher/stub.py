@@ -25,7 +25,7 @@ class StubSearcher(AbstractSearcher):
     def __str__(self):
         return '%s' % self.__class__.__name__
 
-    def fileExists(self, mibname, mtime, rebuild=False):
+    def fileExists(self, mibname, mtime, rebuild=False, digest=None):
         if mibname in self._mibnames:
             debug.logger & debug.flagSearcher and debug.logger('pretend compiled %s exists and is very new' % mibname)
             raise error.PySmiFileNotModifiedError('compiled file %s is among %s' % (mibname, ', '.join(self._mibnames)),
@@ -4,12 +4,69 @@
 # Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
 # License: http://pysmi.sf.net/license.html
 #
+import sys
+from pysmi import error
+
+if sys.version_info[0] > 2:
+    # noinspection PyShadowingBuiltins
+    unicode = str
+else:
+    # noinspection PyShadowingBuiltins
+    bytes = str
+
 
 class AbstractWriter(object):
+    supportsChunks = False  # putData takes data as a sequence of chunks
+
     def setOptions(self, **kwargs):
         for k in kwargs:
             setattr(self, k, kwargs[k])
         return self
 
+    @staticmethod
+    def iterData(data):
+        """Return chunks of transformed MIB module.
+
+           Args:
+               data: transformed MIB module as a string or a sequence
+                   of strings to be written one after another
+
+           Returns:
+               A sequence of strings
+        """
+        if isinstance(data, (str, unicode, bytes)):
+            return data,
+        return data
+
+    @classmethod
+    def joinData(cls, data):
+        """Return transformed MIB module as a single string.
+
+           Args:
+               data: transformed MIB module as a string or a sequence
+                   of strings to be written one after another
+
+           Returns:
+               A string
+        """
+        if isinstance(data, (str, unicode, bytes)):
+            return data
+        data = list(cls.iterData(data))
+        return data and data[0][:0].join(data) or ''
+
+    def getData(self, mibname):
+        """Return transformed MIB module stored earlier.
+
+           Args:
+               mibname (str): name of transformed MIB module
+
+           Returns:
+               Stored data as a byte string
+
+           Raises:
+               PySmiFileNotFoundError: if nothing is stored under this name
+        """
+        raise error.PySmiFileNotFoundError('%s can\'t read back stored %s' % (self, mibname), writer=self)
+
     def putData(self, mibname, data, comments=(), dryRun=False):
         raise NotImplementedError()
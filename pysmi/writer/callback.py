@@ -19,6 +19,7 @@ class CallbackWriter(AbstractWriter):
        .. function:: cbFun(mibname, contents, cbCtx)
 
     """
+    supportsChunks = True
 
     def __init__(self, cbFun, cbCtx=None):
         """Creates an instance of *CallbackWriter* class.
@@ -40,7 +41,7 @@ class CallbackWriter(AbstractWriter):
             return
 
         try:
-            self._cbFun(mibname, data, self._cbCtx)
+            self._cbFun(mibname, self.joinData(data), self._cbCtx)
         except Exception:
             raise error.PySmiWriterError(
                 'user callback %s failure writing %s: %s' % (self._cbFun, mibname, sys.exc_info()[1]), writer=self)
@@ -20,6 +20,7 @@ class FileWriter(AbstractWriter):
        *MibCompiler* on instantiation. The rest is internal to *MibCompiler*.
     """
     suffix = ''
+    supportsChunks = True
 
     def __init__(self, path):
         """Creates an instance of *FileReader* class.
@@ -32,6 +33,27 @@ class FileWriter(AbstractWriter):
     def __str__(self):
         return '%s{"%s"}' % (self.__class__.__name__, self._path)
 
+    def getData(self, mibname):
+        filename = os.path.join(self._path, decode(mibname)) + self.suffix
+
+        if not os.path.exists(filename):
+            raise error.PySmiFileNotFoundError('file %s not found' % filename, writer=self)
+
+        try:
+            fp = open(filename, 'rb')
+            try:
+                data = fp.read()
+            finally:
+                fp.close()
+
+        except (OSError, IOError):
+            raise error.PySmiWriterError('failure reading file %s: %s' % (filename, sys.exc_info()[1]),
+                                         file=filename, writer=self)
+
+        debug.logger & debug.flagWriter and debug.logger('%s read from %s' % (mibname, filename))
+
+        return data
+
     def putData(self, mibname, data, comments=(), dryRun=False):
         if dryRun:
             debug.logger & debug.flagWriter and debug.logger('dry run mode')
@@ -43,17 +65,20 @@ class FileWriter(AbstractWriter):
                 raise error.PySmiWriterError(
                     'failure creating destination directory %s: %s' % (self._path, sys.exc_info()[1]), writer=self)
 
-        if comments:
-            data = '#\n' + ''.join(['# %s\n' % x for x in comments]) + '#\n' + data
-
         filename = os.path.join(self._path, decode(mibname)) + self.suffix
 
         tfile = None
 
         try:
             fd, tfile = tempfile.mkstemp(dir=self._path)
-            os.write(fd, encode(data))
-            os.close(fd)
+            fp = os.fdopen(fd, 'wb')
+            try:
+                if comments:
+                    fp.write(encode('#\n' + ''.join(['# %s\n' % x for x in comments]) + '#\n'))
+                for chunk in self.iterData(data):
+                    fp.write(encode(chunk))
+            finally:
+                fp.close()
             os.rename(tfile, filename)
 
         except (OSError, IOError, UnicodeEncodeError):
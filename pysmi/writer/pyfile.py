@@ -21,6 +21,7 @@ class PyFileWriter(AbstractWriter):
        User is expected to pass *PyFileWriter* class instance to
        *MibCompiler* on instantiation. The rest is internal to *MibCompiler*.
     """
+    supportsChunks = True
     pyCompile = True
     pyOptimizationLevel = -1
     suffixes = {}
@@ -40,6 +41,27 @@ class PyFileWriter(AbstractWriter):
     def __str__(self):
         return '%s{"%s"}' % (self.__class__.__name__, self._path)
 
+    def getData(self, mibname):
+        pyfile = os.path.join(self._path, decode(mibname)) + self.suffixes[imp.PY_SOURCE][0][0]
+
+        if not os.path.exists(pyfile):
+            raise error.PySmiFileNotFoundError('file %s not found' % pyfile, writer=self)
+
+        try:
+            fp = open(pyfile, 'rb')
+            try:
+                data = fp.read()
+            finally:
+                fp.close()
+
+        except (OSError, IOError):
+            raise error.PySmiWriterError('failure reading file %s: %s' % (pyfile, sys.exc_info()[1]),
+                                         file=pyfile, writer=self)
+
+        debug.logger & debug.flagWriter and debug.logger('%s read from %s' % (mibname, pyfile))
+
+        return data
+
     def putData(self, mibname, data, comments=(), dryRun=False):
         if dryRun:
             debug.logger & debug.flagWriter and debug.logger('dry run mode')
@@ -51,17 +73,20 @@ class PyFileWriter(AbstractWriter):
                 raise error.PySmiWriterError(
                     'failure creating destination directory %s: %s' % (self._path, sys.exc_info()[1]), writer=self)
 
-        if comments:
-            data = '#\n' + ''.join(['# %s\n' % x for x in comments]) + '#\n' + data
-
         pyfile = os.path.join(self._path, decode(mibname)) + self.suffixes[imp.PY_SOURCE][0][0]
 
         tfile = None
 
         try:
             fd, tfile = tempfile.mkstemp(dir=self._path)
-            os.write(fd, encode(data))
-            os.close(fd)
+            fp = os.fdopen(fd, 'wb')
+            try:
+                if comments:
+                    fp.write(encode('#\n' + ''.join(['# %s\n' % x for x in comments]) + '#\n'))
+                for chunk in self.iterData(data):
+                    fp.write(encode(chunk))
+            finally:
+                fp.close()
             os.rename(tfile, pyfile)
         except (OSError, IOError, UnicodeEncodeError):
             exc = sys.exc_info()
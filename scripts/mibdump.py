@@ -10,12 +10,13 @@
 import os
 import sys
 import getopt
-from pysmi.reader import getReadersFromUrls
-from pysmi.searcher import AnyFileSearcher, PyFileSearcher, PyPackageSearcher, StubSearcher
+from pysmi.reader import getReadersFromUrls, FileReader, ZipReader, TarReader, CachingReader, NegativeCache
+from pysmi.searcher import AnyFileSearcher, PyFileSearcher, PyPackageSearcher, StubSearcher, Manifest
 from pysmi.borrower import AnyFileBorrower, PyFileBorrower
 from pysmi.writer import PyFileWriter, FileWriter, CallbackWriter
-from pysmi.parser import SmiV1CompatParser
-from pysmi.codegen import PySnmpCodeGen, JsonCodeGen, NullCodeGen
+from pysmi.parser import SmiV1CompatParser, CachingParser
+from pysmi.codegen import PySnmpCodeGen, JsonCodeGen, BinaryCodeGen, NullCodeGen
+from pysmi.codegen.symtable import SymtableCache
 from pysmi.compiler import MibCompiler
 from pysmi import debug
 from pysmi import error
@@ -24,11 +25,14 @@ from pysmi import error
 verboseFlag = True
 mibSources = []
 doFuzzyMatchingFlag = True
+updateSourceIndexFlag = False
 mibSearchers = []
 mibStubs = []
 mibBorrowers = []
 dstFormat = None
 cacheDirectory = ''
+sourceCacheDirectory = ''
+missingCacheDirectory = ''
 nodepsFlag = False
 rebuildFlag = False
 dryrunFlag = False
@@ -37,6 +41,9 @@ pyCompileFlag = True
 pyOptimizationLevel = 0
 ignoreErrorsFlag = False
 buildIndexFlag = False
+jobsCount = 1
+scanHeadersFlag = False
+jsonCompactFlag = False
 
 helpMessage = """\
 Usage: %s [--help]
@@ -45,12 +52,15 @@ Usage: %s [--help]
       [--debug=<%s>]
       [--mib-source=<url>]
       [--disable-fuzzy-source]
+      [--update-source-index]
       [--mib-searcher=<path|package>]
       [--mib-stub=<mibname>]
       [--mib-borrower=<path>]
       [--destination-format=<format>]
       [--destination-directory=<directory>]
       [--cache-directory=<directory>]
+      [--source-cache-directory=<directory>]
+      [--missing-cache-directory=<directory>]
       [--no-dependencies]
       [--no-python-compile]
       [--python-optimization-level]
@@ -59,12 +69,16 @@ Usage: %s [--help]
       [--rebuild]
       [--dry-run]
       [--generate-mib-texts]
+      [--jobs=<count>]
+      [--scan-headers]
+      [--json-compact]
       [ mibfile [ mibfile [...]]]
 Where:
     url      - file, http, https, ftp, sftp schemes are supported. 
                Use @mib@ placeholder token in URL location to refer
-               to MIB module name requested.
-    format   - pysnmp, json, null""" % (
+               to MIB module name requested. Use zip or tar scheme to
+               refer to a ZIP or (compressed) tar archive of MIB files.
+    format   - pysnmp, json, binary, null""" % (
     sys.argv[0],
     '|'.join([x for x in sorted(debug.flagMap)])
 )
@@ -74,9 +88,11 @@ try:
                                     ['help', 'version', 'quiet', 'debug=',
                                      'mib-source=', 'mib-searcher=', 'mib-stub=', 'mib-borrower=',
                                      'destination-format=', 'destination-directory=', 'cache-directory=',
+                                     'source-cache-directory=', 'missing-cache-directory=',
                                      'no-dependencies', 'no-python-compile', 'python-optimization-level=',
                                      'ignore-errors', 'build-index', 'rebuild', 'dry-run',
-                                     'generate-mib-texts', 'disable-fuzzy-source']
+                                     'generate-mib-texts', 'disable-fuzzy-source', 'update-source-index', 'jobs=',
+                                     'scan-headers', 'json-compact']
                                     )
 except getopt.GetoptError:
     if verboseFlag:
@@ -121,6 +137,10 @@ Software documentation and support at http://pysmi.sf.net
         dstDirectory = opt[1]
     if opt[0] == '--cache-directory':
         cacheDirectory = opt[1]
+    if opt[0] == '--source-cache-directory':
+        sourceCacheDirectory = opt[1]
+    if opt[0] == '--missing-cache-directory':
+        missingCacheDirectory = opt[1]
     if opt[0] == '--no-dependencies':
         nodepsFlag = True
     if opt[0] == '--no-python-compile':
@@ -143,6 +163,18 @@ Software documentation and support at http://pysmi.sf.net
         genMibTextsFlag = True
     if opt[0] == '--disable-fuzzy-source':
         doFuzzyMatchingFlag = False
+    if opt[0] == '--update-source-index':
+        updateSourceIndexFlag = True
+    if opt[0] == '--jobs':
+        try:
+            jobsCount = int(opt[1])
+        except ValueError:
+            sys.stderr.write('ERROR: number of jobs must be an integer\r\n%s\r\n' % helpMessage)
+            sys.exit(-1)
+    if opt[0] == '--scan-headers':
+        scanHeadersFlag = True
+    if opt[0] == '--json-compact':
+        jsonCompactFlag = True
 
 if inputMibs:
     mibSources.extend(list(set(['file://' + os.path.abspath(os.path.dirname(x))
@@ -160,6 +192,15 @@ if not mibSources:
 if not dstFormat:
     dstFormat = 'pysnmp'
 
+
+def getCachingReadersFromUrls(*sourceUrls, **options):
+    readers = getReadersFromUrls(*sourceUrls, **options)
+    if sourceCacheDirectory:
+        # local files are not worth caching
+        readers = [isinstance(x, (FileReader, ZipReader, TarReader)) and x or CachingReader(x, sourceCacheDirectory) for x in readers]
+    return readers
+
+
 if dstFormat == 'pysnmp':
     if not mibSearchers:
         mibSearchers = PySnmpCodeGen.defaultMibPackages
@@ -180,7 +221,8 @@ if dstFormat == 'pysnmp':
     # Compiler infrastructure
 
     borrowers = [PyFileBorrower(x[1], genTexts=mibBorrowers[x[0]][1])
-                 for x in enumerate(getReadersFromUrls(*[m[0] for m in mibBorrowers], **dict(lowcaseMatching=False)))]
+                 for x in enumerate(getCachingReadersFromUrls(*[m[0] for m in mibBorrowers],
+                                                              **dict(lowcaseMatching=False)))]
 
     searchers = [PyFileSearcher(dstDirectory)]
 
@@ -207,14 +249,36 @@ elif dstFormat == 'json':
     # Compiler infrastructure
 
     borrowers = [AnyFileBorrower(x[1], genTexts=mibBorrowers[x[0]][1]).setOptions(exts=['.json'])
-                 for x in enumerate(getReadersFromUrls(*[m[0] for m in mibBorrowers], **dict(lowcaseMatching=False)))]
+                 for x in enumerate(getCachingReadersFromUrls(*[m[0] for m in mibBorrowers],
+                                                              **dict(lowcaseMatching=False)))]
 
     searchers = [AnyFileSearcher(dstDirectory).setOptions(exts=['.json']), StubSearcher(*mibStubs)]
 
     codeGenerator = JsonCodeGen()
 
+    if jsonCompactFlag:
+        codeGenerator.setOptions(jsonIndent=None)
+
     fileWriter = FileWriter(dstDirectory).setOptions(suffix='.json')
 
+elif dstFormat == 'binary':
+    if not mibStubs:
+        mibStubs = BinaryCodeGen.baseMibs
+
+    dstDirectory = os.path.join('.')
+
+    # Compiler infrastructure
+
+    borrowers = [AnyFileBorrower(x[1], genTexts=mibBorrowers[x[0]][1]).setOptions(exts=['.bin'])
+                 for x in enumerate(getCachingReadersFromUrls(*[m[0] for m in mibBorrowers],
+                                                              **dict(lowcaseMatching=False)))]
+
+    searchers = [AnyFileSearcher(dstDirectory).setOptions(exts=['.bin']), StubSearcher(*mibStubs)]
+
+    codeGenerator = BinaryCodeGen()
+
+    fileWriter = FileWriter(dstDirectory).setOptions(suffix='.bin')
+
 elif dstFormat == 'null':
     if not mibStubs:
         mibStubs = NullCodeGen.baseMibs
@@ -232,7 +296,8 @@ elif dstFormat == 'null':
     searchers = [StubSearcher(*mibStubs)]
 
     borrowers = [AnyFileBorrower(x[1], genTexts=mibBorrowers[x[0]][1])
-                 for x in enumerate(getReadersFromUrls(*[m[0] for m in mibBorrowers], **dict(lowcaseMatching=False)))]
+                 for x in enumerate(getCachingReadersFromUrls(*[m[0] for m in mibBorrowers],
+                                                              **dict(lowcaseMatching=False)))]
 
     fileWriter = CallbackWriter(lambda *x: None)
 
@@ -248,7 +313,9 @@ Compiled MIBs destination directory: %s
 MIBs excluded from code generation: %s
 MIBs to compile: %s
 Destination format: %s
-Parser grammar cache directory: %s
+Parser grammar, AST and symbol table cache directory: %s
+Remote MIB sources cache directory: %s
+Missing remote MIBs cache directory: %s
 Also compile all relevant MIBs: %s
 Rebuild MIBs regardless of age: %s
 Do not create/update MIBs: %s
@@ -257,6 +324,10 @@ Ignore compilation errors: %s
 Generate OID->MIB index: %s
 Generate texts in MIBs: %s
 Try various filenames while searching for MIB module: %s
+Update .index files at local MIB sources: %s
+Parallel compilation jobs: %s
+Scan MIB headers to skip parsing up-to-date MIBs: %s
+Compact JSON output: %s
 """ % (', '.join(sorted(mibSources)),
        ', '.join(sorted([x[0] for x in mibBorrowers if x[1] == genMibTextsFlag])),
        ', '.join(mibSearchers),
@@ -265,6 +336,8 @@ Try various filenames while searching for MIB module: %s
        ', '.join(sorted(inputMibs)),
        dstFormat,
        cacheDirectory or 'not used',
+       sourceCacheDirectory or 'not used',
+       missingCacheDirectory or 'not used',
        nodepsFlag and 'no' or 'yes',
        rebuildFlag and 'yes' or 'no',
        dryrunFlag and 'yes' or 'no',
@@ -273,20 +346,39 @@ Try various filenames while searching for MIB module: %s
        ignoreErrorsFlag and 'yes' or 'no',
        buildIndexFlag and 'yes' or 'no',
        genMibTextsFlag and 'yes' or 'no',
-       doFuzzyMatchingFlag and 'yes' or 'no'))
+       doFuzzyMatchingFlag and 'yes' or 'no',
+       updateSourceIndexFlag and 'yes' or 'no',
+       jobsCount,
+       scanHeadersFlag and 'yes' or 'no',
+       dstFormat == 'json' and jsonCompactFlag and 'yes' or 'no'))
 
 # Initialize compiler infrastructure
 
+mibParser = SmiV1CompatParser(tempdir=cacheDirectory)
+
+if cacheDirectory:
+    mibParser = CachingParser(mibParser, os.path.join(cacheDirectory, 'ast'))
+
 mibCompiler = MibCompiler(
-    SmiV1CompatParser(tempdir=cacheDirectory),
+    mibParser,
     codeGenerator,
     fileWriter
 )
 
+if cacheDirectory:
+    mibCompiler.setSymtableCache(SymtableCache(os.path.join(cacheDirectory, 'symtables')))
+
+if missingCacheDirectory:
+    mibCompiler.setNegativeCache(NegativeCache(missingCacheDirectory))
+
+if dstDirectory:
+    mibCompiler.setManifest(Manifest(dstDirectory))
+
 try:
     mibCompiler.addSources(
-        *getReadersFromUrls(
-            *mibSources, **dict(fuzzyMatching=doFuzzyMatchingFlag)
+        *getCachingReadersFromUrls(
+            *mibSources, **dict(fuzzyMatching=doFuzzyMatchingFlag,
+                                updateIndexFile=updateSourceIndexFlag)
         )
     )
 
@@ -299,7 +391,9 @@ try:
                                            rebuild=rebuildFlag,
                                            dryRun=dryrunFlag,
                                            genTexts=genMibTextsFlag,
-                                           ignoreErrors=ignoreErrorsFlag))
+                                           ignoreErrors=ignoreErrorsFlag,
+                                           jobs=jobsCount,
+                                           scanHeaders=scanHeadersFlag))
 
     if buildIndexFlag:
         mibCompiler.buildIndex(
@@ -52,6 +52,7 @@ if sys.version_info[:2] < (2, 4):
 
 try:
     from setuptools import setup, Command
+    from setuptools.command.build_py import build_py
 
     params = {'install_requires': ['ply'], 'zip_safe': True}
 
@@ -61,6 +62,7 @@ except ImportError:
             howto_install_setuptools()
             sys.exit(1)
     from distutils.core import setup, Command
+    from distutils.command.build_py import build_py
 
     params = {}
     if sys.version_info[:2] > (2, 4):
@@ -85,12 +87,39 @@ params.update({
                  'pysmi.searcher',
                  'pysmi.lexer',
                  'pysmi.parser',
+                 'pysmi.parser.tables',
                  'pysmi.codegen',
                  'pysmi.borrower',
                  'pysmi.writer'],
     'scripts': [os.path.join('scripts', 'mibdump.py')]
 })
 
+
+# pre-build parser tables for standard grammar dialects
+class BuildPy(build_py):
+    def run(self):
+        build_py.run(self)
+
+        if self.dry_run:
+            return
+
+        try:
+            from pysmi.parser.smi import buildTables
+
+        except ImportError:
+            sys.stderr.write('WARNING: parser tables not built: %s\n' % sys.exc_info()[1])
+            return
+
+        outputdir = os.path.join(self.build_lib, 'pysmi', 'parser', 'tables')
+
+        tableFiles = [os.path.join(outputdir, name + '.py') for name in buildTables(outputdir)]
+
+        if self.compile:
+            self.byte_compile(tableFiles)
+
+
+params['cmdclass'] = {'build_py': BuildPy}
+
 # handle unittest discovery feature
 if sys.version_info[0:2] < (2, 7) or \
                 sys.version_info[0:2] in ((3, 0), (3, 1)):
@@ -114,6 +143,6 @@ if unittest:
             unittest.TextTestRunner(verbosity=2).run(suite)
 
 
-    params['cmdclass'] = {'test': PyTest}
+    params['cmdclass']['test'] = PyTest
 
 setup(**params)
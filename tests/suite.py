@@ -22,6 +22,24 @@ import test_traptype_smiv2_pysnmp
 import test_typedeclaration_smiv2_pysnmp
 import test_typedeclaration_smiv1_pysnmp
 import test_valuedeclaration_smiv2_pysnmp
+import test_localfile_reader
+import test_compiler
+import test_depgraph
+import test_parser_cache
+import test_parser_tables
+import test_parser_pool
+import test_lexer_fast
+import test_header_scanner
+import test_resolver
+import test_symtable
+import test_writer
+import test_jsondoc
+import test_binary
+import test_http_reader
+import test_ftp_reader
+import test_aio
+import test_caching_reader
+import test_archive_reader
 
 testModules = [x[1] for x in globals().items() if x[0][:5] == 'test_']
 
@@ -0,0 +1,111 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.reader.localfile import FileReader
+from pysmi.searcher.stub import StubSearcher
+from pysmi.writer.callback import CallbackWriter
+from pysmi.parser.smi import parserFactory
+from pysmi.codegen.pysnmp import PySnmpCodeGen
+from pysmi.compiler import MibCompiler
+
+if sys.version_info[:2] >= (3, 5):
+    import asyncio
+    from pysmi.reader.aio import AsyncReader, fetchMibs
+    from pysmi.aiocompiler import AsyncMibCompiler
+
+
+class SlowReader(FileReader):
+    """Blocking reader taking its time, keeps track of requests."""
+
+    def __init__(self, path):
+        FileReader.__init__(self, path)
+        self.lock = threading.Lock()
+        self.requests = []
+        self.active = self.maxActive = 0
+
+    def getData(self, mibname):
+        with self.lock:
+            self.requests.append(mibname)
+            self.active += 1
+            self.maxActive = max(self.active, self.maxActive)
+        try:
+            time.sleep(0.05)
+            return FileReader.getData(self, mibname)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+@unittest.skipIf(sys.version_info[:2] < (3, 5), 'asyncio not supported')
+class AsyncCompilerTestCase(unittest.TestCase):
+    mibs = {
+        'A-MIB.txt': 'A-MIB DEFINITIONS ::= BEGIN\nIMPORTS testB FROM B-MIB testC FROM C-MIB;\n'
+                     'testA OBJECT IDENTIFIER ::= { testB 1 }\nEND\n',
+        'B-MIB.txt': 'B-MIB DEFINITIONS ::= BEGIN\nIMPORTS testD FROM D-MIB;\n'
+                     'testB OBJECT IDENTIFIER ::= { 1 3 6 1 3 }\nEND\n',
+        'C-MIB.txt': 'C-MIB DEFINITIONS ::= BEGIN\nIMPORTS testD FROM D-MIB;\n'
+                     'testC OBJECT IDENTIFIER ::= { 1 3 6 1 4 }\nEND\n',
+        'D-MIB.txt': 'D-MIB DEFINITIONS ::= BEGIN\n'
+                     'testD OBJECT IDENTIFIER ::= { 1 3 6 1 5 }\nEND\n',
+    }
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        for name in self.mibs:
+            fp = open(os.path.join(self.path, name), 'w')
+            fp.write(self.mibs[name])
+            fp.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def runLoop(self, coroutine):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            loop.close()
+
+    def testFetchImportClosure(self):
+        reader = SlowReader(self.path)
+        fetched = self.runLoop(fetchMibs([AsyncReader(reader)], 'A-MIB'))
+        self.assertEqual(sorted([x for x in fetched if fetched[x]]), ['A-MIB', 'B-MIB', 'C-MIB', 'D-MIB'],
+                         'import closure not fetched')
+        self.assertEqual(sorted(reader.requests), sorted(set(reader.requests)), 'MIB fetched more than once')
+        self.assertTrue(reader.maxActive > 1, 'MIBs not fetched concurrently')
+
+    def testCompileAsync(self):
+        def compileMibs(compilerClass, source):
+            mibCompiler = compilerClass(parserFactory()(), PySnmpCodeGen(), CallbackWriter(lambda *x: None))
+            mibCompiler.addSources(source)
+            mibCompiler.addSearchers(StubSearcher(*PySnmpCodeGen.baseMibs))
+            if compilerClass is AsyncMibCompiler:
+                processed = self.runLoop(mibCompiler.compileAsync('A-MIB', ignoreErrors=True))
+            else:
+                processed = mibCompiler.compile('A-MIB', ignoreErrors=True)
+            return dict([(x, str(processed[x])) for x in processed])
+
+        reader = SlowReader(self.path)
+        self.assertEqual(compileMibs(AsyncMibCompiler, AsyncReader(reader)),
+                         compileMibs(MibCompiler, FileReader(self.path)), 'asynchronous compilation outcome differs')
+        self.assertEqual(sorted(reader.requests), sorted(set(reader.requests)), 'MIB fetched more than once')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+import os
+import io
+import time
+import shutil
+import tarfile
+import zipfile
+import tempfile
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.reader.archive import ZipReader, TarReader
+from pysmi.reader.url import getReadersFromUrls
+from pysmi import error
+
+
+class ArchiveReaderTestCase(unittest.TestCase):
+    members = {'mibs/vendor/IF-MIB.txt': 'IF-MIB DEFINITIONS ::= BEGIN\nEND',
+               'mibs/IF-MIB.my': 'IF-MIB DEFINITIONS ::= BEGIN\n-- preferred\nEND',
+               'mibs/vendor/ip-mib': 'IP-MIB DEFINITIONS ::= BEGIN\nEND'}
+
+    mtime = time.mktime((2016, 1, 2, 3, 4, 6, 0, 0, -1))
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def makeZip(self):
+        path = os.path.join(self.path, 'mibs.zip')
+        archive = zipfile.ZipFile(path, 'w')
+        archive.writestr(zipfile.ZipInfo('mibs/'), '')
+        for name in sorted(self.members):
+            archive.writestr(zipfile.ZipInfo(name, time.localtime(self.mtime)[:6]), self.members[name])
+        archive.close()
+        return path
+
+    def makeTar(self, compression='gz'):
+        path = os.path.join(self.path, 'mibs.tar' + (compression and '.' + compression or ''))
+        archive = tarfile.open(path, 'w:' + compression)
+        for name in sorted(self.members):
+            data = self.members[name].encode()
+            tarInfo = tarfile.TarInfo(name)
+            tarInfo.size = len(data)
+            tarInfo.mtime = self.mtime
+            archive.addfile(tarInfo, io.BytesIO(data))
+        archive.close()
+        return path
+
+    def fetchMibs(self, reader):
+        mibInfo, mibData = reader.getData('IF-MIB')
+        self.assertEqual(mibData, self.members['mibs/IF-MIB.my'], 'top-level member not preferred')
+        self.assertEqual(mibInfo.mtime, self.mtime, 'wrong MIB mtime')
+        self.assertEqual(mibInfo.file, 'IF-MIB.my', 'wrong MIB file')
+
+        mibInfo, mibData = reader.getData('IP-MIB')
+        self.assertEqual(mibData, self.members['mibs/vendor/ip-mib'], 'fuzzy matched member not found')
+
+        self.assertRaises(error.PySmiReaderFileNotFoundError, reader.getData, 'MISSING-MIB')
+
+        reader.close()
+
+    def testZipReader(self):
+        self.fetchMibs(ZipReader(self.makeZip()))
+
+    def testTarReader(self):
+        self.fetchMibs(TarReader(self.makeTar()))
+
+    def testUncompressedTarReader(self):
+        reader = TarReader(self.makeTar(compression=''))
+        reader.getFileIndex()
+        self.assertFalse(reader.compressed, 'uncompressed archive considered compressed')
+        self.fetchMibs(reader)
+
+    def testCompressedTarReadOnce(self):
+        reader = TarReader(self.makeTar())
+        reader.getFileIndex()
+        self.assertTrue(reader.compressed, 'compressed archive not detected')
+
+        def extractfile(member):
+            raise tarfile.TarError('compressed archive member read out of order')
+
+        reader._archive.extractfile = extractfile
+        self.fetchMibs(reader)
+
+    def testReadersFromUrls(self):
+        readers = getReadersFromUrls('zip://' + self.makeZip(), 'tar://' + self.makeTar())
+        self.assertEqual([x.__class__ for x in readers], [ZipReader, TarReader], 'wrong readers')
+        for reader in readers:
+            self.fetchMibs(reader)
+
+    def testMissingArchive(self):
+        self.assertRaises(error.PySmiReaderFileNotFoundError,
+                          ZipReader(os.path.join(self.path, 'missing.zip')).getData, 'IF-MIB')
+        self.assertRaises(error.PySmiError,
+                          TarReader(os.path.join(self.path, 'missing.tar'), ignoreErrors=False).getData, 'IF-MIB')
+
+
+if __name__ == '__main__':
+    unittest.main()
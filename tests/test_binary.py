@@ -0,0 +1,113 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+try:
+    from collections import OrderedDict
+except ImportError:
+    from ordereddict import OrderedDict
+
+from pysmi.parser.smi import parserFactory
+from pysmi.codegen.binary import BinaryCodeGen, BinaryMib
+from pysmi.codegen.jsondoc import JsonCodeGen
+from pysmi.codegen.symtable import SymtableCodeGen
+from pysmi.writer.localfile import FileWriter
+from pysmi import error
+
+if sys.version_info[0] > 2:
+    # noinspection PyShadowingBuiltins
+    unichr = chr
+
+
+class BinaryMibTestCase(unittest.TestCase):
+    """
+TEST-MIB DEFINITIONS ::= BEGIN
+IMPORTS
+  OBJECT-TYPE, Integer32
+    FROM SNMPv2-SMI;
+
+testTable  OBJECT IDENTIFIER ::= { 1 3 }
+
+testObject OBJECT-TYPE
+    SYNTAX          INTEGER { enable(1), disable(2) }
+    MAX-ACCESS      read-only
+    STATUS          current
+    DESCRIPTION     "Test object"
+    DEFVAL          { enable }
+ ::= { testTable 1 }
+
+testValue OBJECT-TYPE
+    SYNTAX          Integer32 (-2147483648..2147483647)
+    MAX-ACCESS      read-only
+    STATUS          current
+    DESCRIPTION     "Test value"
+ ::= { testTable 4294967295 }
+
+END
+ """
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def writeDocument(self, data):
+        FileWriter(self.path).putData('TEST-MIB', data)
+        return os.path.join(self.path, 'TEST-MIB')
+
+    def testSameAsJson(self):
+        ast = parserFactory()().parse(self.__class__.__doc__)[0]
+        mibInfo, symtable = SymtableCodeGen().genCode(ast, {}, genTexts=True)
+        symbolTableMap = {mibInfo.name: symtable}
+
+        mibInfo, data = BinaryCodeGen().genCode(ast, symbolTableMap, genTexts=True, chunked=True)
+        mib = BinaryMib(self.writeDocument(data))
+
+        mibInfo, text = JsonCodeGen().genCode(ast, symbolTableMap, genTexts=True)
+        document = json.loads(text, object_pairs_hook=OrderedDict)
+
+        self.assertEqual(mib.keys(), list(document), 'items order differs')
+        self.assertEqual(mib['testObject'], document['testObject'], 'item differs')
+        self.assertEqual(dict([(x, mib[x]) for x in mib]), document, 'document differs')
+
+        mib.close()
+
+    def testValues(self):
+        document = OrderedDict(
+            [('z', {'oid': '1.3.6.1', 'oids': ['0.0', '1.99999999999'], 'text': unichr(0x20ac)}),
+             ('a', [None, True, False, -1, 2 ** 64, 0.5, {1: '2'}]),
+             ('m', {})]
+        )
+        mib = BinaryMib(self.writeDocument(BinaryCodeGen().genDocument(document)))
+
+        self.assertEqual(len(mib), 3, 'wrong number of items')
+        self.assertEqual(mib.keys(), ['z', 'a', 'm'], 'items order differs')
+        self.assertEqual(mib['z'], document['z'], 'item differs')
+        self.assertEqual(mib['a'], [None, True, False, -1, 2 ** 64, 0.5, {'1': '2'}], 'item differs')
+        self.assertEqual(mib.get('m'), {}, 'item differs')
+        self.assertFalse('x' in mib, 'unexpected item found')
+        self.assertRaises(KeyError, lambda: mib['x'])
+
+        mib.close()
+
+    def testBadFile(self):
+        self.assertRaises(error.PySmiError, BinaryMib, self.writeDocument('{}'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+import os
+import shutil
+import tempfile
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.reader.base import AbstractReader
+from pysmi.reader.cache import CachingReader
+from pysmi.mibinfo import MibInfo
+from pysmi import error
+
+
+class CountingReader(AbstractReader):
+    def __init__(self, mibs):
+        self.mibs = mibs
+        self.requests = []
+        self.failure = None
+
+    def __str__(self):
+        return self.__class__.__name__
+
+    def getData(self, mibname):
+        self.requests.append(mibname)
+        if self.failure:
+            raise self.failure
+        if mibname not in self.mibs:
+            raise error.PySmiReaderFileNotFoundError(mibname=mibname, reader=self)
+        return MibInfo(path='http://example.com/%s' % mibname, file=mibname,
+                       name=mibname, mtime=1.0), self.mibs[mibname]
+
+
+class CachingReaderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.reader = CountingReader({'IF-MIB': 'IF-MIB DEFINITIONS ::= BEGIN END'})
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def testServedFromCache(self):
+        first = CachingReader(self.reader, self.path).getData('IF-MIB')
+        second = CachingReader(self.reader, self.path).getData('IF-MIB')
+        self.assertEqual(self.reader.requests, ['IF-MIB'], 'cached MIB fetched again')
+        self.assertEqual((first[0].__dict__, first[1]), (second[0].__dict__, second[1]), 'cached MIB differs')
+
+    def testMissingCached(self):
+        for x in range(2):
+            self.assertRaises(error.PySmiReaderFileNotFoundError,
+                              CachingReader(self.reader, self.path).getData, 'MISSING-MIB')
+        self.assertEqual(self.reader.requests, ['MISSING-MIB'], 'missing MIB looked up again')
+
+    def testExpiredRefetched(self):
+        CachingReader(self.reader, self.path).getData('IF-MIB')
+        self.reader.failure = error.PySmiError('source failure')
+        mibInfo, mibData = CachingReader(self.reader, self.path).setOptions(maxAge=-1).getData('IF-MIB')
+        self.assertEqual(self.reader.requests, ['IF-MIB', 'IF-MIB'], 'expired MIB not fetched')
+        self.assertEqual(mibData, self.reader.mibs['IF-MIB'], 'stale MIB not served on failure')
+
+    def testExpiredKeptOnMiss(self):
+        CachingReader(self.reader, self.path).getData('IF-MIB')
+        self.reader.failure = error.PySmiReaderFileNotFoundError('source failure')
+        self.assertRaises(error.PySmiReaderFileNotFoundError,
+                          CachingReader(self.reader, self.path).setOptions(maxAge=-1).getData, 'IF-MIB')
+        self.reader.failure = error.PySmiError('source failure')
+        mibInfo, mibData = CachingReader(self.reader, self.path).setOptions(maxAge=-1).getData('IF-MIB')
+        self.assertEqual(mibData, self.reader.mibs['IF-MIB'], 'stale MIB lost on miss')
+
+    def testEviction(self):
+        for mibname in ('A-MIB', 'B-MIB', 'C-MIB'):
+            self.reader.mibs[mibname] = mibname * 100
+            CachingReader(self.reader, self.path).getData(mibname)
+        CachingReader(self.reader, self.path).setOptions(maxCacheSize=1000).evict()
+        self.assertEqual(len(os.listdir(self.path)), 1, 'cache not evicted to its size limit')
+
+    def testEvictionSparesOtherFiles(self):
+        unrelated = os.path.join(self.path, 'unrelated.txt')
+        fp = open(unrelated, 'w')
+        fp.write('unrelated' * 1000)
+        fp.close()
+        os.utime(unrelated, (0, 0))
+        CachingReader(self.reader, self.path).setOptions(maxCacheSize=0).getData('IF-MIB')
+        self.assertTrue(os.path.exists(unrelated), 'file not created by cache evicted')
+
+
+if __name__ == '__main__':
+    unittest.main()
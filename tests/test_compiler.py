@@ -0,0 +1,351 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+import os
+import shutil
+import tempfile
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.reader.localfile import FileReader
+from pysmi.reader.cache import NegativeCache
+from pysmi.borrower.anyfile import AnyFileBorrower
+from pysmi.searcher.stub import StubSearcher
+from pysmi.searcher.anyfile import AnyFileSearcher
+from pysmi.searcher.manifest import Manifest
+from pysmi.writer.base import AbstractWriter
+from pysmi.writer.callback import CallbackWriter
+from pysmi.writer.localfile import FileWriter
+from pysmi.writer.pyfile import PyFileWriter
+from pysmi.parser.smi import parserFactory
+from pysmi.codegen.pysnmp import PySnmpCodeGen
+from pysmi.codegen.jsondoc import JsonCodeGen
+from pysmi.codegen.binary import BinaryCodeGen
+from pysmi.codegen.symtable import SymtableCache
+from pysmi.compiler import MibCompiler
+from pysmi import error
+
+
+class CountingFileReader(FileReader):
+    def __init__(self, path, requests):
+        FileReader.__init__(self, path)
+        self.requests = requests
+
+    def getData(self, mibname):
+        self.requests.append(mibname)
+        return FileReader.getData(self, mibname)
+
+
+class LegacySearcher(object):
+    def __init__(self, *mibnames):
+        self.mibnames = mibnames
+
+    def fileExists(self, mibname, mtime, rebuild=False):
+        if mibname in self.mibnames:
+            raise error.PySmiFileNotModifiedError(mibname=mibname)
+        raise error.PySmiFileNotFoundError(mibname=mibname)
+
+
+class FaultySearcher(object):
+    calls = 0
+
+    def fileExists(self, mibname, mtime, rebuild=False, digest=None):
+        self.calls += 1
+        return mibname + 1
+
+
+class CrashingWriter(FileWriter):
+    written = ()
+
+    def putData(self, mibname, data, comments=(), dryRun=False):
+        if self.written:
+            raise RuntimeError('writer crashed')
+        FileWriter.putData(self, mibname, data, comments, dryRun)
+        self.written = mibname,
+
+
+class PlainWriter(AbstractWriter):
+    def __init__(self):
+        self.written = {}
+
+    def putData(self, mibname, data, comments=(), dryRun=False):
+        self.written[mibname] = data
+
+
+class CompilerTestCase(unittest.TestCase):
+    mibs = {
+        'A-MIB.txt': """
+A-MIB DEFINITIONS ::= BEGIN
+IMPORTS
+  OBJECT-TYPE
+    FROM SNMPv2-SMI
+  testB
+    FROM B-MIB;
+
+testA  OBJECT IDENTIFIER ::= { testB 1 }
+
+END
+""",
+        'B-MIB.txt': """
+B-MIB DEFINITIONS ::= BEGIN
+IMPORTS
+  OBJECT-TYPE
+    FROM SNMPv2-SMI;
+
+testB  OBJECT IDENTIFIER ::= { 1 3 6 1 3 }
+
+END
+""",
+        'C-MIB.txt': """
+C-MIB DEFINITIONS ::= BEGIN
+IMPORTS
+  testA
+    FROM A-MIB
+  testX
+    FROM BROKEN-MIB
+  testY
+    FROM MISSING-MIB;
+
+testC  OBJECT IDENTIFIER ::= { testA 2 }
+
+END
+""",
+        'BROKEN-MIB.txt': """
+BROKEN-MIB DEFINITIONS ::= BEGIN
+
+testX  OBJECT IDENTIFIER ::= {
+
+END
+"""
+    }
+
+    def setUp(self):
+        self.parsed = []
+        self.path = tempfile.mkdtemp()
+        for name in self.mibs:
+            fp = open(os.path.join(self.path, name), 'w')
+            fp.write(self.mibs[name])
+            fp.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def compileMibs(self, symtableCache=None, stubs=(), **options):
+        written = {}
+
+        def putData(mibname, data, cbCtx):
+            written[mibname] = '\n'.join([x for x in data.split('\n') if not x.startswith('#')])
+
+        parser = parserFactory()()
+        parse = parser.parse
+
+        def countingParse(data, **kwargs):
+            self.parsed.extend([x for x in self.mibs if self.mibs[x] == data])
+            return parse(data, **kwargs)
+
+        parser.parse = countingParse
+
+        mibCompiler = MibCompiler(parser, PySnmpCodeGen(), CallbackWriter(putData))
+        mibCompiler.addSources(FileReader(self.path))
+        mibCompiler.addSearchers(StubSearcher(*PySnmpCodeGen.baseMibs + tuple(stubs)))
+        mibCompiler.setSymtableCache(symtableCache)
+
+        processed = mibCompiler.compile('C-MIB', ignoreErrors=True, **options)
+
+        return dict([(x, str(processed[x])) for x in processed]), written
+
+    def testCompileSerial(self):
+        processed, written = self.compileMibs()
+        self.assertEqual(processed, {'A-MIB': 'compiled', 'B-MIB': 'compiled', 'C-MIB': 'compiled',
+                                     'BROKEN-MIB': 'failed', 'MISSING-MIB': 'missing',
+                                     'SNMPv2-SMI': 'missing', 'SNMPv2-TC': 'missing',
+                                     'SNMPv2-CONF': 'missing'}, 'unexpected MIB statuses')
+
+    def testCompileParallel(self):
+        self.assertEqual(self.compileMibs(jobs=2), self.compileMibs(),
+                         'parallel compilation outcome differs from serial')
+
+    def testScanHeaders(self):
+        self.assertEqual(self.compileMibs(scanHeaders=True), self.compileMibs(),
+                         'header scanning changes outcome')
+
+    def testScanHeadersFetchOnce(self):
+        requests = []
+        mibCompiler = MibCompiler(parserFactory()(), PySnmpCodeGen(), CallbackWriter(lambda *x: None))
+        mibCompiler.addSources(CountingFileReader(self.path, requests))
+        mibCompiler.addSearchers(StubSearcher(*PySnmpCodeGen.baseMibs))
+        mibCompiler.compile('A-MIB', ignoreErrors=True, scanHeaders=True)
+        self.assertEqual(sorted(requests), ['A-MIB', 'B-MIB', 'SNMPv2-CONF', 'SNMPv2-SMI', 'SNMPv2-TC'],
+                         'scanned MIB fetched again for parsing')
+
+    def testScanHeadersUpToDate(self):
+        processed, written = self.compileMibs(stubs=('A-MIB', 'B-MIB', 'C-MIB', 'BROKEN-MIB'), scanHeaders=True)
+        self.assertEqual(self.parsed, [], 'up to date MIB parsed')
+        self.assertEqual(processed, {'A-MIB': 'untouched', 'B-MIB': 'untouched', 'C-MIB': 'untouched',
+                                     'BROKEN-MIB': 'untouched'}, 'unexpected MIB statuses')
+
+    def testBuildIndex(self):
+        written = {}
+
+        def putData(mibname, data, cbCtx):
+            written[mibname] = data
+
+        mibCompiler = MibCompiler(parserFactory()(), PySnmpCodeGen(), CallbackWriter(putData))
+        mibCompiler.addSources(FileReader(self.path))
+        mibCompiler.addSearchers(StubSearcher(*PySnmpCodeGen.baseMibs))
+
+        processed = mibCompiler.compile('C-MIB', ignoreErrors=True)
+        self.assertEqual(processed['A-MIB'].oids, (((1, 3, 6, 1, 3, 1), 'testA'),), 'unexpected MIB OIDs')
+
+        mibCompiler.buildIndex(processed)
+
+        ctx = {}
+        exec(compile(written[MibCompiler.indexFile], 'index', 'exec'), ctx, ctx)
+        self.assertEqual(ctx['oidToSymbolIndex'], (((1, 3, 6, 1, 3), 'B-MIB', 'testB'),
+                                                   ((1, 3, 6, 1, 3, 1), 'A-MIB', 'testA'),
+                                                   ((1, 3, 6, 1, 3, 1, 2), 'C-MIB', 'testC')), 'unexpected OID index')
+
+    def testWriterWithoutChunks(self):
+        writer = PlainWriter()
+        mibCompiler = MibCompiler(parserFactory()(), PySnmpCodeGen(), writer)
+        mibCompiler.addSources(FileReader(self.path))
+        mibCompiler.addSearchers(StubSearcher(*PySnmpCodeGen.baseMibs))
+
+        mibCompiler.buildIndex(mibCompiler.compile('B-MIB', ignoreErrors=True))
+
+        self.assertEqual(sorted(writer.written), ['B-MIB', MibCompiler.indexFile], 'MIBs not written')
+        for mibname in writer.written:
+            self.assertTrue(isinstance(writer.written[mibname], str), 'chunks passed to writer not supporting them')
+
+    def testUpdateIndex(self):
+        symtableCache = SymtableCache(os.path.join(self.path, 'symtables'))
+        for codegen, writer in ((PySnmpCodeGen(), PyFileWriter(self.path)),
+                                (JsonCodeGen(), FileWriter(self.path).setOptions(suffix='.json')),
+                                (BinaryCodeGen(), FileWriter(self.path).setOptions(suffix='.bin'))):
+            for mibname, stubs in (('B-MIB', ()), ('A-MIB', ('B-MIB',))):
+                mibCompiler = MibCompiler(parserFactory()(), codegen, writer)
+                mibCompiler.addSources(FileReader(self.path))
+                mibCompiler.addSearchers(StubSearcher(*PySnmpCodeGen.baseMibs + stubs))
+                mibCompiler.setSymtableCache(symtableCache)
+                mibCompiler.buildIndex(mibCompiler.compile(mibname, ignoreErrors=True))
+
+            mibsMap = codegen.parseIndex(writer.getData(MibCompiler.indexFile))
+            self.assertEqual(dict([(x, mibsMap[x].oids) for x in mibsMap]),
+                             {'A-MIB': (((1, 3, 6, 1, 3, 1), 'testA'),), 'B-MIB': (((1, 3, 6, 1, 3), 'testB'),)},
+                             'unexpected OID index at %s' % codegen.__class__.__name__)
+
+    def testManifest(self):
+        dstPath = os.path.join(self.path, 'json')
+
+        def compileMib():
+            mibCompiler = MibCompiler(parserFactory()(), JsonCodeGen(),
+                                      FileWriter(dstPath).setOptions(suffix='.json'))
+            mibCompiler.addSources(FileReader(self.path))
+            mibCompiler.addSearchers(AnyFileSearcher(dstPath).setOptions(exts=['.json']),
+                                     StubSearcher(*JsonCodeGen.baseMibs))
+            mibCompiler.setManifest(Manifest(dstPath))
+            return str(mibCompiler.compile('B-MIB', ignoreErrors=True)['B-MIB'])
+
+        self.assertEqual(compileMib(), 'compiled', 'MIB not compiled')
+
+        # source looks newer, but its contents is the same
+        mibFile = os.path.join(self.path, 'B-MIB.txt')
+        os.utime(mibFile, (os.stat(mibFile).st_atime, os.stat(mibFile).st_mtime + 3600))
+        self.assertEqual(compileMib(), 'untouched', 'unchanged MIB compiled')
+
+        fp = open(mibFile, 'a')
+        fp.write('-- changed\n')
+        fp.close()
+        os.utime(mibFile, (os.stat(mibFile).st_atime, os.stat(mibFile).st_mtime - 7200))
+        self.assertEqual(compileMib(), 'compiled', 'changed MIB not compiled')
+
+    def testLegacySearcher(self):
+        mibCompiler = MibCompiler(parserFactory()(), PySnmpCodeGen(), CallbackWriter(lambda *x: None))
+        mibCompiler.addSources(FileReader(self.path))
+        mibCompiler.addSearchers(LegacySearcher(*PySnmpCodeGen.baseMibs + ('B-MIB',)))
+        processed = mibCompiler.compile('A-MIB', ignoreErrors=True)
+        self.assertEqual((str(processed['A-MIB']), str(processed['B-MIB'])), ('compiled', 'untouched'),
+                         'unexpected MIB statuses')
+
+    def testFaultySearcher(self):
+        searcher = FaultySearcher()
+        mibCompiler = MibCompiler(parserFactory()(), PySnmpCodeGen(), CallbackWriter(lambda *x: None))
+        mibCompiler.addSources(FileReader(self.path))
+        mibCompiler.addSearchers(searcher)
+        self.assertRaises(TypeError, mibCompiler.compile, 'A-MIB')
+        self.assertEqual(searcher.calls, 1, 'faulty searcher called again without digest')
+
+    def testManifestFlushedOnFailure(self):
+        dstPath = os.path.join(self.path, 'json')
+        writer = CrashingWriter(dstPath).setOptions(suffix='.json')
+        mibCompiler = MibCompiler(parserFactory()(), JsonCodeGen(), writer)
+        mibCompiler.addSources(FileReader(self.path))
+        mibCompiler.addSearchers(StubSearcher(*JsonCodeGen.baseMibs))
+        mibCompiler.setManifest(Manifest(dstPath))
+        self.assertRaises(RuntimeError, mibCompiler.compile, 'A-MIB', ignoreErrors=True)
+        mibname, = writer.written
+        self.assertTrue(Manifest(dstPath).isUpToDate(mibname, Manifest.getDigest(self.mibs[mibname + '.txt'])),
+                        'written MIB not recorded in manifest')
+
+    def testSymtableCache(self):
+        symtableCache = SymtableCache(os.path.join(self.path, 'symtables'))
+        self.compileMibs(symtableCache)
+        self.parsed = []
+        processed, written = self.compileMibs(symtableCache, stubs=('B-MIB',))
+        self.assertEqual(sorted(self.parsed), ['A-MIB.txt', 'BROKEN-MIB.txt', 'C-MIB.txt'], 'up to date MIB parsed')
+        self.assertEqual((processed, written), self.compileMibs(stubs=('B-MIB',)),
+                         'cached symbol tables change outcome')
+
+    def compileWithNegativeCache(self, mibname, requests, remote=True, **options):
+        mibCompiler = MibCompiler(parserFactory()(), JsonCodeGen(), CallbackWriter(lambda *x: None))
+        mibCompiler.addSources(CountingFileReader(self.path, requests).setOptions(remote=remote))
+        mibCompiler.addSearchers(StubSearcher(*JsonCodeGen.baseMibs))
+        mibCompiler.addBorrowers(
+            AnyFileBorrower(CountingFileReader(self.path, requests).setOptions(remote=remote)).setOptions(exts=['.json'])
+        )
+        mibCompiler.setNegativeCache(NegativeCache(os.path.join(self.path, 'cache')).setOptions(**options))
+        return str(mibCompiler.compile(mibname, ignoreErrors=True)[mibname])
+
+    def testNegativeCache(self):
+        requests = []
+
+        self.assertEqual(self.compileWithNegativeCache('MISSING-MIB', requests), 'missing', 'missing MIB found')
+        self.assertEqual(requests, ['MISSING-MIB'] * 2, 'missing MIB not looked up at source and borrower')
+        self.assertEqual(self.compileWithNegativeCache('MISSING-MIB', requests), 'missing', 'missing MIB found')
+        self.assertEqual(requests, ['MISSING-MIB'] * 2, 'missing MIB looked up again')
+        self.compileWithNegativeCache('MISSING-MIB', requests, ttl=-1)
+        self.assertEqual(requests, ['MISSING-MIB'] * 4, 'expired miss not looked up again')
+
+    def testNegativeCacheLocalReader(self):
+        requests = []
+
+        self.assertEqual(self.compileWithNegativeCache('NEW-MIB', requests, remote=False), 'missing',
+                         'missing MIB found')
+
+        fp = open(os.path.join(self.path, 'NEW-MIB.txt'), 'w')
+        fp.write(self.mibs['B-MIB.txt'].replace('B-MIB', 'NEW-MIB'))
+        fp.close()
+
+        self.assertEqual(self.compileWithNegativeCache('NEW-MIB', requests, remote=False), 'compiled',
+                         'MIB added to local source not found')
+
+    def testNegativeCacheFound(self):
+        requests = []
+        negativeCache = NegativeCache(os.path.join(self.path, 'cache'))
+        negativeCache.setMissing(CountingFileReader(self.path, requests), 'B-MIB', missing=True)
+        negativeCache.flush()
+
+        self.assertEqual(self.compileWithNegativeCache('B-MIB', requests, ttl=-1), 'compiled', 'MIB not found')
+        self.assertFalse(NegativeCache(os.path.join(self.path, 'cache')).isMissing(
+            CountingFileReader(self.path, requests), 'B-MIB'), 'found MIB still recorded missing')
+
+
+if __name__ == '__main__':
+    unittest.main()
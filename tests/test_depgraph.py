@@ -0,0 +1,53 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.depgraph import DependencyGraph
+
+
+class DependencyGraphTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = DependencyGraph('A-MIB', 'B-MIB')
+        self.graph.addImports('A-MIB', ('B-MIB', 'C-MIB'))
+        self.graph.addImports('B-MIB', ('C-MIB',))
+        self.graph.addImports('C-MIB', ())
+
+    def testQueueDeduplicated(self):
+        queued = []
+        while self.graph:
+            queued.append(self.graph.pop())
+        self.assertEqual(queued, ['A-MIB', 'B-MIB', 'C-MIB'], 'bad queue order')
+
+    def testNewNamesReported(self):
+        self.assertEqual(self.graph.addImports('D-MIB', ('C-MIB', 'E-MIB')), ['E-MIB'], 'bad names queued')
+
+    def testOrder(self):
+        self.assertEqual(self.graph.getOrder(), ['C-MIB', 'B-MIB', 'A-MIB'], 'bad dependency order')
+
+    def testOrderOfSubset(self):
+        self.assertEqual(self.graph.getOrder(['A-MIB', 'C-MIB']), ['C-MIB', 'A-MIB'], 'bad dependency order')
+
+    def testImporters(self):
+        self.assertEqual(self.graph.getImporters('C-MIB'), ['A-MIB', 'B-MIB'], 'bad importers')
+
+    def testNoCycles(self):
+        self.assertEqual(self.graph.getCycles(), [], 'false cycle detected')
+
+    def testCycles(self):
+        self.graph.addImports('C-MIB', ('A-MIB',))
+        self.assertEqual(self.graph.getCycles(), [('A-MIB', 'B-MIB', 'C-MIB')],
+                         'cycles not detected')
+        self.assertEqual(sorted(self.graph.getOrder()), ['A-MIB', 'B-MIB', 'C-MIB'], 'cycle not broken')
+
+
+if __name__ == '__main__':
+    unittest.main()
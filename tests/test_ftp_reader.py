@@ -0,0 +1,163 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+import socket
+import calendar
+import threading
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+try:
+    from SocketServer import ThreadingTCPServer, StreamRequestHandler
+
+except ImportError:
+    from socketserver import ThreadingTCPServer, StreamRequestHandler
+
+from pysmi.reader.ftpclient import FtpReader
+from pysmi import error
+
+
+class FtpServer(ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, files, mlsd=True):
+        self.files = files  # k, v = path, (MDTM timestamp, contents)
+        self.mlsd = mlsd
+        self.busy = 0  # number of listing commands to fail transiently
+        self.commands = []
+        self.sessions = 0
+        ThreadingTCPServer.__init__(self, ('127.0.0.1', 0), FtpRequestHandler)
+
+
+class FtpRequestHandler(StreamRequestHandler):
+    """Just enough of FTP server for ftplib to talk to."""
+
+    def reply(self, line):
+        self.wfile.write((line + '\r\n').encode())
+
+    def transfer(self, lines):
+        self.reply('150 opening data connection')
+        conn, addr = self.dataSock.accept()
+        conn.sendall(''.join([x + '\r\n' for x in lines]).encode())
+        conn.close()
+        self.dataSock.close()
+        self.reply('226 transfer complete')
+
+    def listDirectory(self, directory):
+        return [(path.split('/')[-1], self.server.files[path][0]) for path in sorted(self.server.files)
+                if path.rsplit('/', 1)[0] == directory.rstrip('/')]
+
+    def handle(self):
+        self.server.sessions += 1
+        self.reply('220 ready')
+        while True:
+            line = self.rfile.readline().decode().strip()
+            if not line:
+                return
+            cmd, _, arg = line.partition(' ')
+            cmd = cmd.upper()
+            self.server.commands.append((cmd, arg))
+            if cmd == 'USER':
+                self.reply('331 password please')
+            elif cmd in ('PASS', 'TYPE'):
+                self.reply('230 ok')
+            elif cmd == 'PASV':
+                self.dataSock = socket.socket()
+                self.dataSock.bind(('127.0.0.1', 0))
+                self.dataSock.listen(1)
+                port = self.dataSock.getsockname()[1]
+                self.reply('227 passive (127,0,0,1,%d,%d)' % (port >> 8, port & 0xff))
+            elif cmd in ('MLSD', 'NLST') and self.server.busy:
+                self.server.busy -= 1
+                self.dataSock.close()
+                self.reply('450 busy')
+            elif cmd == 'MLSD' and self.server.mlsd:
+                self.transfer(['type=file;modify=%s; %s' % (t, n) for n, t in self.listDirectory(arg)])
+            elif cmd == 'NLST':
+                self.transfer([n for n, t in self.listDirectory(arg)])
+            elif cmd == 'MDTM' and arg in self.server.files:
+                self.reply('213 %s' % self.server.files[arg][0])
+            elif cmd == 'RETR' and arg in self.server.files:
+                self.transfer(self.server.files[arg][1].split('\n'))
+            elif cmd == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                if cmd in ('MLSD', 'NLST', 'RETR'):
+                    self.dataSock.close()
+                self.reply('550 no such file or command')
+
+
+class FtpReaderTestCase(unittest.TestCase):
+    files = {'/mibs/IF-MIB.txt': ('20160102030405', 'IF-MIB DEFINITIONS ::= BEGIN\nEND'),
+             '/mibs/IP-MIB.txt': ('20160102030405.123', 'IP-MIB DEFINITIONS ::= BEGIN\nEND')}
+
+    mtime = calendar.timegm((2016, 1, 2, 3, 4, 5, 0, 0, 0))
+
+    def startServer(self, mlsd):
+        self.server = FtpServer(dict(self.files), mlsd)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.reader = FtpReader('127.0.0.1', '/mibs/@mib@', port=self.server.server_address[1])
+
+    def tearDown(self):
+        self.reader.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def fetchMibs(self, mlsd):
+        self.startServer(mlsd)
+
+        for mibname in ('IF-MIB', 'IP-MIB'):
+            mibInfo, mibData = self.reader.getData(mibname)
+            self.assertEqual(mibData, self.files['/mibs/%s.txt' % mibname][1], 'wrong MIB contents')
+            self.assertEqual(mibInfo.mtime, self.mtime, 'wrong MIB mtime')
+
+        self.assertRaises(error.PySmiReaderFileNotFoundError, self.reader.getData, 'MISSING-MIB')
+
+        self.assertEqual(self.server.sessions, 1, 'FTP session not reused')
+        self.assertEqual([x[1] for x in self.server.commands if x[0] == 'RETR'],
+                         ['/mibs/IF-MIB.txt', '/mibs/IP-MIB.txt'], 'unlisted files retrieved')
+
+    def testMlsdListing(self):
+        self.fetchMibs(mlsd=True)
+        self.assertEqual([x for x in self.server.commands if x[0] in ('MLSD', 'NLST', 'MDTM')],
+                         [('MLSD', '/mibs')], 'directory listed more than once')
+
+    def testNlstListing(self):
+        self.fetchMibs(mlsd=False)
+        self.assertEqual([x for x in self.server.commands if x[0] in ('MLSD', 'NLST')],
+                         [('MLSD', '/mibs'), ('NLST', '/mibs')], 'directory listed more than once')
+
+    def testListingExpired(self):
+        self.startServer(mlsd=True)
+        self.assertRaises(error.PySmiReaderFileNotFoundError, self.reader.getData, 'NEW-MIB')
+        self.server.files['/mibs/NEW-MIB.txt'] = ('20160102030405', 'NEW-MIB DEFINITIONS ::= BEGIN\nEND')
+        self.assertRaises(error.PySmiReaderFileNotFoundError, self.reader.getData, 'NEW-MIB')
+        self.assertEqual([x for x in self.server.commands if x[0] == 'MLSD'],
+                         [('MLSD', '/mibs')], 'directory listed more than once')
+        self.reader.maxListingAge = 0
+        mibInfo, mibData = self.reader.getData('NEW-MIB')
+        self.assertEqual(mibData, self.server.files['/mibs/NEW-MIB.txt'][1], 'expired listing not refreshed')
+
+    def testTransientListingFailure(self):
+        self.startServer(mlsd=True)
+        self.server.busy = 4  # MLSD and NLST, each retried once
+        self.reader.getData('IF-MIB')
+        self.reader.getData('IP-MIB')
+        self.assertEqual([x for x in self.server.commands if x[0] in ('MLSD', 'NLST')],
+                         [('MLSD', '/mibs')] * 2 + [('NLST', '/mibs')] * 2 + [('MLSD', '/mibs')],
+                         'failed listing cached')
+
+
+if __name__ == '__main__':
+    unittest.main()
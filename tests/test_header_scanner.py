@@ -0,0 +1,64 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.parser.scanner import HeaderScanner
+
+
+class HeaderScannerTestCase(unittest.TestCase):
+    mibText = """
+-- NOT-A-MIB DEFINITIONS ::= BEGIN
+TEST-MIB DEFINITIONS ::= BEGIN
+IMPORTS
+  MODULE-IDENTITY, OBJECT-TYPE, enterprises
+    FROM SNMPv2-SMI
+  TruthValue FROM SNMPv2-TC
+  Counter FROM RFC1155-SMI;
+
+testModule MODULE-IDENTITY
+    LAST-UPDATED "201601010000Z"
+    ORGANIZATION "-- ::= { none }"
+    CONTACT-INFO "none"
+    DESCRIPTION  "Test MIB"
+    ::= { enterprises 12345 }
+
+END
+
+OTHER-MIB DEFINITIONS ::= BEGIN
+
+otherObject OBJECT IDENTIFIER ::= { iso(1) org(3) 6 }
+
+END
+"""
+
+    def setUp(self):
+        self.mibInfos = HeaderScanner().scan(self.mibText)
+
+    def testModuleNames(self):
+        self.assertEqual([x.name for x in self.mibInfos], ['TEST-MIB', 'OTHER-MIB'], 'bad module names')
+
+    def testImports(self):
+        self.assertEqual(self.mibInfos[0].imports,
+                         {'SNMPv2-SMI': ('MODULE-IDENTITY', 'OBJECT-TYPE', 'enterprises'),
+                          'SNMPv2-TC': ('TruthValue',), 'RFC1155-SMI': ('Counter',)}, 'bad imports')
+        self.assertEqual(self.mibInfos[0].imported, ('RFC1155-SMI', 'SNMPv2-SMI', 'SNMPv2-TC'),
+                         'bad imported modules')
+        self.assertEqual(self.mibInfos[1].imported, (), 'bad imported modules')
+
+    def testModuleIdentity(self):
+        self.assertEqual((self.mibInfos[0].identity, self.mibInfos[0].oid), ('testModule', ('enterprises', 12345)),
+                         'bad module identity')
+        self.assertEqual((self.mibInfos[1].identity, self.mibInfos[1].oid), (None, None),
+                         'bad module identity')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+import threading
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+try:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+    from SocketServer import ThreadingMixIn
+
+except ImportError:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
+
+from pysmi.reader.httpclient import HttpReader
+from pysmi import error
+
+
+class MibServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, files):
+        self.files = files
+        self.requests = []
+        self.connections = 0
+        HTTPServer.__init__(self, ('127.0.0.1', 0), MibRequestHandler)
+
+
+class MibRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.server.connections += 1
+
+    def do_GET(self):
+        name = self.path.split('/')[-1]
+        self.server.requests.append((name, self.headers.get('If-None-Match')))
+
+        if name not in self.server.files:
+            body = 'not found'.encode()
+            self.send_response(404)
+
+        elif self.headers.get('If-None-Match') == '"%s"' % name:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        else:
+            body = self.server.files[name].encode()
+            self.send_response(200)
+            self.send_header('ETag', '"%s"' % name)
+
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class HttpReaderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MibServer({'IF-MIB.txt': 'IF-MIB DEFINITIONS ::= BEGIN END',
+                                 'if-mib.my': 'IF-MIB DEFINITIONS ::= BEGIN END -- lowcase'})
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.reader = HttpReader('127.0.0.1', self.server.server_port, '/mibs/@mib@')
+
+    def tearDown(self):
+        self.reader.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def testPreferredVariantFound(self):
+        mibInfo, mibData = self.reader.getData('IF-MIB')
+        self.assertEqual(mibInfo.file, 'IF-MIB.txt', 'wrong MIB variant fetched')
+        self.assertEqual(mibData, 'IF-MIB DEFINITIONS ::= BEGIN END', 'wrong MIB contents')
+
+    def testConnectionsReused(self):
+        self.assertRaises(error.PySmiReaderFileNotFoundError, self.reader.getData, 'MISSING-MIB')
+        self.reader.getData('IF-MIB')
+        self.assertTrue(len(self.server.requests) > HttpReader.maxConnections, 'too few MIB variants tried')
+        self.assertTrue(self.server.connections <= HttpReader.maxConnections, 'connections not reused')
+
+    def testConditionalGet(self):
+        first = self.reader.getData('IF-MIB')
+        del self.server.requests[:]
+        second = self.reader.getData('IF-MIB')
+        self.assertEqual(first[1], second[1], 'cached MIB contents differ')
+        self.assertTrue(('IF-MIB.txt', '"IF-MIB.txt"') in self.server.requests, 'validator not sent')
+
+    def testServerDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.reader.close()
+        try:
+            self.reader.getData('IF-MIB')
+        except error.PySmiReaderFileNotFoundError:
+            self.fail('transport failure reported as missing MIB')
+        except error.PySmiReaderError:
+            pass
+        else:
+            self.fail('MIB fetched from server that is down')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+import json
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+try:
+    from collections import OrderedDict
+except ImportError:
+    from ordereddict import OrderedDict
+
+from pysmi.parser.smi import parserFactory
+from pysmi.codegen.jsondoc import JsonCodeGen
+from pysmi.codegen.symtable import SymtableCodeGen
+
+
+class JsonOutputTestCase(unittest.TestCase):
+    """
+TEST-MIB DEFINITIONS ::= BEGIN
+IMPORTS
+  OBJECT-TYPE, Integer32
+    FROM SNMPv2-SMI;
+
+testTable  OBJECT IDENTIFIER ::= { 1 3 }
+
+testObject OBJECT-TYPE
+    SYNTAX          INTEGER { enable(1), disable(2) }
+    MAX-ACCESS      read-only
+    STATUS          current
+    DESCRIPTION     "Test object
+                     on two lines"
+    DEFVAL          { enable }
+ ::= { testTable 1 }
+
+END
+ """
+
+    def setUp(self):
+        self.ast = parserFactory()().parse(self.__class__.__doc__)[0]
+        mibInfo, symtable = SymtableCodeGen().genCode(self.ast, {}, genTexts=True)
+        self.symbolTableMap = {mibInfo.name: symtable}
+
+    def genCode(self, codegen, **kwargs):
+        return codegen.genCode(self.ast, self.symbolTableMap, genTexts=True, comments=['test'], **kwargs)[1]
+
+    def testIndented(self):
+        text = self.genCode(JsonCodeGen())
+        self.assertEqual(
+            text, json.dumps(json.loads(text, object_pairs_hook=OrderedDict), indent=2, separators=(',', ': ')),
+            'unexpected JSON formatting'
+        )
+
+    def testCompact(self):
+        text = self.genCode(JsonCodeGen().setOptions(jsonIndent=None))
+        self.assertEqual(
+            json.loads(text), json.loads(self.genCode(JsonCodeGen())), 'compact JSON document differs'
+        )
+        self.assertEqual(
+            text, json.dumps(json.loads(text, object_pairs_hook=OrderedDict), separators=(',', ':')),
+            'unexpected JSON formatting'
+        )
+
+    def testChunked(self):
+        chunks = self.genCode(JsonCodeGen(), chunked=True)
+        self.assertTrue(len(chunks) > 1, 'JSON document not chunked')
+        self.assertEqual(''.join(chunks), self.genCode(JsonCodeGen()), 'chunked JSON document differs')
+
+
+if __name__ == '__main__':
+    unittest.main()
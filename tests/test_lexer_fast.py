@@ -0,0 +1,96 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+import sys
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.lexer.smi import lexerFactory
+from pysmi.parser.smi import parserFactory
+from pysmi.parser.dialect import smiV1Relaxed
+from pysmi import error
+
+
+class FastLexerTestCase(unittest.TestCase):
+    mibText = """
+TEST-MIB DEFINITIONS ::= BEGIN  -- header comment
+EXPORTS foo,
+  bar;
+IMPORTS
+  OBJECT-TYPE, Counter32 -- trailing -- comment
+    FROM SNMPv2-SMI;
+
+OBJECT-TYPE MACRO ::=
+BEGIN
+    TYPE NOTATION ::= "SYNTAX" type(TYPE ObjectSyntax)
+END
+
+TestChoice ::= CHOICE {
+    simple INTEGER,
+    other Counter
+}
+
+testObject OBJECT-TYPE
+    SYNTAX      Counter32 (0..4294967295)
+    MAX-ACCESS  read-only\r
+    STATUS      current\r
+    DESCRIPTION "Test object,\r\n spanning\r several\n lines"
+    DEFVAL      { '0101'B }
+    ::= { 1 3 6 1 2 }
+
+END
+"""
+
+    def getTokens(self, lexerClass, data):
+        lexer = lexerClass().lexer
+        lexer.input(data)
+        tokens = []
+        try:
+            while True:
+                token = lexer.token()
+                if not token:
+                    break
+                tokens.append((token.type, token.value, token.lineno, token.lexpos))
+
+        except error.PySmiLexerError:
+            tokens.append(str(sys.exc_info()[1]))
+
+        tokens.append(lexer.lineno)
+
+        return tokens
+
+    def testSameTokens(self):
+        self.assertEqual(self.getTokens(lexerFactory('fast'), self.mibText),
+                         self.getTokens(lexerFactory(), self.mibText),
+                         'token streams differ')
+
+    def testSameTokensRelaxed(self):
+        self.assertEqual(self.getTokens(lexerFactory('fast', **smiV1Relaxed), self.mibText),
+                         self.getTokens(lexerFactory(**smiV1Relaxed), self.mibText),
+                         'token streams differ')
+
+    def testSameValuesAndErrors(self):
+        for data in ("'00ff'H -1 18446744073709551615\n\n\"b\nc\"\n\n12345678901234567890123",
+                     'a\n -- c\r\nB-', 'x\r\n#', 'A MACRO x\nEND #'):
+            self.assertEqual(self.getTokens(lexerFactory('fast'), data),
+                             self.getTokens(lexerFactory(), data),
+                             'token values or errors differ')
+
+    def testSameAst(self):
+        self.assertEqual(parserFactory('fast')().parse(self.mibText),
+                         parserFactory()().parse(self.mibText),
+                         'ASTs differ')
+
+    def testUnknownEngine(self):
+        self.assertRaises(error.PySmiError, lexerFactory, 'unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+import os
+import shutil
+import tempfile
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.reader.localfile import FileReader
+from pysmi import error
+
+
+class FileReaderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.path, 'vendor', 'sub'))
+        self.putFile('IF-MIB.txt', 'IF-MIB DEFINITIONS ::= BEGIN END')
+        self.putFile(os.path.join('vendor', 'sub', 'vendor-mib.my'), 'VENDOR-MIB DEFINITIONS ::= BEGIN END')
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def putFile(self, name, text):
+        fp = open(os.path.join(self.path, name), 'w')
+        fp.write(text)
+        fp.close()
+
+    def testFileFoundByVariant(self):
+        mibInfo, mibData = FileReader(self.path).getData('IF-MIB')
+        self.assertEqual(mibInfo.file, 'IF-MIB.txt', 'wrong file found')
+        self.assertEqual(mibData, 'IF-MIB DEFINITIONS ::= BEGIN END', 'wrong file contents')
+
+    def testFileFoundInSubdirectory(self):
+        mibInfo, mibData = FileReader(self.path).getData('VENDOR-MIB')
+        self.assertEqual(mibInfo.path, 'file://' + os.path.join(self.path, 'vendor', 'sub', 'vendor-mib.my'),
+                         'wrong file found')
+
+    def testFileFoundIgnoringCase(self):
+        mibInfo, mibData = FileReader(self.path).getData('Vendor-Mib')
+        self.assertEqual(mibInfo.file, 'vendor-mib.my', 'file not found ignoring case')
+
+    def testFileNotFoundNonRecursive(self):
+        self.assertRaises(error.PySmiReaderFileNotFoundError,
+                          FileReader(self.path, recursive=False).getData, 'VENDOR-MIB')
+
+    def testIndexRefreshedOnDirectoryChange(self):
+        reader = FileReader(self.path).setOptions(checkInterval=0)
+        self.assertRaises(error.PySmiReaderFileNotFoundError, reader.getData, 'IP-MIB')
+        mtime = os.stat(self.path)[8]
+        self.putFile('IP-MIB', 'IP-MIB DEFINITIONS ::= BEGIN END')
+        os.utime(self.path, (mtime + 1, mtime + 1))
+        mibInfo, mibData = reader.getData('IP-MIB')
+        self.assertEqual(mibInfo.file, 'IP-MIB', 'new file not indexed')
+
+    def testNewFileFoundRightAway(self):
+        reader = FileReader(self.path)
+        self.assertRaises(error.PySmiReaderFileNotFoundError, reader.getData, 'IP-MIB')
+        mtime = os.stat(self.path)[8]
+        self.putFile('IP-MIB', 'IP-MIB DEFINITIONS ::= BEGIN END')
+        os.utime(self.path, (mtime + 1, mtime + 1))
+        mibInfo, mibData = reader.getData('IP-MIB')
+        self.assertEqual(mibInfo.file, 'IP-MIB', 'new file not indexed')
+
+    def testRemovedFileRelookedUp(self):
+        self.putFile('IP-MIB.txt', 'IP-MIB DEFINITIONS ::= BEGIN END')
+        reader = FileReader(self.path)
+        self.assertEqual(reader.getData('IP-MIB')[0].file, 'IP-MIB.txt', 'wrong file found')
+        mtime = os.stat(self.path)[8]
+        os.remove(os.path.join(self.path, 'IP-MIB.txt'))
+        self.putFile('IP-MIB.my', 'IP-MIB DEFINITIONS ::= BEGIN END')
+        os.utime(self.path, (mtime + 1, mtime + 1))
+        self.assertEqual(reader.getData('IP-MIB')[0].file, 'IP-MIB.my', 'stale index entry used')
+
+    def testDirectoryChangeCheckThrottled(self):
+        reader = FileReader(self.path).setOptions(checkInterval=3600)
+        reader.getData('IF-MIB')
+        stat = os.stat
+        stats = []
+
+        def countingStat(path):
+            stats.append(path)
+            return stat(path)
+
+        os.stat = countingStat
+        try:
+            reader.getData('IF-MIB')
+        finally:
+            os.stat = stat
+        self.assertFalse([x for x in stats if os.path.isdir(x)], 'directories checked on index hit')
+
+    def testIndexFileWritten(self):
+        self.putFile('misnamed.txt', '-- comment\nMISNAMED-MIB { iso 3 } DEFINITIONS ::= BEGIN END')
+        FileReader(self.path).updateIndex()
+        mibIndex = FileReader.loadIndex(os.path.join(self.path, FileReader.indexFile))
+        self.assertEqual(mibIndex['MISNAMED-MIB'], 'misnamed.txt', 'module header not indexed')
+        self.assertEqual(mibIndex['VENDOR-MIB'], os.path.join('vendor', 'sub', 'vendor-mib.my'),
+                         'subdirectory not indexed')
+
+    def testIndexFileUsed(self):
+        self.putFile('misnamed.txt', 'MISNAMED-MIB DEFINITIONS ::= BEGIN END')
+        FileReader(self.path).updateIndex()
+        mibInfo, mibData = FileReader(self.path).getData('MISNAMED-MIB')
+        self.assertEqual(mibInfo.file, 'misnamed.txt', 'indexed file not found')
+
+    def testIndexFileUpdatedIncrementally(self):
+        FileReader(self.path).updateIndex()
+        self.putFile('IF-MIB.txt', 'RENAMED-MIB DEFINITIONS ::= BEGIN END')
+        os.utime(os.path.join(self.path, 'IF-MIB.txt'), (1, 1))
+        mibIndex = FileReader(self.path).updateIndex()
+        self.assertEqual(mibIndex.get('RENAMED-MIB'), 'IF-MIB.txt', 'modified file not rescanned')
+        self.assertTrue('IF-MIB' not in mibIndex, 'stale index entry kept')
+
+    def testIndexFileWriteFailure(self):
+        def failure(*args, **kwargs):
+            raise OSError('write failure')
+
+        for module, name in ((tempfile, 'mkstemp'), (os, 'rename')):
+            func = getattr(module, name)
+            setattr(module, name, failure)
+            try:
+                self.assertRaises(error.PySmiError, FileReader(self.path).updateIndex)
+            finally:
+                setattr(module, name, func)
+            self.assertEqual(sorted(os.listdir(self.path)), ['IF-MIB.txt', 'vendor'],
+                             'temporary file left after %s failure' % name)
+
+
+if __name__ == '__main__':
+    unittest.main()
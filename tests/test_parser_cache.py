@@ -0,0 +1,62 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+import shutil
+import tempfile
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.parser.smi import parserFactory
+from pysmi.parser.dialect import smiV1Relaxed
+from pysmi.parser.cache import CachingParser
+
+
+class CachingParserTestCase(unittest.TestCase):
+    mibText = """
+TEST-MIB DEFINITIONS ::= BEGIN
+
+testValue  OBJECT IDENTIFIER ::= { 1 3 6 }
+
+END
+"""
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.parser = parserFactory()()
+        self.parsed = []
+        parse = self.parser.parse
+
+        def countingParse(data, **kwargs):
+            self.parsed.append(data)
+            return parse(data, **kwargs)
+
+        self.parser.parse = countingParse
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def testAstCached(self):
+        ast = CachingParser(self.parser, self.path).parse(self.mibText)
+        self.assertEqual(CachingParser(self.parser, self.path).parse(self.mibText), ast, 'bad AST loaded')
+        self.assertEqual(len(self.parsed), 1, 'AST not cached')
+
+    def testChangedTextParsed(self):
+        CachingParser(self.parser, self.path).parse(self.mibText)
+        CachingParser(self.parser, self.path).parse(self.mibText.replace('6', '7'))
+        self.assertEqual(len(self.parsed), 2, 'changed MIB text not parsed')
+
+    def testGrammarInKey(self):
+        self.assertNotEqual(CachingParser(parserFactory()(), self.path).getKey(self.mibText),
+                            CachingParser(parserFactory(**smiV1Relaxed)(), self.path).getKey(self.mibText),
+                            'grammar options ignored')
+
+
+if __name__ == '__main__':
+    unittest.main()
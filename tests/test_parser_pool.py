@@ -0,0 +1,50 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.parser.smi import parserFactory
+from pysmi.parser.dialect import smiV1
+from pysmi.parser.pool import ParserPool
+from pysmi.lexer.smi import lexerFactory
+
+
+class ParserPoolTestCase(unittest.TestCase):
+
+    def testParserClassMemoized(self):
+        self.assertTrue(parserFactory(**smiV1) is parserFactory(supportIndex=True, supportSmiV1Keywords=True,
+                                                               noCells=False),
+                        'parser class not reused')
+        self.assertTrue(parserFactory(**smiV1) is not parserFactory(), 'parser class reused across dialects')
+
+    def testLexerClassMemoized(self):
+        self.assertTrue(lexerFactory(**smiV1) is lexerFactory(**smiV1), 'lexer class not reused')
+
+    def testParserReused(self):
+        pool = ParserPool(parserFactory())
+        parser = pool.acquire()
+        pool.release(parser)
+        self.assertTrue(pool.acquire() is parser, 'idle parser not reused')
+
+    def testParserNotShared(self):
+        pool = ParserPool(parserFactory())
+        self.assertTrue(pool.acquire() is not pool.acquire(), 'busy parser handed out')
+
+    def testMaxIdle(self):
+        pool = ParserPool(parserFactory(), maxIdle=1)
+        parsers = pool.acquire(), pool.acquire()
+        pool.release(parsers[0])
+        pool.release(parsers[1])
+        self.assertTrue(pool.acquire() is parsers[0], 'idle parser not kept')
+        self.assertTrue(pool.acquire() is not parsers[1], 'too many idle parsers kept')
+
+
+if __name__ == '__main__':
+    unittest.main()
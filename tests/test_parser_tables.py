@@ -0,0 +1,79 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+import os
+import sys
+import shutil
+import tempfile
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from ply import yacc
+from pysmi.parser.smi import parserFactory, buildTables
+from pysmi.parser.dialect import smiV1, smiV1Relaxed
+from pysmi.parser import tables
+
+
+class ParserTablesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def testTablesBuilt(self):
+        self.assertEqual(buildTables(self.path), ['smiv1', 'smiv1relaxed', 'smiv2'], 'bad tables built')
+        for name in ('smiv1', 'smiv1relaxed', 'smiv2'):
+            ctx = {}
+            exec(open(os.path.join(self.path, name + '.py')).read(), ctx)
+            self.assertTrue('_lr_signature' in ctx, 'bad table module %s' % name)
+
+    def testTableModuleByDialect(self):
+        self.assertEqual(parserFactory(**smiV1Relaxed).tableModule, 'pysmi.parser.tables.smiv1relaxed',
+                         'wrong table module')
+        self.assertEqual(parserFactory(**dict(smiV1, noCells=True)).tableModule, None,
+                         'table module for non-standard dialect')
+
+    def testPrebuiltTablesLoaded(self):
+        tablesPath = os.path.join(self.path, 'tables')
+        os.makedirs(tablesPath)
+        buildTables(tablesPath)
+
+        tables.__path__.insert(0, tablesPath)
+        generator = yacc.LRGeneratedTable
+
+        def failingGenerator(*args, **kwargs):
+            raise AssertionError('parser tables generated')
+
+        yacc.LRGeneratedTable = failingGenerator
+
+        try:
+            for dialectOptions in ({}, smiV1, smiV1Relaxed):
+                parserClass = parserFactory(**dialectOptions)
+                parserClass(tempdir=self.path).parse('TEST-MIB DEFINITIONS ::= BEGIN END')
+
+        finally:
+            yacc.LRGeneratedTable = generator
+            tables.__path__.remove(tablesPath)
+            for name in ('smiv1', 'smiv1relaxed', 'smiv2'):
+                sys.modules.pop('pysmi.parser.tables.' + name, None)
+
+        self.assertEqual(os.listdir(os.path.join(self.path, 'mibFile')), [], 'parser tables written')
+
+    def testTablesPickled(self):
+        parserClass = parserFactory(**dict(smiV1, noCells=True))
+        parserClass(tempdir=self.path)
+        self.assertEqual(len(os.listdir(os.path.join(self.path, 'mibFile'))), 1, 'parser tables not pickled')
+        parserClass(tempdir=self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
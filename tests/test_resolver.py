@@ -0,0 +1,98 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.codegen.resolver import OidResolver, TypeResolver
+from pysmi import error
+
+
+class OidResolverTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.symbolTableMap = {
+            'A-MIB': {
+                'org': {'oid': (('iso', 'A-MIB'), 3)},
+                'internet': {'oid': (('org', 'A-MIB'), 6, 1)},
+                'loopA': {'oid': (('loopB', 'B-MIB'), 1)},
+                'someType': {}
+            },
+            'B-MIB': {
+                'testB': {'oid': (('internet', 'A-MIB'), 4, 1)},
+                'loopB': {'oid': (('loopA', 'A-MIB'), 2)}
+            }
+        }
+        self.oidResolver = OidResolver(self.symbolTableMap)
+
+    def testGetOid(self):
+        self.assertEqual(self.oidResolver.getOid('testB', 'B-MIB'), (1, 3, 6, 1, 4, 1), 'bad OID')
+
+    def testResolve(self):
+        self.assertEqual(self.oidResolver.resolve((('internet', 'A-MIB'), 2, 1)), (1, 3, 6, 1, 2, 1), 'bad OID')
+
+    def testMemoized(self):
+        self.oidResolver.getOid('testB', 'B-MIB')
+        del self.symbolTableMap['A-MIB']
+        self.assertEqual(self.oidResolver.getOid('internet', 'A-MIB'), (1, 3, 6, 1), 'OID not remembered')
+
+    def testDeepTree(self):
+        symbolTable = self.symbolTableMap['A-MIB']
+        for idx in range(2000):
+            symbolTable['node%s' % idx] = {'oid': (('node%s' % (idx - 1), 'A-MIB'), 1)}
+        symbolTable['node-1'] = {'oid': (('iso', 'A-MIB'),)}
+        self.assertEqual(len(self.oidResolver.getOid('node1999', 'A-MIB')), 2001, 'bad OID')
+
+    def testErrors(self):
+        self.assertRaises(error.PySmiSemanticError, self.oidResolver.getOid, 'loopA', 'A-MIB')
+        self.assertRaises(error.PySmiSemanticError, self.oidResolver.getOid, 'someType', 'A-MIB')
+        self.assertRaises(error.PySmiSemanticError, self.oidResolver.getOid, 'missing', 'A-MIB')
+        self.assertRaises(error.PySmiSemanticError, self.oidResolver.getOid, 'testC', 'C-MIB')
+
+
+class TypeResolverTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.symbolTableMap = {
+            'A-MIB': {
+                'TruthValue': {'syntax': (('Integer32', ''), [('true', 1), ('false', 2)])},
+                'ShortTruth': {'syntax': (('TruthValue', 'A-MIB'), [('maybe', 3)])},
+                'LoopType': {'syntax': (('LoopType', 'A-MIB'), '')},
+                'someObject': {}
+            },
+            'B-MIB': {
+                'testFlag': {'syntax': (('ShortTruth', 'A-MIB'), '')},
+                'testName': {'syntax': (('OctetString', ''), '')}
+            }
+        }
+        self.typeResolver = TypeResolver(self.symbolTableMap)
+
+    def testBaseType(self):
+        self.assertEqual(self.typeResolver.getBaseType('testName', 'B-MIB'), (('OctetString', ''), ''),
+                         'bad base type')
+
+    def testMergedSubtype(self):
+        self.assertEqual(self.typeResolver.getBaseType('testFlag', 'B-MIB'),
+                         (('Integer32', ''), (('maybe', 3), ('true', 1), ('false', 2))), 'bad base type')
+
+    def testSymbolTableIntact(self):
+        for x in range(2):
+            self.typeResolver.getBaseType('ShortTruth', 'A-MIB')
+            TypeResolver(self.symbolTableMap).getBaseType('ShortTruth', 'A-MIB')
+        self.assertEqual(self.symbolTableMap['A-MIB']['ShortTruth']['syntax'][1], [('maybe', 3)],
+                         'symbol table modified')
+
+    def testErrors(self):
+        self.assertRaises(error.PySmiSemanticError, self.typeResolver.getBaseType, 'LoopType', 'A-MIB')
+        self.assertRaises(error.PySmiSemanticError, self.typeResolver.getBaseType, 'someObject', 'A-MIB')
+        self.assertRaises(error.PySmiSemanticError, self.typeResolver.getBaseType, 'missing', 'C-MIB')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.parser.smi import parserFactory
+from pysmi.codegen.symtable import SymtableCodeGen
+from pysmi import error
+
+
+class PostponedSymbolsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.codegen = SymtableCodeGen()
+
+    def regSyms(self, *syms):
+        for symbol, parents in syms:
+            self.codegen.regSym(symbol, {}, parents)
+        return self.codegen._symsOrder
+
+    def testChildrenBeforeParents(self):
+        self.assertEqual(
+            self.regSyms(('a', ['A']), ('b', ['B']), ('c', ['A', 'B']), ('A', []), ('B', [])),
+            ['A', 'a', 'B', 'b', 'c'], 'unexpected symbols order'
+        )
+
+    def testOrderOfPostponement(self):
+        self.assertEqual(
+            self.regSyms(('c', ['B']), ('a', ['A']), ('B', ['A']), ('b', ['A']), ('A', [])),
+            ['A', 'a', 'B', 'b'], 'unexpected symbols order'
+        )
+        self.assertEqual(self.codegen._postponedSyms['c'][1], ['B'], 'symbol not postponed till next registration')
+
+        self.assertEqual(self.regSyms(('d', [])), ['A', 'a', 'B', 'b', 'd', 'c'], 'unexpected symbols order')
+        self.assertFalse(self.codegen._postponedSyms, 'postponed symbols left')
+
+    def testDuplicatePostponedSymbol(self):
+        self.regSyms(('a', ['A']))
+        self.assertRaises(error.PySmiSemanticError, self.regSyms, ('a', []))
+
+    def testManySymbols(self):
+        syms = [('s%d' % x, ['T%d' % x]) for x in range(20000)]
+        syms.extend([('T%d' % x, []) for x in range(20000)])
+        self.assertEqual(len(self.regSyms(*syms)), 40000, 'symbols not registered')
+
+
+class RowBeforeTableTestCase(unittest.TestCase):
+    """
+TEST-MIB DEFINITIONS ::= BEGIN
+IMPORTS
+  OBJECT-TYPE, Integer32
+    FROM SNMPv2-SMI;
+
+testEntry OBJECT-TYPE
+    SYNTAX          TestEntry
+    MAX-ACCESS      not-accessible
+    STATUS          current
+    DESCRIPTION     "Test table row"
+    INDEX           { testIndex }
+  ::= { testTable 1 }
+
+testTable OBJECT-TYPE
+    SYNTAX          SEQUENCE OF TestEntry
+    MAX-ACCESS      not-accessible
+    STATUS          current
+    DESCRIPTION     "Test table"
+  ::= { 1 3 }
+
+TestEntry ::= SEQUENCE {
+    testIndex    Integer32
+}
+
+testIndex OBJECT-TYPE
+    SYNTAX          Integer32
+    MAX-ACCESS      read-create
+    STATUS          current
+    DESCRIPTION     "Test column"
+  ::= { testEntry 1 }
+
+END
+ """
+
+    def setUp(self):
+        ast = parserFactory()().parse(self.__class__.__doc__)[0]
+        self.mibInfo, self.symtable = SymtableCodeGen().genCode(ast, {}, genTexts=True)
+
+    def testRowRegistered(self):
+        self.assertTrue('testEntry' in self.symtable, 'row symbol not registered')
+
+    def testSymbolsOrder(self):
+        self.assertEqual(
+            [x for x in self.symtable['_symtable_order'] if x.startswith('test')],
+            ['testTable', 'testEntry', 'testIndex'], 'unexpected symbols order'
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+#
+# This file is part of pysmi software.
+#
+# Copyright (c) 2015-2016, Ilya Etingof <ilya@glas.net>
+# License: http://pysmi.sf.net/license.html
+#
+import os
+import shutil
+import tempfile
+
+try:
+    import unittest2 as unittest
+
+except ImportError:
+    import unittest
+
+from pysmi.writer.localfile import FileWriter
+from pysmi.writer.callback import CallbackWriter
+
+
+class ChunkedDataTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def testFileWriter(self):
+        FileWriter(self.path).setOptions(suffix='.txt').putData(
+            'TEST-MIB', ['a = 1\n', 'b = 2\n', ''], comments=['test']
+        )
+        fp = open(os.path.join(self.path, 'TEST-MIB.txt'))
+        self.assertEqual(fp.read(), '#\n# test\n#\na = 1\nb = 2\n', 'chunks not written in order')
+        fp.close()
+
+    def testFileWriterGenerator(self):
+        FileWriter(self.path).putData('TEST-MIB', ('%s\n' % x for x in range(3)))
+        fp = open(os.path.join(self.path, 'TEST-MIB'))
+        self.assertEqual(fp.read(), '0\n1\n2\n', 'chunks not written in order')
+        fp.close()
+
+    def testCallbackWriter(self):
+        written = {}
+
+        def putData(mibname, data, cbCtx):
+            written[mibname] = data
+
+        CallbackWriter(putData).putData('TEST-MIB', ['a = 1\n', 'b = 2\n'])
+        self.assertEqual(written, {'TEST-MIB': 'a = 1\nb = 2\n'}, 'chunks not joined')
+
+
+if __name__ == '__main__':
+    unittest.main()